@@ -0,0 +1,137 @@
+"""Re-run card extraction over saved page sources on a process pool
+
+Inputs can be saved HTML files (.html, .htm, optionally .gz), directories of
+them, or crawl archive directories / .idx.jsonl index files. Each page is one
+task; records stream back in input order and each page's records go straight
+to the usual output formats, so memory use doesn't grow with the input. The
+workers only hold a PageParser, not a full scraper.
+
+    python joblistingscraper.py reprocess archive/ saved_pages/ --workers 8
+"""
+import argparse
+import gzip
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+HTML_SUFFIXES = (".html", ".htm", ".html.gz", ".htm.gz")
+
+# One page parser per worker process, created by the pool initializer
+_worker_parser = None
+_worker_max_jobs = None
+
+
+def collect_tasks(inputs, since=None, until=None):
+    """Turn files, directories and archives into a list of page tasks"""
+    from crawlarchive import CrawlArchive
+
+    tasks = []
+    for path in inputs:
+        if os.path.isfile(path) and path.endswith(".idx.jsonl"):
+            archive = CrawlArchive(os.path.dirname(path) or ".")
+            entries = [e for e in archive.find(since=since, until=until)
+                       if e["file"].split(".")[0] == os.path.basename(path).split(".")[0]]
+            tasks.extend(("archive", archive.directory, entry) for entry in entries)
+        elif os.path.isfile(path):
+            tasks.append(("file", path, None))
+        elif os.path.isdir(path):
+            if any(name.endswith(".idx.jsonl") for name in os.listdir(path)):
+                archive = CrawlArchive(path)
+                tasks.extend(("archive", path, entry) for entry in archive.find(since=since, until=until))
+            for directory, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(HTML_SUFFIXES):
+                        tasks.append(("file", os.path.join(directory, name), None))
+        else:
+            logger.warning(f"Skipping {path}: not a file or directory")
+    return tasks
+
+
+def _init_worker(max_jobs_per_page):
+    global _worker_parser, _worker_max_jobs
+    from joblistingscraper import PageParser
+
+    _worker_parser = PageParser()
+    _worker_max_jobs = max_jobs_per_page
+
+
+def extract_task(task):
+    """Extract the job records of one page (runs in a worker process)"""
+    from crawlarchive import CrawlArchive
+
+    kind, location, entry = task
+    try:
+        if kind == "archive":
+            headers, source = CrawlArchive(location).read(entry)
+            url = entry["url"]
+            fetch_time = datetime.strptime(entry["fetch_time"], "%Y-%m-%d %H:%M:%S")
+        else:
+            opener = gzip.open if location.endswith(".gz") else open
+            with opener(location, "rt", encoding="utf-8", errors="replace") as f:
+                source = f.read()
+            url = None
+            fetch_time = datetime.fromtimestamp(os.path.getmtime(location))
+
+        return _worker_parser.parse_page_source(source, url, _worker_max_jobs, fetch_time=fetch_time)
+    except Exception as e:
+        logger.error(f"Error re-extracting {entry['url'] if entry else location}: {e}")
+        return []
+
+
+def reprocess(tasks, workers=None, max_jobs_per_page=1000, chunksize=1):
+    """Yield the records of each page, in task order, as workers finish them"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(max_jobs_per_page,)) as executor:
+        yield from executor.map(extract_task, tasks, chunksize=chunksize)
+
+
+def main(argv=None):
+    """Command line entry point of the reprocess subcommand"""
+    from exporter import export_records
+    from joblistingscraper import RECORD_COLUMNS, NaukriScraper, configure_logging, output_basename
+
+    parser = argparse.ArgumentParser(prog="joblistingscraper.py reprocess",
+                                     description="Re-extract job listings from saved pages and crawl archives")
+    parser.add_argument("inputs", nargs="+", help="Saved HTML files, directories or crawl archives")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: all cores)")
+    parser.add_argument("--jobs_per_page", type=int, default=1000, help="Maximum jobs to extract per page (default: 1000)")
+    parser.add_argument("--since", type=str, help="Only archived pages fetched at or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", type=str, help="Only archived pages fetched at or before this date (YYYY-MM-DD)")
+    parser.add_argument("--formats", type=str, default="json,csv,excel", help="Output formats (comma-separated)")
+    parser.add_argument("--json_gzip", action="store_true", help="Write the JSON output gzip-compressed (.json.gz)")
+    parser.add_argument("--json_indent", action="store_true", help="Indent the JSON output instead of one compact record per line")
+    parser.add_argument("--name", type=str, default="reprocessed", help="Name used in the output file names (default: reprocessed)")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    tasks = collect_tasks(args.inputs, args.since, args.until)
+    logger.info(f"Re-extracting {len(tasks)} pages with {args.workers} workers")
+
+    # Only for the run report; archived pages are history, so there is no change log either
+    scraper = NaukriScraper()
+    metrics = scraper.metrics
+
+    def page_rows():
+        chunks = reprocess(tasks, args.workers, args.jobs_per_page, chunksize=max(1, len(tasks) // (args.workers * 16)))
+        for page_jobs in chunks:
+            metrics.incr("pages")
+            metrics.incr("jobs", len(page_jobs))
+            if page_jobs:
+                yield [tuple(record[field] for field in RECORD_COLUMNS) for record in page_jobs]
+
+    os.makedirs("data", exist_ok=True)
+    start = time.perf_counter()
+    with metrics.timer("reprocess"):
+        results = export_records(page_rows(), RECORD_COLUMNS, f"data/{output_basename(args.name)}",
+                                 args.formats.split(","), json_gzip=args.json_gzip, json_indent=args.json_indent)
+    elapsed = time.perf_counter() - start
+    for fmt, stats in results.items():
+        metrics.observe(f"export_{fmt}_rows_per_sec", stats["rows_per_sec"])
+    metrics.extra["export"] = results
+    logger.info(f"Re-extracted {metrics.counters.get('jobs', 0)} jobs from {len(tasks)} pages in {elapsed:.1f}s "
+                f"({len(tasks) / elapsed if elapsed else 0:.1f} pages/s)")
+    scraper.write_run_report()
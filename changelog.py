@@ -0,0 +1,134 @@
+"""Change-data capture between crawls of the same search
+
+ChangeTracker keeps the postings each search listed last time in a SQLite
+table. It compares every saved crawl with that state only, not with the
+history of output files. Postings the search didn't list before become "new"
+events. Listed postings whose tracked fields differ become "changed" events
+with the old and new values. Open postings the search no longer lists become
+"closed" events, but only when the crawl reached the end of the search's
+results: a crawl that stopped at its page limit didn't look. The events and
+one "summary" event per run are appended to a JSONL log, which consumers can
+tail instead of diffing full dumps.
+
+Events are appended before the state is committed. A crash between the two
+repeats the run's events on the next save, but never loses them.
+"""
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+from queryscheduler import dedup_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = "data"
+
+# Listing fields compared between crawls. Relative dates ("3 days ago") and extraction
+# times change every run, and links carry tracking parameters. Detail-page fields
+# (jobdetails.py) aren't compared: a run with and without enrichment would differ.
+TRACKED_FIELDS = ("title", "company", "location", "experience", "salary", "description", "skills")
+
+# Fields kept in new and closed events to identify the posting
+SUMMARY_FIELDS = ("job_id", "title", "company", "location", "link")
+
+
+def scope_key(job_title=None, location=None, time_frame=None, experience=None):
+    """The search a crawl belongs to; closures are only detected within it"""
+    key = "|".join(part or "" for part in (job_title, location, time_frame))
+    return key if experience is None else f"{key}|{experience}"
+
+
+class ChangeTracker:
+    """Current postings per search (SQLite) and the append-only event log (JSONL)"""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, placeholders=None):
+        self.state_path = os.path.join(directory, "job_state.sqlite3")
+        self.log_path = os.path.join(directory, "changes.jsonl")
+        self.placeholders = placeholders or {}
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.state_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "scope TEXT NOT NULL, key TEXT NOT NULL, open INTEGER NOT NULL, first_seen TEXT NOT NULL, "
+            "last_seen TEXT NOT NULL, fields TEXT NOT NULL, PRIMARY KEY (scope, key))"
+        )
+        self.connection.commit()
+
+    def _tracked(self, record):
+        """The tracked fields a record actually has (placeholders count as missing)"""
+        fields = {}
+        for field in TRACKED_FIELDS:
+            value = record.get(field)
+            if value not in (None, "") and value != self.placeholders.get(field):
+                fields[field] = str(value)
+        return fields
+
+    def apply(self, records, scope, run_id=None, detect_closed=True):
+        """Log how records differ from the scope's stored postings and store them; returns the summary"""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        base = {"time": now, "run_id": run_id, "scope": scope}
+        stored = {key: (is_open, json.loads(fields)) for key, is_open, fields in self.connection.execute(
+            "SELECT key, open, fields FROM postings WHERE scope = ?", (scope,))}
+
+        events = []
+        rows = []
+        seen = set()
+        counts = {"new": 0, "changed": 0, "unchanged": 0, "closed": 0}
+        for record in records:
+            key = "|".join(str(part) for part in dedup_key(record))
+            if key in seen:
+                continue
+            seen.add(key)
+            fields = self._tracked(record)
+            current = {field: str(record[field]) for field in SUMMARY_FIELDS
+                       if record.get(field) not in (None, "", self.placeholders.get(field))}
+            current.update(fields)
+
+            previous = stored.get(key)
+            if previous is None or not previous[0]:
+                # Closed postings listed again count as new
+                counts["new"] += 1
+                events.append(dict(base, event="new", key=key, record=current))
+            else:
+                old = previous[1]
+                # A field this crawl didn't extract isn't a change
+                changes = {field: [old.get(field), value] for field, value in fields.items() if old.get(field) != value}
+                if changes:
+                    counts["changed"] += 1
+                    events.append(dict(base, event="changed", key=key, job_id=record.get("job_id"), changes=changes))
+                else:
+                    counts["unchanged"] += 1
+            stored_fields = dict(previous[1]) if previous else {}
+            stored_fields.update(current)
+            rows.append((scope, key, now, now, json.dumps(stored_fields, ensure_ascii=False)))
+
+        closed = []
+        if detect_closed:
+            closed = [key for key, (is_open, _) in stored.items() if is_open and key not in seen]
+            for key in closed:
+                events.append(dict(base, event="closed", key=key, record=stored[key][1]))
+            counts["closed"] = len(closed)
+        events.append(dict(base, event="summary", **counts))
+
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events))
+            f.flush()
+            os.fsync(f.fileno())
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO postings (scope, key, open, first_seen, last_seen, fields) VALUES (?, ?, 1, ?, ?, ?) "
+                "ON CONFLICT (scope, key) DO UPDATE SET open = 1, last_seen = excluded.last_seen, fields = excluded.fields",
+                rows)
+            self.connection.executemany("UPDATE postings SET open = 0 WHERE scope = ? AND key = ?",
+                                        [(scope, key) for key in closed])
+
+        logger.info(f"Changes since the last crawl: {counts['new']} new, {counts['changed']} changed, "
+                    f"{counts['closed']} closed, {counts['unchanged']} unchanged (logged to {self.log_path})")
+        return counts
+
+    def close(self):
+        self.connection.close()
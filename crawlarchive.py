@@ -0,0 +1,136 @@
+"""Append-only archive of crawled page sources
+
+Records are written WARC-style (a header block followed by the page source) to
+one archive file per month. Every record is compressed on its own (a zstd frame
+when the zstandard package is installed, otherwise a gzip member), so a single
+page can be read back by seeking to its offset without decompressing the rest.
+A JSON-lines side index stores the URL, page number, query, fetch time, offset
+and length of each record.
+"""
+import gzip
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+EXTENSIONS = {"zstd": "warc.zst", "gzip": "warc.gz"}
+
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This record is zstd-compressed; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class CrawlArchive:
+    """Monthly archive files of page snapshots with a random-access index"""
+
+    def __init__(self, directory="archive", codec=None):
+        self.directory = directory
+        self.codec = codec or ("zstd" if zstandard is not None else "gzip")
+        if self.codec == "zstd" and zstandard is None:
+            raise RuntimeError("zstd compression needs the zstandard package")
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, fetch_time):
+        stem = f"crawl-{fetch_time.strftime('%Y%m')}"
+        return (os.path.join(self.directory, f"{stem}.{EXTENSIONS[self.codec]}"),
+                os.path.join(self.directory, f"{stem}.idx.jsonl"))
+
+    def append(self, url, source, page=None, query=None, fetch_time=None):
+        """Add a page snapshot and return its index entry"""
+        fetch_time = fetch_time or datetime.now()
+        record_id = f"<urn:uuid:{uuid.uuid4()}>"
+        body = source.encode("utf-8")
+        header = "\r\n".join([
+            "WARC/1.1",
+            "WARC-Type: response",
+            f"WARC-Record-ID: {record_id}",
+            f"WARC-Date: {fetch_time.strftime('%Y-%m-%dT%H:%M:%S')}",
+            f"WARC-Target-URI: {url}",
+            "Content-Type: text/html; charset=utf-8",
+            f"X-Page: {page if page is not None else ''}",
+            f"X-Query: {json.dumps(query or {}, ensure_ascii=False)}",
+            f"Content-Length: {len(body)}"
+        ])
+        record = _compress(header.encode("utf-8") + b"\r\n\r\n" + body + b"\r\n\r\n", self.codec)
+
+        archive_path, index_path = self._paths(fetch_time)
+        with self._lock:
+            with open(archive_path, "ab") as f:
+                offset = f.tell()
+                f.write(record)
+
+            entry = {
+                "record_id": record_id,
+                "url": url,
+                "page": page,
+                "query": query or {},
+                "fetch_time": fetch_time.strftime("%Y-%m-%d %H:%M:%S"),
+                "file": os.path.basename(archive_path),
+                "offset": offset,
+                "length": len(record),
+                "codec": self.codec,
+                "size": len(body)
+            }
+            with open(index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def iter_entries(self):
+        """All index entries, oldest archive first"""
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".idx.jsonl"):
+                continue
+            with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+
+    def find(self, url=None, page=None, since=None, until=None, **query):
+        """Index entries matching a URL, page number, fetch time range and/or query fields
+
+        since and until are "YYYY-MM-DD[ HH:MM:SS]" strings.
+        """
+        for entry in self.iter_entries():
+            if url is not None and entry["url"] != url:
+                continue
+            if page is not None and entry["page"] != page:
+                continue
+            if since is not None and entry["fetch_time"] < since:
+                continue
+            if until is not None and entry["fetch_time"] > until:
+                continue
+            if any(entry["query"].get(key) != value for key, value in query.items()):
+                continue
+            yield entry
+
+    def read(self, entry):
+        """Read one record by seeking to it; returns (headers, page source)"""
+        with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+            f.seek(entry["offset"])
+            data = _decompress(f.read(entry["length"]), entry["codec"])
+
+        header_block, _, body = data.partition(b"\r\n\r\n")
+        headers = {}
+        for line in header_block.decode("utf-8").split("\r\n")[1:]:
+            name, _, value = line.partition(": ")
+            headers[name] = value
+        length = int(headers.get("Content-Length", len(body)))
+        return headers, body[:length].decode("utf-8")
@@ -0,0 +1,252 @@
+"""Recrawl searches as often as they change, within a global page budget
+
+The daemon keeps a set of searches fresh. Each crawl counts the postings the
+search hadn't shown before, and an exponentially weighted moving average turns
+those counts into a new-postings-per-hour rate. The next crawl is scheduled
+for when about target_new new postings are expected. So a hot search (data
+analyst in Bangalore) comes round every hour or so, and a niche one once a day.
+Every crawl draws its pages from a token bucket refilled at pages_per_hour, and
+the schedule, rates, seen postings and bucket are saved after every crawl. A
+restart carries on where the last run stopped. The scraper and its browser live
+as long as the daemon, but each crawl starts a new run (metrics, retry budget,
+page state) and writes its own run report.
+
+    python joblistingscraper.py daemon --queries queries.csv --pages_per_hour 300
+"""
+import argparse
+import heapq
+import json
+import logging
+import os
+import signal
+import threading
+import time
+
+from queryscheduler import dedup_key, describe, load_queries
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_FILE = os.path.join("data", "daemon_state.json")
+
+# Postings remembered per search to tell new ones from ones seen before
+SEEN_LIMIT = 5000
+
+
+def query_key(query):
+    return "|".join(str(part) if part is not None else "" for part in
+                    (query.job_title, query.location, query.time_frame, query.experience))
+
+
+class PageBudget:
+    """A token bucket of result pages, refilled at pages_per_hour up to an hour's worth"""
+
+    def __init__(self, pages_per_hour, tokens=None, updated=None):
+        self.rate = pages_per_hour / 3600.0
+        self.capacity = float(pages_per_hour)
+        self.tokens = self.capacity if tokens is None else min(float(tokens), self.capacity)
+        self.updated = time.time() if updated is None else updated
+
+    def _refill(self):
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, pages):
+        """Seconds until pages tokens are available"""
+        self._refill()
+        return max(0.0, (min(pages, self.capacity) - self.tokens) / self.rate) if self.rate else float("inf")
+
+    def take(self, pages):
+        self._refill()
+        self.tokens -= pages
+
+    def refund(self, pages):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + pages)
+
+    def to_dict(self):
+        return {"tokens": round(self.tokens, 3), "updated": self.updated}
+
+
+class CrawlDaemon:
+    """Adaptive recrawl loop around NaukriScraper.iter_jobs"""
+
+    def __init__(self, scraper, queries, state_path=DEFAULT_STATE_FILE, pages_per_hour=200,
+                 min_interval=1800, max_interval=86400, target_new=20, alpha=0.3,
+                 max_jobs_per_page=20, formats=None):
+        self.scraper = scraper
+        self.queries = {query_key(query): query for query in queries}
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.alpha = alpha
+        self.max_jobs_per_page = max_jobs_per_page
+        self.formats = formats or ["json", "csv"]
+        self.stop = threading.Event()
+
+        state = self._load_state()
+        budget = state.get("budget", {})
+        self.budget = PageBudget(pages_per_hour, budget.get("tokens"), budget.get("updated"))
+        # Searches no longer in the query file are dropped; new ones are due straight away
+        self.entries = {key: state.get("queries", {}).get(key, {"next_due": 0, "rate": None, "crawls": 0, "seen": []})
+                        for key in self.queries}
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            logger.info(f"Resuming from {self.state_path}")
+            return state
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read daemon state {self.state_path}, starting afresh: {e}")
+            return {}
+
+    def save_state(self):
+        """Write the schedule atomically"""
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"budget": self.budget.to_dict(), "queries": self.entries}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def next_interval(self, rate):
+        """Seconds until about target_new new postings are expected"""
+        if rate is None:
+            return self.min_interval
+        if rate <= 0:
+            return self.max_interval
+        return min(self.max_interval, max(self.min_interval, self.target_new / rate * 3600))
+
+    def run(self, max_crawls=None):
+        """Crawl due searches until stopped (or after max_crawls crawls)"""
+        # One browser session for every crawl, closed when the daemon stops
+        self.scraper.keep_driver = True
+        try:
+            self._run(max_crawls)
+        finally:
+            self.scraper.keep_driver = False
+            self.scraper.close_driver()
+
+    def _run(self, max_crawls):
+        crawls = 0
+        while not self.stop.is_set() and (max_crawls is None or crawls < max_crawls):
+            # Earliest due first; among equally due searches the higher priority goes first
+            due = [(entry["next_due"], -self.queries[key].priority, key) for key, entry in self.entries.items()]
+            if not due:
+                logger.warning("No searches to crawl")
+                return
+            next_due, _, key = heapq.nsmallest(1, due)[0]
+            query = self.queries[key]
+
+            pages = min(query.pages, int(self.budget.capacity))
+            wait = max(next_due - time.time(), self.budget.wait_time(pages))
+            if wait > 0:
+                logger.info(f"Next crawl {describe(query)} in {wait / 60:.1f} min")
+                if self.stop.wait(wait):
+                    break
+                continue
+
+            self.crawl(key, query, pages)
+            crawls += 1
+            self.save_state()
+
+    def crawl(self, key, query, pages):
+        """Crawl one search, save its new postings and schedule its next crawl"""
+        scraper = self.scraper
+        scraper.begin_run()
+        try:
+            self._crawl(scraper, key, query, pages)
+        finally:
+            scraper.write_run_report()
+
+    def _crawl(self, scraper, key, query, pages):
+        entry = self.entries[key]
+        seen = dict.fromkeys(entry["seen"])
+        self.budget.take(pages)
+
+        start = time.time()
+        listed = []
+        new_jobs = []
+        crawled = 0
+        for batch in scraper.iter_jobs(query.job_title, query.location, query.time_frame, pages,
+                                       self.max_jobs_per_page, batches=True, experience=query.experience):
+            crawled += 1
+            listed.extend(batch.jobs)
+            for record in batch.jobs:
+                job_key = "|".join(str(part) for part in dedup_key(record))
+                if job_key not in seen:
+                    seen[job_key] = None
+                    new_jobs.append(record)
+        self.budget.refund(pages - crawled)
+
+        # EWMA of new postings per hour; the first crawl only establishes what has been seen
+        last_crawl = entry.get("last_crawl")
+        if last_crawl and crawled:
+            observed = len(new_jobs) / max((start - last_crawl) / 3600, 1 / 60)
+            rate = entry["rate"]
+            entry["rate"] = observed if rate is None else self.alpha * observed + (1 - self.alpha) * rate
+        interval = self.next_interval(entry["rate"]) if crawled else self.min_interval
+        entry.update(
+            last_crawl=start,
+            next_due=time.time() + interval,
+            crawls=entry["crawls"] + 1,
+            last_new=len(new_jobs),
+            seen=list(seen)[-SEEN_LIMIT:]
+        )
+        rate_text = f"{entry['rate']:.1f}/h" if entry["rate"] is not None else "unknown"
+        logger.info(f"Crawled {describe(query)}: {len(listed)} jobs from {crawled} pages, {len(new_jobs)} new "
+                    f"(rate {rate_text}); next crawl in {interval / 3600:.1f} h")
+        scraper.metrics.incr("daemon_crawls")
+        scraper.metrics.incr("daemon_new_jobs", len(new_jobs))
+
+        # The change log compares everything listed; the output files only get the new postings
+        if listed:
+            scraper.log_changes(query.job_title, query.location, query.time_frame, records=listed,
+                                experience=query.experience)
+        if new_jobs:
+            scraper.job_listings = new_jobs
+            scraper.save_data(query.job_title, query.location, query.time_frame, formats=self.formats,
+                              track_changes=False)
+
+
+def main(argv=None):
+    """Command line entry point of the daemon subcommand"""
+    from joblistingscraper import NaukriScraper, configure_logging
+
+    parser = argparse.ArgumentParser(prog="joblistingscraper.py daemon",
+                                     description="Keep searches fresh, recrawling each as often as it gets new postings")
+    parser.add_argument("--queries", type=str, required=True,
+                        help="CSV or JSONL file of searches (job_title, location, time_frame, optional pages, priority and experience)")
+    parser.add_argument("--state", type=str, default=DEFAULT_STATE_FILE, help=f"Schedule state file (default: {DEFAULT_STATE_FILE})")
+    parser.add_argument("--pages_per_hour", type=int, default=200, help="Result pages crawled per hour across all searches (default: 200)")
+    parser.add_argument("--min_interval", type=float, default=30, help="Minutes between crawls of the busiest search (default: 30)")
+    parser.add_argument("--max_interval", type=float, default=24, help="Hours between crawls of the quietest search (default: 24)")
+    parser.add_argument("--target_new", type=int, default=20, help="New postings a recrawl should typically find (default: 20)")
+    parser.add_argument("--pages", type=int, default=3, help="Pages per crawl unless the query file says otherwise (default: 3)")
+    parser.add_argument("--time_frame", type=str, default="week", help="Time frame unless the query file says otherwise (default: week)")
+    parser.add_argument("--jobs_per_page", type=int, default=20, help="Maximum jobs to extract per page (default: 20)")
+    parser.add_argument("--backend", type=str, default="selenium", choices=["selenium", "http"], help="Page backend (default: selenium)")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome in headless mode")
+    parser.add_argument("--formats", type=str, default="json,csv", help="Output formats for new postings (default: json,csv)")
+    parser.add_argument("--max_crawls", type=int, help="Exit after this many crawls (default: run until stopped)")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    queries = load_queries(args.queries, default_time_frame=args.time_frame, default_pages=args.pages)
+    scraper = NaukriScraper(headless=args.headless, backend=args.backend)
+    daemon = CrawlDaemon(scraper, queries, args.state, pages_per_hour=args.pages_per_hour,
+                         min_interval=args.min_interval * 60, max_interval=args.max_interval * 3600,
+                         target_new=args.target_new, max_jobs_per_page=args.jobs_per_page,
+                         formats=args.formats.split(","))
+
+    # SIGTERM (e.g. from systemd) ends the current wait and the loop after the running crawl
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop.set())
+    try:
+        daemon.run(args.max_crawls)
+    except KeyboardInterrupt:
+        logger.info("Interrupted, saving the schedule")
+    finally:
+        daemon.save_state()
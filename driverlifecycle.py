@@ -0,0 +1,67 @@
+"""When to replace a long-running browser session
+
+Chrome accumulates memory and DOM state over a long crawl and slows down with
+it. DriverLifecycle counts the pages a session has served and samples the
+browser's resident memory every few pages; once either passes its threshold
+the scraper closes the session between two pages and carries on in a new one
+from the next page's URL.
+"""
+import logging
+import time
+
+from processmemory import browser_rss
+
+logger = logging.getLogger(__name__)
+
+
+class DriverLifecycle:
+    """Page-count and RSS thresholds for recycling the browser (0 or None disables a threshold)"""
+
+    def __init__(self, max_pages=200, max_rss_mb=1500, check_every=5):
+        self.max_pages = max_pages
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+        self.check_every = max(1, check_every)
+        self.pages = 0
+        self.started_at = None
+        self.last_rss = None
+        self.peak_rss = 0
+        self.recycles = {}
+        self.session_pages = []
+
+    def started(self):
+        """A new browser session has started"""
+        self.pages = 0
+        self.last_rss = None
+        self.started_at = time.monotonic()
+
+    def page_served(self):
+        self.pages += 1
+
+    def recycle_reason(self, driver):
+        """Why the session should be replaced now, or None"""
+        if driver is None or not self.pages:
+            return None
+        if self.max_pages and self.pages >= self.max_pages:
+            return "pages"
+        if self.max_rss_bytes and self.pages % self.check_every == 0:
+            rss = browser_rss(driver)
+            if rss is not None:
+                self.last_rss = rss
+                self.peak_rss = max(self.peak_rss, rss)
+                if rss >= self.max_rss_bytes:
+                    return "rss"
+        return None
+
+    def recycled(self, reason):
+        """Account for a session replaced for the given reason"""
+        self.recycles[reason] = self.recycles.get(reason, 0) + 1
+        self.session_pages.append(self.pages)
+        rss = f", browser RSS {self.last_rss / 1048576:.0f} MB" if self.last_rss else ""
+        logger.info(f"Recycling the browser after {self.pages} pages ({reason} threshold{rss})")
+
+    def stats(self):
+        return {
+            "recycles": dict(self.recycles),
+            "pages_per_session": self.session_pages + [self.pages],
+            "peak_browser_rss_mb": round(self.peak_rss / 1048576, 1) if self.peak_rss else None
+        }
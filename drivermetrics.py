@@ -0,0 +1,117 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Raw commands kept for inspection; the totals cover every command
+SAMPLE_SIZE = 1000
+
+
+class CommandRecorder:
+    """Record every remote WebDriver command sent through a driver
+
+    Attaching wraps the driver's ``execute`` method. WebElements call back into
+    their parent driver's ``execute``, so lookups made relative to a job card
+    are captured as well. Totals per command type, page, field and selector are
+    added up as commands arrive; only the last SAMPLE_SIZE raw commands are kept.
+    """
+
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.page = None
+        self.field = None
+        self.sample_size = sample_size
+        self._driver = None
+        self._original_execute = None
+        self.reset()
+
+    def reset(self):
+        """Drop the totals and the sample, e.g. at the start of a new run"""
+        self.commands = deque(maxlen=self.sample_size)
+        self.total_commands = 0
+        self.total_seconds = 0.0
+        self.by_command = {}
+        self.by_page = {}
+        self.by_field = {}
+        self.by_selector = {}
+
+    def attach(self, driver):
+        """Start recording the commands of the given driver"""
+        from selenium.common.exceptions import NoSuchElementException
+        
+        self._driver = driver
+        self._original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            missing = False
+            try:
+                return self._original_execute(driver_command, params)
+            except NoSuchElementException:
+                missing = True
+                raise
+            finally:
+                self._record(driver_command, params, time.perf_counter() - start, missing)
+
+        driver.execute = execute
+        return driver
+
+    def detach(self):
+        """Restore the driver's original execute method"""
+        if self._driver is not None:
+            try:
+                del self._driver.execute
+            except AttributeError:
+                pass
+        self._driver = None
+        self._original_execute = None
+
+    @contextmanager
+    def scope(self, field):
+        """Attribute the commands issued inside the block to a field"""
+        previous = self.field
+        self.field = field
+        try:
+            yield
+        finally:
+            self.field = previous
+
+    def _record(self, command, params, seconds, missing):
+        selector = None
+        if params:
+            if "using" in params and "value" in params:
+                selector = params["value"]
+            elif "script" in params:
+                selector = params["script"][:80]
+        page, field = self.page, self.field
+        self.commands.append((command, selector, seconds, missing, page, field))
+
+        self.total_commands += 1
+        self.total_seconds += seconds
+        _add(self.by_command, command, seconds, missing)
+        _add(self.by_page, str(page) if page is not None else "none", seconds, missing)
+        _add(self.by_field, field or "none", seconds, missing)
+        if selector is not None and command.startswith("find"):
+            _add(self.by_selector, (field or "none", selector), seconds, missing)
+
+    def summary(self, top=25):
+        """Break the recorded commands down by type, page, field and selector"""
+        # The costliest selector cascades first, so they are easy to prune
+        costliest = sorted(self.by_selector.items(), key=lambda item: item[1]["seconds"], reverse=True)[:top]
+
+        return {
+            "total_commands": self.total_commands,
+            "total_seconds": round(self.total_seconds, 4),
+            "by_command": self.by_command,
+            "by_page": self.by_page,
+            "by_field": self.by_field,
+            "costliest_selectors": [
+                dict(stats, field=field, selector=selector) for (field, selector), stats in costliest
+            ]
+        }
+
+
+def _add(table, key, seconds, missing):
+    entry = table.setdefault(key, {"calls": 0, "seconds": 0.0, "not_found": 0})
+    entry["calls"] += 1
+    entry["seconds"] += seconds
+    if missing:
+        entry["not_found"] += 1
@@ -0,0 +1,261 @@
+"""Stream job records to several output formats at once
+
+Records are handed over in chunks of rows. Every requested format has its own
+writer thread fed through a small bounded queue, so the formats are written
+concurrently and memory use depends on the chunk size, not on the number of
+records. The writers only keep the current chunk: csv.writer for CSV, JSON
+serialized record by record (with orjson when it is installed, optionally
+gzip-compressed), and xlsxwriter's constant_memory mode or openpyxl's
+write-only workbooks for Excel.
+"""
+import csv
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Excel's row limit, including the header row
+EXCEL_MAX_ROWS = 1048576
+
+
+def _dumps(record, indent=False):
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(record, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class FormatWriter:
+    """Writes chunks of rows to one file on its own thread"""
+
+    label = ""
+    extension = ""
+
+    def __init__(self, base_path, fields, queue_size=4):
+        self.path = base_path + self.extension
+        self.fields = list(fields)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.file = None
+        self.rows = 0
+        self.seconds = 0.0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name=f"export-{self.label.lower()}", daemon=True)
+
+    def open(self):
+        raise NotImplementedError
+
+    def write(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+    def _run(self):
+        try:
+            start = time.perf_counter()
+            self.open()
+            self.seconds += time.perf_counter() - start
+            while True:
+                rows = self.queue.get()
+                if rows is None:
+                    break
+                start = time.perf_counter()
+                self.write(rows)
+                self.rows += len(rows)
+                self.seconds += time.perf_counter() - start
+        except Exception as e:
+            self.error = e
+            logger.error(f"Error writing {self.path}: {e}")
+        finally:
+            start = time.perf_counter()
+            try:
+                self.close()
+            except Exception as e:
+                self.error = self.error or e
+                logger.error(f"Error closing {self.path}: {e}")
+            self.seconds += time.perf_counter() - start
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, rows):
+        """Queue a chunk of rows, waiting while the writer is behind; False once it has failed"""
+        while self.error is None:
+            try:
+                self.queue.put(rows, timeout=0.5)
+                return True
+            except queue.Full:
+                if not self._thread.is_alive():
+                    return False
+        return False
+
+    def finish(self):
+        """Flush the remaining chunks and close the file"""
+        self.submit(None)
+        self._thread.join()
+
+    def stats(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        stats = {
+            "path": self.path,
+            "rows": self.rows,
+            "bytes": size,
+            "seconds": round(self.seconds, 3),
+            "rows_per_sec": round(self.rows / self.seconds, 1) if self.seconds > 0 else 0.0,
+            "mb_per_sec": round(size / 1048576 / self.seconds, 2) if self.seconds > 0 else 0.0
+        }
+        if self.error is not None:
+            stats["error"] = str(self.error)
+        return stats
+
+
+class CsvWriter(FormatWriter):
+    label = "CSV"
+    extension = ".csv"
+
+    def open(self):
+        self.file = open(self.path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.fields)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+
+class JsonWriter(FormatWriter):
+    """A JSON array of records, compact (one record per line) or indented"""
+
+    label = "JSON"
+    extension = ".json"
+
+    def __init__(self, base_path, fields, queue_size=4, compress=False, indent=False):
+        if compress:
+            self.extension = ".json.gz"
+        super().__init__(base_path, fields, queue_size)
+        self.compress = compress
+        self.indent = indent
+
+    def open(self):
+        self.file = gzip.open(self.path, "wb", compresslevel=6) if self.compress else open(self.path, "wb")
+        self.file.write(b"[")
+
+    def write(self, rows):
+        fields = self.fields
+        records = [_dumps(dict(zip(fields, row)), self.indent) for row in rows]
+        if self.indent:
+            # Nest the records one level, as json.dump(..., indent=2) does for a list
+            records = [record.replace(b"\n", b"\n  ") for record in records]
+        self.file.write((b",\n  " if self.rows else b"\n  ") + b",\n  ".join(records))
+
+    def close(self):
+        if self.file is not None:
+            self.file.write(b"\n]\n" if self.rows else b"]\n")
+        super().close()
+
+
+class ExcelWriter(FormatWriter):
+    """An .xlsx workbook written row by row (xlsxwriter, or openpyxl as a fallback)"""
+
+    label = "Excel"
+    extension = ".xlsx"
+
+    def open(self):
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+
+        self.workbook = None
+        self.row_index = 0
+        self.truncated = False
+        if xlsxwriter is not None:
+            # constant_memory writes each row out as soon as the next one starts;
+            # values are written as plain strings, as pandas did
+            self.workbook = xlsxwriter.Workbook(self.path, {
+                "constant_memory": True, "strings_to_urls": False, "strings_to_formulas": False
+            })
+            self.sheet = self.workbook.add_worksheet("Sheet1")
+        else:
+            try:
+                from openpyxl import Workbook
+            except ImportError:
+                raise RuntimeError("Excel export needs the xlsxwriter or openpyxl package") from None
+            self.workbook = Workbook(write_only=True)
+            self.sheet = self.workbook.create_sheet("Sheet1")
+        self._write_row(self.fields)
+
+    def _write_row(self, row):
+        if hasattr(self.sheet, "write_row"):
+            self.sheet.write_row(self.row_index, 0, row)
+        else:
+            self.sheet.append(row)
+        self.row_index += 1
+
+    def write(self, rows):
+        for row in rows:
+            if self.row_index >= EXCEL_MAX_ROWS:
+                if not self.truncated:
+                    logger.warning(f"{self.path} reached Excel's row limit, the remaining records are only in the other formats")
+                    self.truncated = True
+                return
+            self._write_row(row)
+
+    def close(self):
+        if self.workbook is None:
+            return
+        if hasattr(self.workbook, "save"):
+            self.workbook.save(self.path)
+        else:
+            self.workbook.close()
+
+
+WRITERS = {"json": JsonWriter, "csv": CsvWriter, "excel": ExcelWriter}
+
+
+def export_records(chunks, fields, base_path, formats, json_gzip=False, json_indent=False, queue_size=4):
+    """Write chunks of rows to every requested format concurrently
+
+    chunks is an iterable of lists of row tuples in field order; base_path gets
+    each format's extension. Returns format -> write statistics (path, rows,
+    bytes, busy seconds, rows/s and MB/s, plus "error" if the writer failed).
+    """
+    writers = {}
+    for fmt in formats:
+        fmt = fmt.strip().lower()
+        if fmt not in WRITERS:
+            logger.warning(f"Unknown output format '{fmt}', skipping it")
+            continue
+        if fmt == "json":
+            writers[fmt] = JsonWriter(base_path, fields, queue_size, compress=json_gzip, indent=json_indent)
+        else:
+            writers[fmt] = WRITERS[fmt](base_path, fields, queue_size)
+
+    for writer in writers.values():
+        writer.start()
+    try:
+        for rows in chunks:
+            if not any([writer.submit(rows) for writer in writers.values()]):
+                break
+    finally:
+        for writer in writers.values():
+            writer.finish()
+
+    results = {}
+    for fmt, writer in writers.items():
+        results[fmt] = stats = writer.stats()
+        if "error" not in stats:
+            logger.info(f"Saved {writer.label} data to {writer.path} ({stats['rows']} rows in {stats['seconds']}s, "
+                        f"{stats['rows_per_sec']:.0f} rows/s, {stats['mb_per_sec']:.1f} MB/s)")
+    return results
@@ -0,0 +1,208 @@
+import asyncio
+import gzip
+import http.client
+import logging
+import queue
+import re
+import threading
+import time
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive"
+}
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class FetchResult:
+    """Outcome of a single HTTP fetch"""
+
+    def __init__(self, url, status=None, text=None, headers=None, elapsed=0.0, size=0, error=None):
+        self.url = url
+        self.status = status
+        self.text = text
+        self.headers = headers or {}
+        self.elapsed = elapsed
+        self.size = size
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+
+class RetryableStatus(Exception):
+    """A response with a status in RETRY_STATUSES, raised so a retry policy can retry it"""
+
+    def __init__(self, result):
+        super().__init__(f"HTTP {result.status}")
+        self.result = result
+        retry_after = result.headers.get("retry-after", "")
+        self.retry_after = float(retry_after) if retry_after.isdigit() else None
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, pooled per host"""
+
+    def __init__(self, max_per_host=4, timeout=20):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._pools = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _pool(self, key):
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = queue.LifoQueue(maxsize=self.max_per_host)
+            return self._pools[key]
+
+    def acquire(self, scheme, host):
+        """Take an idle connection for the host, or open a new one"""
+        try:
+            return self._pool((scheme, host)).get_nowait()
+        except queue.Empty:
+            pass
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.connections_opened += 1
+        return connection_class(host, timeout=self.timeout)
+
+    def release(self, scheme, host, connection, reusable=True):
+        """Return a connection to the pool, closing it if it can't be reused"""
+        if not reusable:
+            connection.close()
+            return
+        try:
+            self._pool((scheme, host)).put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+def _decode_body(body, headers):
+    encoding = headers.get("content-encoding", "").lower()
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    elif encoding == "deflate":
+        try:
+            body = zlib.decompress(body)
+        except zlib.error:
+            body = zlib.decompress(body, -zlib.MAX_WBITS)
+
+    charset = "utf-8"
+    match = re.search(r"charset=([\w-]+)", headers.get("content-type", ""), re.I)
+    if match:
+        charset = match.group(1)
+    return body.decode(charset, errors="replace")
+
+
+class AsyncPageFetcher:
+    """Fetch pages concurrently over pooled keep-alive connections
+
+    Requests run on worker threads (http.client is blocking) under an asyncio
+    semaphore that bounds how many are in flight at once. With a retry_policy,
+    errors and RETRY_STATUSES responses are retried under it, and its circuit
+    breaker holds back every worker while the site is failing.
+    """
+
+    def __init__(self, concurrency=4, timeout=20, headers=None, max_redirects=5, retry_policy=None):
+        self.concurrency = concurrency
+        self.max_redirects = max_redirects
+        self.retry_policy = retry_policy
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.pool = ConnectionPool(max_per_host=concurrency, timeout=timeout)
+
+    def _request(self, url):
+        start = time.perf_counter()
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path = f"{path}?{parts.query}"
+
+            # A pooled connection may have been closed by the server; retry once on a fresh one
+            for attempt in range(2):
+                connection = self.pool.acquire(parts.scheme, parts.netloc)
+                try:
+                    connection.request("GET", path, headers=self.headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    connection.close()
+                    if attempt == 1:
+                        raise
+                except Exception:
+                    connection.close()
+                    raise
+
+            headers = {name.lower(): value for name, value in response.getheaders()}
+            self.pool.release(parts.scheme, parts.netloc, connection,
+                              reusable=not response.will_close)
+
+            if response.status in (301, 302, 303, 307, 308) and "location" in headers:
+                url = urljoin(url, headers["location"])
+                continue
+
+            return FetchResult(
+                url,
+                status=response.status,
+                text=_decode_body(body, headers),
+                headers=headers,
+                elapsed=time.perf_counter() - start,
+                size=len(body)
+            )
+        raise RuntimeError(f"Too many redirects for {url}")
+
+    def _request_checked(self, url):
+        result = self._request(url)
+        if result.status in RETRY_STATUSES:
+            raise RetryableStatus(result)
+        return result
+
+    async def fetch(self, url, semaphore=None):
+        """Fetch one URL; errors are returned in the result rather than raised"""
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if self.retry_policy is None:
+                    return await asyncio.to_thread(self._request, url)
+                return await asyncio.to_thread(self.retry_policy.call, "http_fetch", self._request_checked, url)
+            except RetryableStatus as e:
+                logger.warning(f"HTTP {e.result.status} for {url} after retries")
+                return e.result
+            except Exception as e:
+                logger.warning(f"HTTP fetch failed for {url}: {e}")
+                return FetchResult(url, elapsed=time.perf_counter() - start, error=e)
+
+    async def fetch_all(self, urls):
+        """Fetch URLs with bounded concurrency, returning results in input order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self.fetch(url, semaphore) for url in urls))
+
+    def fetch_many(self, urls):
+        """Synchronous entry point around fetch_all"""
+        return asyncio.run(self.fetch_all(urls))
+
+    def close(self):
+        self.pool.close()
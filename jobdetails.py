@@ -0,0 +1,285 @@
+"""Full job details from each posting's own page, fetched once per job ID
+
+Cards only carry snippets; the full description, the key skills, the role
+category and the employment type are on the job's detail page. DetailEnricher
+fetches the detail pages of jobs it hasn't seen before, concurrently over HTTP
+under the scraper's retry policy. It loads the pages the HTTP fetch couldn't
+use (blocked, or rendered by JavaScript) in Chrome, one after another. Fields
+come from the page's JobPosting JSON-LD and fall back to the labelled detail
+sections of the markup. The fields, or the fact that the job was taken down,
+are kept in a SQLite cache keyed by job ID, so no detail page is fetched twice
+across runs. Block and error pages aren't cached; a later run tries again.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from pageclassifier import CHALLENGE, classify_page
+from structureddata import clean_text, extract_ld_json, job_id_from_url, job_posting_record
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_FILE = os.path.join("cache", "job_details.sqlite3")
+
+# Detail page URL of a job whose card link wasn't found
+DETAIL_URL = "https://www.naukri.com/job-listings-{job_id}"
+
+# Fields the detail page has in full; they replace the card's snippets
+DETAIL_FIELDS = ("description", "skills", "role_category", "employment_type")
+
+# Card fields only filled in from the detail page when the card didn't have them
+CARD_FIELDS = ("title", "company", "location", "experience", "salary")
+
+# Detail pages fetched and cached per round
+WINDOW_SIZE = 50
+
+# Text of a posting page whose job has been taken down; only such pages are cached as empty
+EXPIRED_MARKERS = ("no longer available", "job has expired", "job has been removed", "no longer accepting applications",
+                   "this job is closed")
+
+LD_JSON_CHECK_SCRIPT = ("return Array.from(document.querySelectorAll('script[type=\"application/ld+json\"]'))"
+                        ".some(s => s.text.indexOf('JobPosting') >= 0);")
+
+DETAIL_LABEL_RE = re.compile(
+    r"<label[^>]*>\s*(Role Category|Employment Type|Role|Department|Industry Type)\s*:?\s*</label>\s*"
+    r"<span[^>]*>(.*?)</span>",
+    re.IGNORECASE | re.DOTALL
+)
+DESCRIPTION_RE = re.compile(r"<(section|div)[^>]*class=\"[^\"]*job-desc[^\"]*\"[^>]*>(.*?)</\1>", re.IGNORECASE | re.DOTALL)
+KEY_SKILLS_RE = re.compile(r"Key\s+Skills(.{0,8000})", re.IGNORECASE | re.DOTALL)
+SKILL_CHIP_RE = re.compile(r"<a[^>]*class=\"[^\"]*chip[^\"]*\"[^>]*>(.*?)</a>", re.IGNORECASE | re.DOTALL)
+
+
+def _markup_fields(source):
+    """Detail fields from the labelled sections of the page, for pages without JSON-LD"""
+    fields = {}
+    labels = {clean_text(label).lower(): clean_text(value) for label, value in DETAIL_LABEL_RE.findall(source)}
+    if labels.get("role category"):
+        fields["role_category"] = labels["role category"]
+    if labels.get("employment type"):
+        fields["employment_type"] = labels["employment type"]
+
+    match = DESCRIPTION_RE.search(source)
+    description = clean_text(match.group(2)) if match else None
+    if description:
+        fields["description"] = description
+
+    match = KEY_SKILLS_RE.search(source)
+    if match:
+        skills = [clean_text(chip) for chip in SKILL_CHIP_RE.findall(match.group(1))]
+        skills = [skill for skill in dict.fromkeys(skills) if skill]
+        if skills:
+            fields["skills"] = ", ".join(skills)
+    return fields
+
+
+def detail_fields(source, url=None):
+    """Fields of the job posting on a detail page (empty if it has none)"""
+    for block in extract_ld_json(source):
+        types = block.get("@type", [])
+        if "JobPosting" in (types if isinstance(types, list) else [types]):
+            fields = job_posting_record(block, url)
+            fields.pop("link", None)
+            fields.pop("job_id", None)
+            # Sections JSON-LD left out may still be in the markup
+            for key, value in _markup_fields(source).items():
+                fields.setdefault(key, value)
+            return fields
+    return _markup_fields(source or "")
+
+
+class DetailCache:
+    """job ID -> detail fields, in a SQLite file shared by all runs"""
+
+    def __init__(self, path=DEFAULT_CACHE_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        # WAL lets a daemon and a cron run share the cache
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS job_details ("
+            "job_id TEXT PRIMARY KEY, fetched_at REAL NOT NULL, via TEXT, fields TEXT NOT NULL)"
+        )
+        self.connection.commit()
+
+    def get_many(self, job_ids):
+        """Cached fields of the given job IDs that are in the cache"""
+        found = {}
+        job_ids = list(job_ids)
+        with self._lock:
+            # SQLite limits the number of bound parameters per statement
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                rows = self.connection.execute(
+                    f"SELECT job_id, fields FROM job_details WHERE job_id IN ({','.join('?' * len(chunk))})", chunk)
+                found.update((job_id, json.loads(fields)) for job_id, fields in rows)
+        return found
+
+    def put_many(self, entries, via):
+        """Store (job_id, fields) pairs fetched via 'http' or 'browser'"""
+        now = time.time()
+        with self._lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO job_details (job_id, fetched_at, via, fields) VALUES (?, ?, ?, ?)",
+                [(job_id, now, via, json.dumps(fields, ensure_ascii=False)) for job_id, fields in entries])
+            self.connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM job_details").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+
+class DetailEnricher:
+    """Add detail-page fields to job records, fetching each job's page at most once"""
+
+    def __init__(self, scraper, cache=None, concurrency=4, browser_fallback=True):
+        self.scraper = scraper
+        self.cache = cache if cache is not None else DetailCache()
+        self.concurrency = concurrency
+        self.browser_fallback = browser_fallback and not scraper.replay
+        self.stats = {"cached": 0, "http": 0, "browser": 0, "failed": 0}
+
+    @staticmethod
+    def detail_key(record):
+        """The job ID and detail page URL of a record, or (None, None)"""
+        job_id = record.get("job_id")
+        link = record.get("link")
+        if not link or link == "Link not found":
+            link = None
+        if not job_id or job_id == "job-card-id":
+            job_id = job_id_from_url(link)
+        if not job_id:
+            return None, None
+        return job_id, link or DETAIL_URL.format(job_id=job_id)
+
+    def enrich(self, records):
+        """The records with their detail fields added, in the same order"""
+        records = list(records)
+        before = dict(self.stats)
+        with self.scraper.metrics.timer("enrich_details"):
+            urls = {}
+            for record in records:
+                job_id, url = self.detail_key(record)
+                if job_id:
+                    urls.setdefault(job_id, url)
+
+            details = self.cache.get_many(urls)
+            self.stats["cached"] += len(details)
+            missing = [job_id for job_id in urls if job_id not in details]
+            logger.info(f"Job details: {len(details)} of {len(urls)} jobs cached, fetching {len(missing)}")
+            if missing and not self.scraper.replay:
+                details.update(self.fetch(missing, urls))
+
+        enriched = [self.merge(record, details.get(self.detail_key(record)[0])) for record in records]
+        for name, count in self.stats.items():
+            self.scraper.metrics.incr(f"details_{name}", count - before[name])
+        self.scraper.metrics.extra["job_details"] = dict(self.stats, cache_size=len(self.cache))
+        return enriched
+
+    def fetch(self, job_ids, urls):
+        """Fetch and cache the detail fields of the given jobs"""
+        from httpfetcher import AsyncPageFetcher
+        from joblistingscraper import USER_AGENT
+
+        details = {}
+        unusable = []
+        fetcher = AsyncPageFetcher(concurrency=self.concurrency, headers={"User-Agent": USER_AGENT},
+                                   retry_policy=self.scraper.retry_policy)
+        try:
+            # Cached window by window, so an interrupted run keeps what it fetched
+            for start in range(0, len(job_ids), WINDOW_SIZE):
+                window = job_ids[start:start + WINDOW_SIZE]
+                fetched = []
+                with self.scraper.metrics.timer("detail_fetch"):
+                    results = fetcher.fetch_many([urls[job_id] for job_id in window])
+                for job_id, result in zip(window, results):
+                    fields = detail_fields(result.text, result.url) if result.ok else {}
+                    if fields:
+                        fetched.append((job_id, fields))
+                    else:
+                        unusable.append(job_id)
+                self.cache.put_many(fetched, "http")
+                details.update(fetched)
+                self.stats["http"] += len(fetched)
+        finally:
+            fetcher.close()
+
+        if unusable and self.browser_fallback:
+            logger.info(f"Loading {len(unusable)} detail pages the HTTP fetch couldn't use in Chrome")
+            details.update(self.fetch_in_browser(unusable, urls))
+        else:
+            self.stats["failed"] += len(unusable)
+        return details
+
+    def fetch_in_browser(self, job_ids, urls):
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        scraper = self.scraper
+        details = {}
+        try:
+            for i, job_id in enumerate(job_ids):
+                try:
+                    scraper.start_driver()
+                except Exception as e:
+                    logger.warning(f"Could not start Chrome for {len(job_ids) - i} detail pages: {e}")
+                    self.stats["failed"] += len(job_ids) - i
+                    break
+                try:
+                    scraper.retry_policy.call("detail_load", scraper.driver.get, urls[job_id])
+                    try:
+                        WebDriverWait(scraper.driver, scraper.wait_time).until(
+                            lambda driver: driver.execute_script(LD_JSON_CHECK_SCRIPT))
+                    except TimeoutException:
+                        pass
+                    source = scraper.driver.page_source
+                    fields = detail_fields(source, urls[job_id])
+                except Exception as e:
+                    logger.warning(f"Could not load the detail page of job {job_id}: {e}")
+                    self.stats["failed"] += 1
+                    continue
+
+                if not fields and not any(marker in source.lower() for marker in EXPIRED_MARKERS):
+                    # A block or error page says nothing about the job: not cached, so a later run tries again
+                    verdict = classify_page(source)
+                    logger.warning(f"No job details on the page of job {job_id}: {verdict.label} page ({verdict.reason})")
+                    self.stats["failed"] += 1
+                    if verdict.label == CHALLENGE and not scraper.react_to_page(verdict):
+                        self.stats["failed"] += len(job_ids) - i - 1
+                        break
+                    continue
+
+                # A page with the posting, or the notice that it was taken down
+                self.cache.put_many([(job_id, fields)], "browser")
+                scraper.challenges = 0
+                details[job_id] = fields
+                self.stats["browser"] += 1
+                scraper.lifecycle.page_served()
+                scraper.recycle_driver_if_due()
+        finally:
+            scraper.release_driver()
+        return details
+
+    @staticmethod
+    def merge(record, fields):
+        if not fields:
+            return record
+        from joblistingscraper import RECORD_PLACEHOLDERS
+
+        record = dict(record)
+        for key in DETAIL_FIELDS:
+            if fields.get(key):
+                record[key] = fields[key]
+        for key in CARD_FIELDS:
+            if fields.get(key) and record.get(key) in (None, "", RECORD_PLACEHOLDERS.get(key)):
+                record[key] = fields[key]
+        return record
@@ -1,145 +1,281 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException
+# selenium, webdriver_manager and pandas are imported where they are used so that
+# `--help`, offline commands and plain imports of this module start instantly
 import time
 import os
+import sys
 import json
-import pandas as pd
+import importlib
 import random
 import logging
 import argparse
+import uuid
 from datetime import datetime, timedelta
 import re
+from collections import namedtuple
+from contextlib import closing, nullcontext
+from runmetrics import RunMetrics
+from driverlifecycle import DriverLifecycle
+from pageclassifier import (RESULTS, EMPTY, CHALLENGE, ERROR, CHALLENGE_MARKERS, CHALLENGE_TITLES, NO_RESULTS,
+                            BlockedPage, UnusablePage, classify_page)
+from retrypolicy import HALF_OPEN, CircuitBreaker, RetryBudget, RetryPolicy
+from siteprofile import SelectorStats, load_profile
+from structuredlogging import configure_logging, update_log_context
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("naukri_scraper.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger()
 
-class NaukriScraper:
-    def __init__(self, headless=True, wait_time=15):
-        """Initialize the scraper with options"""
-        self.wait_time = wait_time
-        
-        # Set up Chrome options
-        self.chrome_options = Options()
-        if headless:
-            self.chrome_options.add_argument("--headless")
-        
-        # Add user agent to appear more like a real browser
-        self.chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
-        self.chrome_options.add_argument("--disable-gpu")
-        self.chrome_options.add_argument("--no-sandbox")
-        self.chrome_options.add_argument("--disable-dev-shm-usage")
-        self.chrome_options.add_argument("--disable-notifications")
-        
-        # Initialize the driver
-        self.driver = None
+# Where the resolved chromedriver path is pinned between runs
+CHROMEDRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "naukri_scraper", "chromedriver.json")
+
+def resolve_chromedriver(driver_path=None, offline=False, refresh=False, cache_file=CHROMEDRIVER_CACHE_FILE):
+    """Find the chromedriver executable without a network round trip when possible
+    
+    Order: explicit path / CHROMEDRIVER_PATH, then the pinned path in the cache file,
+    then webdriver_manager (online only). Returns None in offline mode when nothing is
+    pinned, which lets Selenium look for a driver on PATH.
+    """
+    driver_path = driver_path or os.environ.get("CHROMEDRIVER_PATH")
+    if driver_path:
+        return driver_path
+    
+    if not refresh:
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cached_path = json.load(f).get("path")
+            if cached_path and os.path.exists(cached_path):
+                logger.info(f"Using pinned chromedriver {cached_path}")
+                return cached_path
+        except (OSError, ValueError):
+            pass
+    
+    if offline:
+        logger.info("Offline mode: no pinned chromedriver, falling back to PATH")
+        return None
+    
+    from webdriver_manager.chrome import ChromeDriverManager
+    resolved_path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump({"path": resolved_path, "resolved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}, f)
+    except OSError as e:
+        logger.warning(f"Could not pin chromedriver path: {e}")
+    return resolved_path
+
+# Third-party hosts seen in the saved search page that the job cards never need.
+# The Akamai sensor (/akam/...) is deliberately left alone: blocking it gets the session challenged.
+DEFAULT_BLOCKED_DOMAINS = [
+    "googletagmanager.com",
+    "google-analytics.com",
+    "googletagservices.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "adtrafficquality.google",
+    "nLoggerJB",
+    "ub_v1"
+]
+
+# URL patterns for each resource type that can be blocked
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg"],
+    "stylesheet": ["*.css"]
+}
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["image", "font", "media"]
+
+# Card, field, pagination and filter selectors are declared in the site profile
+# (naukri_profile.json) and compiled once here; --profile loads another one
+DEFAULT_SITE_PROFILE = load_profile()
+
+# Keys of a job record, in output column order (parsed_date is added after extraction)
+RECORD_FIELDS = ["title", "company", "location", "experience", "salary", "description", "skills",
+                 "link", "posted_date", "job_id", "extracted_time"]
+
+# Columns of a finished job record
+RECORD_COLUMNS = RECORD_FIELDS + ["parsed_date"]
+
+# Values that mean "missing"; the record store keeps them as null bits rather than strings
+RECORD_PLACEHOLDERS = DEFAULT_SITE_PROFILE.placeholders()
+RECORD_PLACEHOLDERS.update({"link": "Link not found", "job_id": "job-card-id", "parsed_date": "Unknown"})
+
+# Low-cardinality fields stored as interned categoricals
+CATEGORICAL_FIELDS = ["company", "location", "experience", "salary", "posted_date", "parsed_date", "extracted_time"]
+
+# Records handed to the exporter at a time
+EXPORT_CHUNK_SIZE = 5000
+
+# One extracted results page, as yielded by NaukriScraper.iter_pages
+PageBatch = namedtuple("PageBatch", ["page", "url", "jobs"])
+
+# Label under which JSON-LD shows up in the per-field hit rates
+STRUCTURED_DATA_SOURCE = "ld+json"
+
+# All a JSON-LD ItemList entry gives about a job, short of a full JobPosting
+ITEM_LIST_FIELDS = {"title", "link", "job_id"}
+
+# Browser-like user agent shared by Chrome and the HTTP backend
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36"
+
+# Naukri's jobAge URL parameter only supports a few freshness windows
+JOB_AGE_DAYS = {"day": 1, "week": 7, "month": 30}
+
+# Collects transfer size and timing of the current document from the Performance API.
+# Cross-origin resources without Timing-Allow-Origin report a transferSize of 0.
+PAGE_LOAD_STATS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? nav.transferSize : 0;
+for (const r of resources) { bytes += r.transferSize || 0; }
+return {
+    transfer_bytes: bytes,
+    resources: resources.length,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd / 1000 : null,
+    load_event: nav && nav.loadEventEnd ? nav.loadEventEnd / 1000 : null
+};
+"""
+
+# Counts the job cards; with none, also reports whether the page is a challenge or a "no results" page
+JOB_CARDS_SCRIPT = """
+const count = document.evaluate(arguments[0], document, null, XPathResult.NUMBER_TYPE, null).numberValue;
+if (count) { return [count, false]; }
+const text = document.documentElement.outerHTML.toLowerCase();
+const title = document.title.toLowerCase();
+return [0, arguments[1].some(m => text.includes(m)) || arguments[2].some(m => title.includes(m))
+          || new RegExp(arguments[3]).test(text)];
+"""
+
+class job_cards_stable:
+    """Wait condition: the number of job cards is unchanged for a stability window
+
+    Returns once the count is non-zero, or once a page without cards shows a
+    challenge or "no results" marker, so those pages are classified right away
+    instead of after the full wait. last_count holds the final count.
+    Counting happens in the browser with document.evaluate, so each poll is a single
+    round trip and no element references are created.
+    """
+    
+    def __init__(self, xpath, stability_window=0.5):
+        self.args = ("count(" + xpath + ")", list(CHALLENGE_MARKERS), list(CHALLENGE_TITLES), NO_RESULTS.pattern)
+        self.stability_window = stability_window
+        self.last_count = None
+        self.stable_since = None
+    
+    def __call__(self, driver):
+        count, marked = driver.execute_script(JOB_CARDS_SCRIPT, *self.args)
+        count = int(count)
+        now = time.monotonic()
+        if count != self.last_count:
+            self.last_count = count
+            self.stable_since = now
+            return False
+        if (count > 0 or marked) and now - self.stable_since >= self.stability_window:
+            return count or "unusable page"
+        return False
+
+def output_basename(job_title=None, location=None, time_frame=None):
+    """Output file name (without extension) for the search parameters"""
+    job_title_str = job_title.replace(' ', '_') if job_title else "all"
+    location_str = location.replace(' ', '_') if location else "all"
+    time_frame_str = time_frame if time_frame else "all_time"
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{job_title_str}_{location_str}_{time_frame_str}_{timestamp}"
+
+class PageParser:
+    """Job records from saved or fetched page sources, without a browser
+
+    The part of the scraper that the HTTP backend, replay and the reprocess
+    workers need; NaukriScraper adds the browser on top.
+    """
+    
+    def __init__(self, profile=None, learn_selector_order=True):
+        # Timers and counters for the run report
+        self.metrics = RunMetrics()
         
-        # Storage for job data
-        self.job_listings = []
+        # Selectors of the site, tried in the order learned from previous runs
+        self.profile = load_profile(profile) if profile else DEFAULT_SITE_PROFILE
+        self.selector_stats = SelectorStats.for_profile(self.profile) if learn_selector_order else None
         
-    def start_driver(self):
-        """Start the Chrome driver"""
-        if self.driver is None:
-            try:
-                self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=self.chrome_options)
-                logger.info("Chrome driver started successfully")
-            except Exception as e:
-                logger.error(f"Failed to start Chrome driver: {e}")
-                raise
+        # Source of the page last extracted, kept for the page cache and archive
+        self.last_page_source = None
     
-    def close_driver(self):
-        """Close the Chrome driver"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
-            logger.info("Chrome driver closed")
+    def finish_record(self, job_info, extracted_time=None, reference_time=None):
+        """Add the extraction time and parsed posting date to a record"""
+        job_info["extracted_time"] = extracted_time or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        job_info = {key: job_info[key] for key in RECORD_FIELDS}
+        post_date = self.parse_posting_date(job_info["posted_date"], reference_time)
+        job_info["parsed_date"] = post_date.strftime("%Y-%m-%d") if post_date else "Unknown"
+        return job_info
     
-    def load_page(self, url, retry_count=3):
-        """Load a page with retries"""
-        for attempt in range(retry_count):
-            try:
-                self.driver.get(url)
-                logger.info(f"Accessing URL: {url}")
-                
-                # Wait for the page to load using WebDriverWait
-                wait = WebDriverWait(self.driver, self.wait_time)
-                wait.until(EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'job')] | //article[contains(@class, 'job')]")))
-                logger.info("Page loaded successfully")
-                return True
-                
-            except TimeoutException:
-                logger.warning(f"Timeout on attempt {attempt+1}/{retry_count}, retrying...")
-                time.sleep(2 * (attempt + 1))  # Exponential backoff
-                
-            except Exception as e:
-                logger.error(f"Error loading page on attempt {attempt+1}/{retry_count}: {e}")
-                time.sleep(2 * (attempt + 1))
+    def structured_records(self, source, url=None):
+        """Job records from the page's JSON-LD, with per-field coverage recorded"""
+        from structureddata import jobs_from_structured_data, field_coverage
         
-        logger.error(f"Failed to load page after {retry_count} attempts")
-        return False
-    
-    def random_sleep(self, min_seconds=2, max_seconds=5):
-        """Sleep for a random time to avoid rate limiting"""
-        sleep_time = random.uniform(min_seconds, max_seconds)
-        logger.debug(f"Sleeping for {sleep_time:.2f} seconds")
-        time.sleep(sleep_time)
+        with self.metrics.timer("structured_data"):
+            records = jobs_from_structured_data(source, url)
+        
+        if records:
+            # JSON-LD shows up as one more "selector" in the per-field hit rates
+            for key, chain in self.profile.fields.items():
+                for record in records:
+                    self.metrics.record_xpath(chain.name, STRUCTURED_DATA_SOURCE, bool(record.get(key)))
+            coverage = field_coverage(records, RECORD_FIELDS[:-1])
+            covered = [field for field, share in coverage.items() if share > 0]
+            logger.info(f"Structured data: {len(records)} records covering {', '.join(covered) or 'no fields'}")
+        return records
     
-    def extract_job_listings(self, max_jobs_per_page=20):
-        """Extract job listings from the current page"""
-        page_jobs = []
+    def parse_page_source(self, source, url=None, max_jobs_per_page=20, fetch_time=None):
+        """Extract job listings from a page source without a browser
         
-        try:
-            # Try different XPaths to find job cards
-            job_cards = self.driver.find_elements(By.XPATH, "//article[contains(@class, 'job')] | //div[contains(@class, 'jobTuple')] | //div[contains(@class, 'nI-gNb-job')]")
-            
-            logger.info(f"Found {len(job_cards)} potential job listings on this page")
+        fetch_time is when the page was captured; relative dates such as
+        "3 days ago" are resolved against it (default: now).
+        """
+        from offlineparser import parse_html, find_all, extract_job_cards
+        from structureddata import StructuredIndex
+        
+        self.last_page_source = source
+        with self.metrics.timer("parse_page_source"):
+            structured_records = self.structured_records(source, url)
             
-            # Limit the number of jobs to extract per page
-            job_cards = job_cards[:max_jobs_per_page]
+            root = parse_html(source)
+            card_xpath = self.profile.cards.union.xpath
+            structured = StructuredIndex(structured_records, len(find_all(root, card_xpath)))
+            records = extract_job_cards(root, card_xpath, self.profile.field_xpaths(self.selector_stats),
+                                        self.profile.link.union.xpath, base_url=url, max_jobs=max_jobs_per_page,
+                                        known=structured.lookup,
+                                        record=lambda key, xpath, hit: self.record_selector(self.profile.fields[key], xpath, hit))
             
-            for i, card in enumerate(job_cards):
-                try:
-                    job_info = self.extract_job_details(card)
-                    
-                    # Check if we can parse the date correctly
-                    post_date = self.parse_posting_date(job_info["posted_date"])
-                    job_info["parsed_date"] = post_date.strftime("%Y-%m-%d") if post_date else "Unknown"
-                    
-                    page_jobs.append(job_info)
-                    logger.debug(f"Extracted job {i+1}/{len(job_cards)}: {job_info.get('title', 'Unknown title')}")
-                except StaleElementReferenceException:
-                    logger.warning("Stale element encountered, skipping job card")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error extracting job details: {e}")
-                    continue
-                
-        except Exception as e:
-            logger.error(f"Error in job extraction: {e}")
+            # Server-rendered pages may carry the results only as structured data. An ItemList
+            # of titles and links alone is the shell of a page rendered by JavaScript: no
+            # records, so the HTTP backend loads it in Chrome instead
+            if not records and structured_records and all(set(record) - ITEM_LIST_FIELDS for record in structured_records):
+                records = [self.placeholder_record(record) for record in structured_records[:max_jobs_per_page]]
         
-        return page_jobs
+        extracted_time = (fetch_time or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        return [self.finish_record(record, extracted_time, fetch_time) for record in records]
     
-    def parse_posting_date(self, date_text):
-        """Parse the posting date from text like 'Posted 2 days ago', 'Posted on 12 Apr' etc."""
+    def placeholder_record(self, known):
+        """A job record built from known fields, with the usual placeholders for the rest"""
+        job_info = {key: known.get(key) or f"{chain.name} not found" for key, chain in self.profile.fields.items()}
+        job_info["link"] = known.get("link") or "Link not found"
+        job_info["job_id"] = known.get("job_id") or "job-card-id"
+        return job_info
+    
+    def parse_posting_date(self, date_text, reference_time=None):
+        """Parse the posting date from text like 'Posted 2 days ago', 'Posted on 12 Apr' etc.
+        
+        Relative dates are resolved against reference_time (default: now).
+        """
         try:
             if not date_text or date_text == "Posted date not found":
                 return None
                 
-            today = datetime.now()
+            today = reference_time or datetime.now()
+            
+            # ISO dates, as used by structured data (e.g. "2025-04-11" or "2025-04-11T10:00:00Z")
+            iso_match = re.match(r'(\d{4})-(\d{2})-(\d{2})', date_text)
+            if iso_match:
+                return datetime(int(iso_match.group(1)), int(iso_match.group(2)), int(iso_match.group(3)))
             
             # Pattern for "Posted X days ago" or "Few hours ago"
             if "day" in date_text.lower():
@@ -194,98 +330,548 @@ class NaukriScraper:
             logger.error(f"Error parsing date '{date_text}': {e}")
             return None
     
-    def extract_job_details(self, card):
-        """Extract details from a job card"""
-        job_info = {}
+    def record_selector(self, chain, xpath, hit, seconds=None):
+        """Count a selector attempt in the run metrics and the learned selector order"""
+        self.metrics.record_xpath(chain.name, xpath, hit)
+        if self.selector_stats is not None:
+            self.selector_stats.record(chain.key, xpath, hit, seconds)
+
+class NaukriScraper(PageParser):
+    def __init__(self, headless=True, wait_time=15, record_commands=False,
+                 block_resources=False, blocked_domains=None, blocked_resource_types=None,
+                 page_load_strategy="eager", stability_window=0.5,
+                 driver_path=None, offline=False, backend="selenium", http_concurrency=4,
+                 capture_api=False, cache_dir=None, cache_ttl=24 * 3600, cache_max_mb=500, replay=False,
+                 archive_dir=None, profile=None, learn_selector_order=True,
+                 retry_budget=30, breaker_threshold=5, breaker_cooldown=30, max_challenges=2, tabs=1,
+                 recycle_pages=200, recycle_rss_mb=1500):
+        """Initialize the scraper with options"""
+        self.wait_time = wait_time
+        self.headless = headless
+        
+        # Result pages loaded concurrently in tabs of one browser session (selenium backend)
+        self.tabs = max(1, tabs)
+        if self.tabs > 1 and capture_api:
+            # The performance log can't tell which tab a search API response belongs to
+            logger.warning("--capture_api is not supported with several tabs, extracting from the rendered cards")
+            capture_api = False
+        
+        # 'selenium' renders every page in Chrome; 'http' fetches server-rendered pages
+        # directly and only falls back to Chrome for pages that need JavaScript
+        self.backend = backend
+        self.http_concurrency = http_concurrency
+        
+        # Seconds the job card count must stay unchanged before a page counts as ready
+        self.stability_window = stability_window
+        
+        # 'eager' returns from driver.get at DOMContentLoaded instead of waiting for every
+        # ad and tracker; readiness is decided by the job cards themselves
+        self.page_load_strategy = page_load_strategy
+        
+        # chromedriver resolution: explicit path, pinned cache, or webdriver_manager when online
+        self.driver_path = driver_path
+        self.offline = offline
+        
+        # Optionally block ads, trackers and heavy resources the job cards don't need
+        self.block_resources = block_resources
+        self.blocked_domains = list(blocked_domains if blocked_domains is not None else DEFAULT_BLOCKED_DOMAINS)
+        self.blocked_resource_types = list(blocked_resource_types if blocked_resource_types is not None else DEFAULT_BLOCKED_RESOURCE_TYPES)
+        
+        # Read job records from the site's search API responses instead of the rendered cards
+        self.capture_api = capture_api
+        self.api_capture = None
+        if capture_api:
+            from searchapi import SearchApiCapture
+            self.api_capture = SearchApiCapture()
+        
+        # Optional on-disk cache of page sources; replay serves every page from it
+        self.replay = replay
+        self.page_cache = None
+        if cache_dir or replay:
+            from pagecache import PageCache
+            self.page_cache = PageCache(cache_dir or "cache/pages", ttl=cache_ttl, max_bytes=cache_max_mb * 1024 * 1024)
+        
+        # Optional append-only archive of every crawled page
+        self.archive = None
+        if archive_dir:
+            from crawlarchive import CrawlArchive
+            self.archive = CrawlArchive(archive_dir)
         
-        # Use a helper function to extract text with multiple XPath attempts
-        job_info["title"] = self.extract_with_xpath(card, [
-            ".//a[contains(@class, 'title')]",
-            ".//a[contains(@class, 'jobTitle')]",
-            ".//a[contains(@title, 'Job Details')]",
-            ".//h2",
-            ".//a[1]"
-        ], "Title")
-        
-        job_info["company"] = self.extract_with_xpath(card, [
-            ".//a[contains(@class, 'company')]",
-            ".//a[contains(@class, 'companyName')]",
-            ".//span[contains(@class, 'company')]",
-            ".//span[contains(@class, 'org')]"
-        ], "Company")
-        
-        job_info["location"] = self.extract_with_xpath(card, [
-            ".//span[contains(@class, 'location')]",
-            ".//span[contains(@class, 'loc')]",
-            ".//span[contains(@class, 'locWdth')]",
-            ".//div[contains(@class, 'location')]",
-            ".//span[contains(text(), 'Location')]/following-sibling::span"
-        ], "Location")
-        
-        job_info["experience"] = self.extract_with_xpath(card, [
-            ".//span[contains(@class, 'experience')]",
-            ".//span[contains(@class, 'exp')]",
-            ".//li[contains(text(), 'Yrs')]",
-            ".//span[contains(text(), 'Experience')]/following-sibling::span"
-        ], "Experience")
-        
-        job_info["salary"] = self.extract_with_xpath(card, [
-            ".//span[contains(@class, 'salary')]",
-            ".//span[contains(@class, 'sal')]",
-            ".//span[contains(text(), 'PA')]",
-            ".//span[contains(text(), 'CTC')]/parent::*"
-        ], "Salary")
-        
-        job_info["description"] = self.extract_with_xpath(card, [
-            ".//div[contains(@class, 'job-description')]",
-            ".//div[contains(@class, 'description')]",
-            ".//ul[contains(@class, 'description')]",
-            ".//div[contains(@class, 'jobDesc')]"
-        ], "Description")
-        
-        job_info["skills"] = self.extract_with_xpath(card, [
-            ".//span[contains(@class, 'skill')]",
-            ".//ul[contains(@class, 'skill')]/li",
-            ".//div[contains(@class, 'skill')]",
-            ".//span[contains(text(), 'Skills')]/following-sibling::*"
-        ], "Skills")
-        
-        # Extract job link
+        # Selectors, run metrics and the last page source
+        super().__init__(profile, learn_selector_order)
+        
+        # Chrome options are built when the driver starts
+        self.chrome_options = None
+        
+        # Initialize the driver; it is replaced between pages once it has served
+        # recycle_pages pages or its processes use recycle_rss_mb of memory
+        self.driver = None
+        self.keep_driver = False
+        self.lifecycle = DriverLifecycle(max_pages=recycle_pages, max_rss_mb=recycle_rss_mb)
+        
+        # Storage for job data (a columnar RecordStore; assigning a list converts it)
+        self.job_listings = []
+        
+        # Backoff, retry budget and circuit breaker shared by page loads, pagination and HTTP fetches
+        self.retry_policy = RetryPolicy(
+            budget=RetryBudget(retry_budget),
+            breaker=CircuitBreaker(failure_threshold=breaker_threshold, cooldown=breaker_cooldown),
+            metrics=self.metrics
+        )
+        
+        # Label of the page last loaded, and challenge pages met since the last usable one;
+        # after max_challenges fresh sessions in a row the crawl stops
+        self.page_verdict = None
+        self.challenges = 0
+        self.max_challenges = max_challenges
+        
+        # Whether the last crawl reached the end of the search's results (no next page, the
+        # last result shown or an empty page); only then can unlisted postings count as closed
+        self.results_exhausted = False
+        
+        # Identifies this run in the structured log and the run report
+        self.run_id = uuid.uuid4().hex[:12]
+        update_log_context(run_id=self.run_id)
+        
+        # Optional accounting of every remote WebDriver command
+        self.command_recorder = None
+        if record_commands:
+            from drivermetrics import CommandRecorder
+            self.command_recorder = CommandRecorder()
+        
+    @property
+    def job_listings(self):
+        return self._job_listings
+    
+    @job_listings.setter
+    def job_listings(self, records):
+        from recordstore import RecordStore
+        
+        if not isinstance(records, RecordStore):
+            store = RecordStore(RECORD_COLUMNS, categorical=CATEGORICAL_FIELDS, placeholders=RECORD_PLACEHOLDERS)
+            store.extend(records)
+            records = store
+        self._job_listings = records
+    
+    def build_chrome_options(self):
+        """Build the Chrome options for this scraper"""
+        from selenium.webdriver.chrome.options import Options
+        
+        chrome_options = Options()
+        chrome_options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            chrome_options.add_argument("--headless")
+        
+        # Add user agent to appear more like a real browser
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-notifications")
+        
+        if self.capture_api:
+            from searchapi import enable_performance_logging
+            enable_performance_logging(chrome_options)
+        
+        if self.block_resources:
+            prefs = {}
+            if "image" in self.blocked_resource_types:
+                prefs["profile.managed_default_content_settings.images"] = 2
+            if prefs:
+                chrome_options.add_experimental_option("prefs", prefs)
+        
+        return chrome_options
+    
+    def start_driver(self):
+        """Start the Chrome driver"""
+        if self.driver is None:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service
+            from selenium.common.exceptions import SessionNotCreatedException
+            
+            try:
+                if self.chrome_options is None:
+                    self.chrome_options = self.build_chrome_options()
+                
+                with self.metrics.timer("driver_startup"):
+                    with self.metrics.timer("driver_resolve"):
+                        driver_path = resolve_chromedriver(self.driver_path, self.offline)
+                    try:
+                        self.driver = webdriver.Chrome(service=Service(driver_path), options=self.chrome_options)
+                    except SessionNotCreatedException:
+                        # A pinned driver no longer matches the installed Chrome; re-resolve once
+                        if self.driver_path or self.offline:
+                            raise
+                        logger.warning("Pinned chromedriver does not match Chrome, resolving a new one")
+                        driver_path = resolve_chromedriver(refresh=True)
+                        self.driver = webdriver.Chrome(service=Service(driver_path), options=self.chrome_options)
+                if self.command_recorder:
+                    self.command_recorder.attach(self.driver)
+                self.lifecycle.started()
+                logger.info("Chrome driver started successfully")
+                
+                if self.block_resources:
+                    self.apply_resource_blocking()
+                
+                if self.capture_api:
+                    # Response bodies are only retrievable while the Network domain is enabled
+                    self.driver.execute_cdp_cmd("Network.enable", {})
+            except Exception as e:
+                logger.error(f"Failed to start Chrome driver: {e}")
+                raise
+    
+    def close_driver(self):
+        """Close the Chrome driver"""
+        if self.driver:
+            if self.command_recorder:
+                self.command_recorder.detach()
+            self.driver.quit()
+            self.driver = None
+            logger.info("Chrome driver closed")
+    
+    def release_driver(self):
+        """Close the driver at the end of a crawl, unless keep_driver holds it for the next search"""
+        if not self.keep_driver:
+            self.close_driver()
+    
+    def recycle_driver_if_due(self):
+        """Close a browser session past its page or memory threshold; True if it was closed
+
+        The caller resumes by loading the next page's URL, which starts a new session.
+        """
+        reason = self.lifecycle.recycle_reason(self.driver)
+        if reason is None:
+            return False
+        self.lifecycle.recycled(reason)
+        self.metrics.incr("driver_recycles")
+        self.close_driver()
+        return True
+    
+    def blocked_url_patterns(self):
+        """Build the URL patterns passed to Network.setBlockedURLs"""
+        patterns = [f"*{domain}*" for domain in self.blocked_domains]
+        for resource_type in self.blocked_resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+        return patterns
+    
+    def apply_resource_blocking(self):
+        """Block the configured domains and resource types through the DevTools protocol"""
+        patterns = self.blocked_url_patterns()
         try:
-            link_elem = card.find_element(By.XPATH, ".//a[contains(@class, 'title')] | .//a[contains(@class, 'jobTitle')] | .//a[1]")
-            job_info["link"] = link_elem.get_attribute("href")
-        except NoSuchElementException:
-            job_info["link"] = "Link not found"
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            self.metrics.extra["resource_blocking"] = {
+                "domains": self.blocked_domains,
+                "resource_types": self.blocked_resource_types,
+                "patterns": len(patterns)
+            }
+            logger.info(f"Blocking {len(patterns)} URL patterns ({', '.join(self.blocked_resource_types)} and {len(self.blocked_domains)} domains)")
+        except Exception as e:
+            logger.warning(f"Could not enable resource blocking: {e}")
+    
+    def setup_tab(self):
+        """Repeat the per-target DevTools set-up in a newly opened tab"""
+        if self.block_resources:
+            self.apply_resource_blocking()
+    
+    def record_page_load_stats(self):
+        """Record bandwidth and load time of the current page"""
+        try:
+            with self.command_scope("page_stats"):
+                stats = self.driver.execute_script(PAGE_LOAD_STATS_SCRIPT)
+        except Exception as e:
+            logger.debug("Could not read page load stats: %s", e)
+            return None
+        
+        self.metrics.observe("page_transfer_bytes", stats["transfer_bytes"])
+        self.metrics.observe("page_resources", stats["resources"])
+        if stats["dom_content_loaded"] is not None:
+            self.metrics.observe("page_dom_content_loaded_seconds", stats["dom_content_loaded"])
+        if stats["load_event"] is not None:
+            self.metrics.observe("page_load_event_seconds", stats["load_event"])
+        logger.info(f"Page transferred {stats['transfer_bytes'] / 1024:.1f} KB in {stats['resources']} resources")
+        return stats
+    
+    def command_scope(self, field):
+        """Attribute WebDriver commands issued in the block to a field (no-op unless recording)"""
+        if self.command_recorder:
+            return self.command_recorder.scope(field)
+        return nullcontext()
+    
+    def set_command_page(self, page):
+        """Attribute subsequent WebDriver commands and log records to a page number"""
+        update_log_context(page=page)
+        if self.command_recorder:
+            self.command_recorder.page = page
+    
+    def load_page(self, url, retry_count=None):
+        """Load a results page, retrying under the run's retry policy; False unless it has job cards"""
+        self.page_verdict = None
+        try:
+            verdict = self.retry_policy.call("load_page", self._load_page, url, max_attempts=retry_count,
+                                             no_retry=(BlockedPage,))
+            return verdict.label == RESULTS
+        except UnusablePage as e:
+            logger.error(f"Giving up on {url}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to load page {url}: {e}")
+            return False
+    
+    def _load_page(self, url):
+        from selenium.common.exceptions import TimeoutException
+        
+        with self.metrics.timer("load_page"), self.command_scope("load_page"):
+            self.driver.get(url)
+            logger.info(f"Accessing URL: {url}")
+            
+            # Wait until the job cards have rendered
+            try:
+                card_count = self.wait_for_job_cards()
+            except TimeoutException:
+                card_count = 0
+            verdict = self.classify_current_page(card_count)
+        
+        if verdict.label == CHALLENGE:
+            raise BlockedPage(verdict)
+        if verdict.label == EMPTY:
+            return verdict
+        if not card_count:
+            raise UnusablePage(verdict)
+        logger.info(f"Page loaded successfully with {card_count} job cards")
+        self.record_page_load_stats()
+        return verdict
+    
+    def classify_current_page(self, card_count):
+        """Label the page in the browser; its source is only read when no cards were found"""
+        if card_count:
+            verdict = classify_page(None, card_count)
+        else:
+            verdict = classify_page(self.driver.page_source, title=self.driver.title)
+            logger.warning(f"No job cards on {self.driver.current_url}: {verdict.label} page ({verdict.reason})")
+        self.page_verdict = verdict
+        return verdict
+    
+    def react_to_page(self, verdict):
+        """Throttle, rotate the session or stop after an unusable page; True if the page is worth loading again"""
+        if verdict is None or verdict.label == RESULTS:
+            return verdict is not None
+        self.metrics.incr(f"{verdict.label}_pages")
+        if verdict.label == EMPTY:
+            logger.info(f"No results ({verdict.reason}), nothing more to crawl")
+            return False
+        if verdict.label == ERROR:
+            return True
+        
+        self.challenges += 1
+        if self.challenges > self.max_challenges:
+            logger.error(f"Still blocked after {self.max_challenges} fresh sessions ({verdict.reason}), stopping the crawl")
+            return False
+        breaker = self.retry_policy.breaker
+        pause = min(breaker.cooldown * self.challenges, breaker.max_cooldown)
+        logger.warning(f"Blocked by a challenge page ({verdict.reason}), pausing {pause:.0f}s and starting a fresh session")
+        with self.metrics.timer("sleep"):
+            time.sleep(pause)
+        self.rotate_session()
+        return True
+    
+    def rotate_session(self):
+        """Drop the browser session (cookies, connections, fingerprint state); the next load starts a new one"""
+        self.close_driver()
+        self.metrics.incr("session_rotations")
+    
+    def load_results_page(self, url):
+        """load_page, starting over in a fresh session after a challenge page; False when the crawl can't go on"""
+        while True:
+            self.start_driver()
+            if self.load_page(url):
+                self.challenges = 0
+                return True
+            verdict = self.page_verdict
+            # Errors were already retried by load_page
+            if verdict is None or verdict.label == ERROR or not self.react_to_page(verdict):
+                return False
+    
+    def wait_for_job_cards(self):
+        """Wait until the job card count is stable and return it (0 for a challenge or "no results" page)"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        wait = WebDriverWait(self.driver, self.wait_time, poll_frequency=min(0.2, self.stability_window / 2 or 0.1))
+        condition = job_cards_stable(self.profile.cards.union.xpath, self.stability_window)
+        wait.until(condition)
+        return condition.last_count
+    
+    def random_sleep(self, min_seconds=2, max_seconds=5):
+        """Sleep for a random time to avoid rate limiting"""
+        sleep_time = random.uniform(min_seconds, max_seconds)
+        logger.debug("Sleeping for %.2f seconds", sleep_time)
+        with self.metrics.timer("sleep"):
+            time.sleep(sleep_time)
+    
+    def save_screenshot(self, path):
+        """Save a screenshot of the current page"""
+        with self.metrics.timer("screenshot"), self.command_scope("screenshot"):
+            self.driver.save_screenshot(path)
+        self.metrics.incr("screenshots")
+    
+    def extract_job_listings(self, max_jobs_per_page=20):
+        """Extract job listings from the current page"""
+        self.last_page_source = None
+        with self.metrics.timer("extract_job_listings"):
+            page_jobs = self.extract_api_jobs(max_jobs_per_page) if self.capture_api else []
+            if not page_jobs:
+                page_jobs = self._extract_job_listings(max_jobs_per_page)
+        
+        self.metrics.incr("pages")
+        self.metrics.incr("jobs", len(page_jobs))
+        self.lifecycle.page_served()
+        return page_jobs
+    
+    def _extract_job_listings(self, max_jobs_per_page):
+        from selenium.common.exceptions import StaleElementReferenceException
+        
+        from structureddata import StructuredIndex
+        
+        page_jobs = []
+        
+        try:
+            # Try different XPaths to find job cards
+            with self.command_scope("cards"):
+                job_cards = self.driver.find_elements(*self.profile.cards.union.locator)
+            
+            logger.info(f"Found {len(job_cards)} potential job listings on this page")
+            
+            # Structured data from the page source fills most fields without per-card round trips
+            with self.command_scope("page_source"):
+                source = self.driver.page_source
+            self.last_page_source = source
+            structured = StructuredIndex(self.structured_records(source, self.driver.current_url), len(job_cards))
+            
+            # Limit the number of jobs to extract per page
+            job_cards = job_cards[:max_jobs_per_page]
+            
+            for i, card in enumerate(job_cards):
+                try:
+                    job_info = self.extract_job_details(card, structured, i)
+                    
+                    # Check if we can parse the date correctly
+                    post_date = self.parse_posting_date(job_info["posted_date"])
+                    job_info["parsed_date"] = post_date.strftime("%Y-%m-%d") if post_date else "Unknown"
+                    
+                    page_jobs.append(job_info)
+                    logger.debug("Extracted job %d/%d: %s", i + 1, len(job_cards), job_info.get('title', 'Unknown title'))
+                except StaleElementReferenceException:
+                    logger.warning("Stale element encountered, skipping job card")
+                    self.metrics.incr("stale_cards")
+                    continue
+                except Exception as e:
+                    logger.error("Error extracting job details: %s", e)
+                    continue
+                
+        except Exception as e:
+            logger.error(f"Error in job extraction: {e}")
         
-        job_info["posted_date"] = self.extract_with_xpath(card, [
-            ".//span[contains(@class, 'date')]",
-            ".//div[contains(@class, 'date')]",
-            ".//span[contains(text(), 'day')]",
-            ".//span[contains(text(), 'Posted')]",
-            ".//span[contains(text(), 'hour')]"
-        ], "Posted date")
+        return page_jobs
+    
+    def extract_api_jobs(self, max_jobs_per_page=20):
+        """Job listings from the search API response behind the current page, if one was captured"""
+        from searchapi import jobs_from_search_api
+        
+        with self.metrics.timer("search_api"), self.command_scope("search_api"):
+            payloads = self.api_capture.collect(self.driver)
+        if not payloads:
+            logger.info("No search API response captured, falling back to the rendered cards")
+            return []
+        
+        # The last response is the one the current results were rendered from
+        records = jobs_from_search_api(payloads[-1])[:max_jobs_per_page]
+        page_jobs = [self.finish_record(self.placeholder_record(record)) for record in records]
+        self.metrics.incr("api_pages")
+        self.metrics.incr("api_jobs", len(page_jobs))
+        logger.info(f"Read {len(page_jobs)} jobs from the search API response")
+        return page_jobs
+    
+    def extract_job_details(self, card, structured=None, index=None):
+        """Extract details from a job card
+        
+        structured is an optional StructuredIndex; fields it provides for this card
+        are taken from it and the XPath cascades only run for the rest.
+        """
+        job_info = {}
+        known = {}
+        
+        # Extract job link (first only if it's needed to find the structured record)
+        if structured is not None and structured.needs_link:
+            job_info["link"] = self.extract_link(card)
+            known = structured.lookup(index, job_info["link"]) or {}
+        
+        # Text fields, each tried with a cascade of selectors
+        for key, chain in self.profile.fields.items():
+            job_info[key] = known.get(key) or self.extract_with_selectors(card, chain)
+        
+        if "link" not in job_info:
+            job_info["link"] = known.get("link") or self.extract_link(card)
         
         # Additional fields
-        job_info["job_id"] = self.extract_attribute(card, "id", "job-card-id")
+        if known.get("job_id"):
+            job_info["job_id"] = known["job_id"]
+        else:
+            with self.command_scope("Job ID"):
+                job_info["job_id"] = self.extract_attribute(card, "id", "job-card-id")
         job_info["extracted_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        return job_info
+        return {key: job_info[key] for key in RECORD_FIELDS}
+    
+    def extract_link(self, card):
+        """Extract the link to the job details page"""
+        from selenium.common.exceptions import NoSuchElementException
+        
+        try:
+            with self.command_scope("Link"):
+                link_elem = card.find_element(*self.profile.link.union.locator)
+                return link_elem.get_attribute("href") or "Link not found"
+        except NoSuchElementException:
+            return "Link not found"
     
-    def extract_with_xpath(self, element, xpath_list, field_name):
-        """Try multiple XPaths to extract text"""
-        for xpath in xpath_list:
+    def extract_with_selectors(self, element, chain):
+        """Try a field's selectors, best first, to extract text"""
+        from selenium.common.exceptions import NoSuchElementException
+        
+        with self.metrics.field_timer(chain.name), self.command_scope(chain.name):
+            for selector in chain.ordered(self.selector_stats):
+                start = time.perf_counter()
+                try:
+                    found_element = element.find_element(*selector.locator)
+                    text = found_element.text.strip()
+                    self.record_selector(chain, selector.xpath, bool(text), time.perf_counter() - start)
+                    if text:
+                        return text
+                except NoSuchElementException:
+                    self.record_selector(chain, selector.xpath, False, time.perf_counter() - start)
+                    continue
+                except Exception as e:
+                    self.record_selector(chain, selector.xpath, False, time.perf_counter() - start)
+                    logger.debug("Error extracting %s with selector %s: %s", chain.name, selector.xpath, e)
+                    continue
+        
+        return f"{chain.name} not found"
+    
+    def find_with_selectors(self, chain, context=None):
+        """The first element found by a chain of selectors (best first), or None"""
+        from selenium.common.exceptions import NoSuchElementException
+        
+        context = context or self.driver
+        for selector in chain.ordered(self.selector_stats):
+            start = time.perf_counter()
             try:
-                found_element = element.find_element(By.XPATH, xpath)
-                text = found_element.text.strip()
-                if text:
-                    return text
+                found_element = context.find_element(*selector.locator)
             except NoSuchElementException:
+                self.record_selector(chain, selector.xpath, False, time.perf_counter() - start)
                 continue
-            except Exception as e:
-                logger.debug(f"Error extracting {field_name} with XPath {xpath}: {e}")
-                continue
-        
-        return f"{field_name} not found"
+            self.record_selector(chain, selector.xpath, True, time.perf_counter() - start)
+            logger.debug("%s found with selector %s", chain.name, selector.xpath)
+            return found_element
+        return None
     
     def extract_attribute(self, element, attribute, default):
         """Extract an attribute from an element with a default value"""
@@ -297,52 +883,67 @@ class NaukriScraper:
     
     def navigate_to_next_page(self):
         """Click on the next page button"""
-        try:
-            # Find the next page button - try multiple potential selectors
-            next_button = None
-            for xpath in [
-                "//a[contains(@class, 'next')]",
-                "//a[contains(text(), 'Next')]",
-                "//a[contains(@class, 'page-next')]",
-                "//li[contains(@class, 'next')]/a",
-                "//div[contains(@class, 'pagination')]/a[contains(text(), '>')]"
-            ]:
-                try:
-                    next_button = self.driver.find_element(By.XPATH, xpath)
-                    break
-                except NoSuchElementException:
-                    continue
-            
-            if next_button and "disabled" not in next_button.get_attribute("class").lower():
-                # Scroll to the button first to make it visible
-                self.driver.execute_script("arguments[0].scrollIntoView();", next_button)
-                self.random_sleep(1, 2)
-                
-                # Try to click with different methods
-                try:
-                    logger.info("Clicking next page button")
-                    next_button.click()
-                except ElementClickInterceptedException:
-                    logger.info("Regular click failed, trying JavaScript click")
-                    self.driver.execute_script("arguments[0].click();", next_button)
-                
-                # Wait for page to load
-                wait = WebDriverWait(self.driver, self.wait_time)
-                wait.until(EC.staleness_of(next_button))
-                self.random_sleep(2, 4)
-                return True
-            else:
-                logger.info("Next page button not found or disabled - reached the end of pagination")
+        with self.metrics.timer("navigate_to_next_page"), self.command_scope("pagination"):
+            try:
+                return self.retry_policy.call("navigate_to_next_page", self._navigate_to_next_page)
+            except Exception as e:
+                logger.error(f"Error navigating to next page: {e}")
                 return False
-                
-        except Exception as e:
-            logger.error(f"Error navigating to next page: {e}")
+    
+    def _navigate_to_next_page(self):
+        """Click the next page button; raises when the page doesn't change, so the click can be retried"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+        
+        # Find the next page button with the profile's pagination selectors
+        next_button = self.find_with_selectors(self.profile.next_page)
+        
+        if not next_button or "disabled" in next_button.get_attribute("class").lower():
+            logger.info("Next page button not found or disabled - reached the end of pagination")
+            if next_button:
+                self.results_exhausted = True
             return False
+        
+        # Scroll to the button first to make it visible
+        self.driver.execute_script("arguments[0].scrollIntoView();", next_button)
+        self.random_sleep(1, 2)
+        
+        # Try to click with different methods
+        try:
+            logger.info("Clicking next page button")
+            next_button.click()
+        except ElementClickInterceptedException:
+            logger.info("Regular click failed, trying JavaScript click")
+            self.driver.execute_script("arguments[0].click();", next_button)
+        
+        # Wait for page to load; a timeout here means the old page is still shown
+        wait = WebDriverWait(self.driver, self.wait_time)
+        wait.until(EC.staleness_of(next_button))
+        try:
+            card_count = self.wait_for_job_cards()
+        except TimeoutException:
+            card_count = 0
+        
+        # The crawl loop reacts to a page without cards before extracting anything
+        if not self.classify_current_page(card_count).card_count:
+            return True
+        self.record_page_load_stats()
+        self.random_sleep(2, 4)
+        return True
     
     def apply_date_filter(self, time_frame):
         """Apply date filter to search results
         time_frame: 'day', 'week', 'month', '3months', '6months', 'year' or 'all'
         """
+        with self.metrics.timer("apply_date_filter"), self.command_scope("date_filter"):
+            return self._apply_date_filter(time_frame)
+    
+    def _apply_date_filter(self, time_frame):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.action_chains import ActionChains
+        from selenium.common.exceptions import NoSuchElementException
+        
         try:
             if time_frame == 'all':
                 logger.info("No date filter applied, showing all time results")
@@ -350,28 +951,14 @@ class NaukriScraper:
                 
             logger.info(f"Attempting to apply date filter: {time_frame}")
             
-            # Look for date filter dropdown
-            filter_element = None
-            
-            # Try different potential selectors for the date filter dropdown
-            for xpath in [
-                "//div[contains(text(), 'Date Posted')]/parent::*",
-                "//div[contains(@class, 'datePosted')]",
-                "//div[contains(@class, 'filter') and contains(text(), 'Date')]",
-                "//span[contains(text(), 'Date Posted')]",
-                "//a[contains(text(), 'Date Posted')]",
-                "//div[contains(@class, 'filter-item')]//div[contains(text(), 'Date')]"
-            ]:
-                try:
-                    filter_element = self.driver.find_element(By.XPATH, xpath)
-                    logger.info(f"Found date filter element with XPath: {xpath}")
-                    break
-                except NoSuchElementException:
-                    continue
+            # Look for the date filter dropdown with the profile's selectors
+            filter_element = self.find_with_selectors(self.profile.date_filter)
+            if filter_element:
+                logger.info("Found date filter element")
             
             if not filter_element:
                 logger.warning("Could not find date filter element, taking a screenshot for diagnosis")
-                self.driver.save_screenshot("date_filter_not_found.png")
+                self.save_screenshot("date_filter_not_found.png")
                 return False
             
             # Click on the filter to expand it
@@ -392,26 +979,16 @@ class NaukriScraper:
                     return False
             
             # Take a screenshot after clicking the filter
-            self.driver.save_screenshot("date_filter_dropdown.png")
-            
-            # Select the appropriate time frame
-            time_frame_mapping = {
-                'day': ['Today', '1 Day', 'Past 24 hours', 'Last 24 hours'],
-                'week': ['Past Week', 'Last 7 days', '7 Days', 'One Week'],
-                'month': ['Past Month', 'Last 30 days', '30 Days', 'One Month'],
-                '3months': ['Past 3 Months', 'Last 90 days', '90 Days', 'Three Months'],
-                '6months': ['Past 6 Months', 'Last 180 days', '180 Days', 'Six Months'],
-                'year': ['Past Year', 'Last 365 days', '365 Days', 'One Year']
-            }
+            self.save_screenshot("date_filter_dropdown.png")
             
             # Get the list of labels to try for the selected time frame
-            labels_to_try = time_frame_mapping.get(time_frame, [time_frame])
+            labels_to_try = self.profile.date_filter_labels.get(time_frame, [time_frame])
             
             # Try each possible label for the time frame
             selected = False
             for label in labels_to_try:
                 try:
-                    option_xpath = f"//label[contains(text(), '{label}')] | //div[contains(text(), '{label}')] | //a[contains(text(), '{label}')]"
+                    option_xpath = self.profile.date_filter_option.replace("{label}", label)
                     logger.info(f"Looking for option with XPath: {option_xpath}")
                     
                     option_element = self.driver.find_element(By.XPATH, option_xpath)
@@ -423,7 +1000,7 @@ class NaukriScraper:
                     selected = True
                     break
                 except NoSuchElementException:
-                    logger.debug(f"Option '{label}' not found with direct xpath")
+                    logger.debug("Option '%s' not found with direct xpath", label)
                     continue
                 except Exception as e:
                     logger.error(f"Error selecting time frame '{label}': {e}")
@@ -432,12 +1009,12 @@ class NaukriScraper:
             if not selected:
                 # Try to find all available options and log them for debugging
                 try:
-                    available_options = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'filter')]/div/label | //div[contains(@class, 'dropdown')]/div")
+                    available_options = self.driver.find_elements(*self.profile.date_filter_options.union.locator)
                     option_texts = [opt.text.strip() for opt in available_options if opt.text.strip()]
                     logger.info(f"Available filter options: {option_texts}")
                     
                     # Take a screenshot showing the dropdown
-                    self.driver.save_screenshot("date_filter_options.png")
+                    self.save_screenshot("date_filter_options.png")
                     
                     # Try clicking the first date-related option if any exists
                     for opt in available_options:
@@ -471,8 +1048,8 @@ class NaukriScraper:
             logger.error(f"Error applying date filter: {e}")
             return False
     
-    def construct_search_url(self, job_title=None, location=None):
-        """Construct the search URL based on parameters"""
+    def construct_search_url(self, job_title=None, location=None, experience=None):
+        """Construct the search URL based on parameters (experience: years, as Naukri's experience filter)"""
         base_url = "https://www.naukri.com"
         
         if job_title and location:
@@ -492,28 +1069,251 @@ class NaukriScraper:
             # Default URL for all jobs
             search_url = f"{base_url}/jobs"
         
+        if experience is not None:
+            search_url = f"{search_url}?experience={experience}"
+        
         return search_url
     
-    def scrape_jobs(self, job_title=None, location=None, time_frame="month", pages=5, max_jobs_per_page=20):
+    def page_url(self, search_url, page=1, time_frame=None):
+        """URL of a results page, with the date filter as a URL parameter where possible"""
+        # Later pages append the page number to the path, e.g. /data-analyst-jobs-in-india-2
+        path, _, query = search_url.partition("?")
+        url = path if page <= 1 else f"{path}-{page}"
+        params = [query] if query else []
+        job_age = JOB_AGE_DAYS.get(time_frame)
+        if job_age:
+            params.append(f"jobAge={job_age}")
+        return f"{url}?{'&'.join(params)}" if params else url
+    
+    def count_results(self, searches, fetcher=None):
+        """Number of results each search reports on its first page, or None where it can't be read
+        
+        searches are (job_title, location, time_frame, experience) tuples. First pages are
+        fetched concurrently over HTTP (or read from the page cache when replaying); a
+        search whose count isn't in the server-rendered page is loaded in Chrome and
+        counted from the rendered page or the captured search API response.
+        """
+        from httpfetcher import AsyncPageFetcher
+        from pageclassifier import result_count
+        from searchapi import result_count as api_result_count
+        
+        urls = [self.page_url(self.construct_search_url(job_title, location, experience), 1, time_frame)
+                for job_title, location, time_frame, experience in searches]
+        counts = [None] * len(urls)
+        with self.metrics.timer("count_results"):
+            if self.replay:
+                for i, (job_title, location, time_frame, experience) in enumerate(searches):
+                    source = self.page_cache.get(self.construct_search_url(job_title, location, experience),
+                                                 allow_stale=True, time_frame=time_frame, page=1)
+                    counts[i] = result_count(source) if source else None
+                return counts
+            
+            own_fetcher = fetcher is None
+            if own_fetcher:
+                fetcher = AsyncPageFetcher(concurrency=self.http_concurrency, headers={"User-Agent": USER_AGENT},
+                                           retry_policy=self.retry_policy)
+            try:
+                results = fetcher.fetch_many(urls)
+            finally:
+                if own_fetcher:
+                    fetcher.close()
+            
+            for i, result in enumerate(results):
+                if result.ok:
+                    counts[i] = result_count(result.text)
+                    if counts[i] is None and classify_page(result.text).label == EMPTY:
+                        counts[i] = 0
+                if counts[i] is not None:
+                    continue
+                
+                self.start_driver()
+                if self.load_page(urls[i]):
+                    payloads = self.api_capture.collect(self.driver) if self.api_capture else []
+                    counts[i] = api_result_count(payloads[-1]) if payloads else None
+                    if counts[i] is None:
+                        counts[i] = result_count(self.driver.page_source)
+                elif self.page_verdict is not None and self.page_verdict.label == EMPTY:
+                    counts[i] = 0
+        self.metrics.incr("count_probes", len(urls))
+        return counts
+    
+    def store_page(self, search_url, time_frame, page, source=None, url=None):
+        """Keep the current page's source in the page cache and the crawl archive"""
+        if (not self.page_cache and not self.archive) or self.replay:
+            return
+        try:
+            if source is None:
+                source = self.last_page_source
+            if source is None:
+                with self.command_scope("page_source"):
+                    source = self.driver.page_source
+            
+            if self.page_cache:
+                with self.metrics.timer("page_cache"):
+                    self.page_cache.put(search_url, source, time_frame=time_frame, page=page)
+            
+            if self.archive:
+                with self.metrics.timer("archive"):
+                    self.archive.append(url or self.page_url(search_url, page, time_frame), source, page=page,
+                                        query={"search_url": search_url, "time_frame": time_frame})
+                self.metrics.incr("archived_pages")
+        except Exception as e:
+            logger.warning(f"Could not store page {page}: {e}")
+    
+    def scrape_jobs(self, job_title=None, location=None, time_frame="month", pages=5, max_jobs_per_page=20, experience=None):
         """Scrape multiple pages of job listings with filters"""
+        # Incremental saves only pay off for slow browser crawls
+        incremental = not self.replay and self.backend == "selenium"
+        
+        for batch in self.iter_jobs(job_title, location, time_frame, pages, max_jobs_per_page, batches=True,
+                                    experience=experience):
+            self.job_listings.extend(batch.jobs)
+            
+            # Save incremental results every 2 pages to prevent data loss
+            if incremental and batch.page % 2 == 0:
+                self.save_incremental_data(job_title, location, time_frame, batch.page)
+        
+        return self.job_listings
+    
+    def iter_jobs(self, job_title=None, location=None, time_frame="month", pages=5, max_jobs_per_page=20, batches=False,
+                  experience=None):
+        """Yield job records (or one PageBatch per page with batches=True) while the crawl runs
+        
+        Records are not kept in self.job_listings, and the crawl only moves on to the
+        next page when the consumer asks for more, so memory stays flat however many
+        pages are crawled. Closing the generator early stops the crawl and the browser.
+        """
+        with closing(self.iter_pages(job_title, location, time_frame, pages, max_jobs_per_page, experience)) as page_batches:
+            for batch in page_batches:
+                if batches:
+                    yield batch
+                else:
+                    yield from batch.jobs
+    
+    async def aiter_jobs(self, job_title=None, location=None, time_frame="month", pages=5, max_jobs_per_page=20,
+                         batches=False, queue_size=2, experience=None):
+        """Async version of iter_jobs: the crawl runs in a worker thread feeding a bounded queue
+        
+        At most queue_size items wait for the consumer; beyond that the crawl blocks
+        until it catches up.
+        """
+        import asyncio
+        import contextvars
+        import queue
+        import threading
+        
+        items = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        done = object()
+        failure = []
+        
+        def put(item):
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def take():
+            while True:
+                try:
+                    return items.get(timeout=0.5)
+                except queue.Empty:
+                    if stop.is_set():
+                        return done
+        
+        def produce():
+            try:
+                with closing(self.iter_jobs(job_title, location, time_frame, pages, max_jobs_per_page, batches,
+                                            experience)) as source:
+                    for item in source:
+                        if not put(item):
+                            break
+            except Exception as e:
+                failure.append(e)
+            finally:
+                put(done)
+        
+        # The crawl logs under the caller's run ID and query
+        producer = threading.Thread(target=contextvars.copy_context().run, args=(produce,), name="iter-jobs", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = await asyncio.to_thread(take)
+                if item is done:
+                    break
+                yield item
+            if failure:
+                raise failure[0]
+        finally:
+            # Let the producer finish its current page and close the browser
+            stop.set()
+            await asyncio.to_thread(producer.join)
+    
+    def iter_pages(self, job_title=None, location=None, time_frame="month", pages=5, max_jobs_per_page=20, experience=None):
+        """A generator of PageBatch objects from the configured backend"""
+        query = {"job_title": job_title, "location": location, "time_frame": time_frame}
+        if experience is not None:
+            query["experience"] = experience
+        update_log_context(query=query, page=None)
+        search_url = self.construct_search_url(job_title, location, experience)
+        if self.replay:
+            page_batches = self._iter_pages_replay(search_url, time_frame, pages, max_jobs_per_page)
+        elif self.backend == "http":
+            page_batches = self._iter_pages_http(search_url, time_frame, pages, max_jobs_per_page)
+        elif self.tabs > 1:
+            page_batches = self._iter_pages_tabs(search_url, time_frame, pages, max_jobs_per_page)
+        else:
+            page_batches = self._iter_pages_selenium(search_url, time_frame, pages, max_jobs_per_page)
+        return self._track_exhaustion(page_batches)
+    
+    def _track_exhaustion(self, page_batches):
+        """Pass the batches through and note whether the crawl reached the end of the results
+
+        Only explicit signals count: a disabled next button (set while paginating), an
+        empty page, or a last page whose "21 - 40 of 40" range reaches the total. A page
+        with fewer jobs than usual proves nothing, since cards that fail to extract are skipped.
+        """
+        from pageclassifier import result_range
+        
+        self.results_exhausted = False
+        self.page_verdict = None
+        last_page = 0
+        shown = None
+        with closing(page_batches):
+            for batch in page_batches:
+                if batch.page > last_page:
+                    last_page = batch.page
+                    shown = result_range(self.last_page_source)
+                yield batch
+        
+        # Not reached when the consumer stops early
+        verdict = self.page_verdict
+        if verdict is not None and verdict.label == EMPTY:
+            self.results_exhausted = True
+        elif shown and shown[0] >= shown[1]:
+            self.results_exhausted = True
+    
+    def _iter_pages_selenium(self, search_url, time_frame, pages, max_jobs_per_page):
         try:
             self.start_driver()
             
-            # Format the search URL
-            search_url = self.construct_search_url(job_title, location)
-            
             # Initialize tracker for total jobs
             total_jobs_scraped = 0
             current_page = 1
+            url_restorable = not time_frame or time_frame.lower() == "all" or time_frame in JOB_AGE_DAYS
             
             # Load the initial page
-            page_loaded = self.load_page(search_url)
+            page_loaded = self.load_results_page(search_url)
             if not page_loaded:
-                logger.error("Failed to load the initial search page")
-                return self.job_listings
+                if self.page_verdict is None or self.page_verdict.label != EMPTY:
+                    logger.error("Failed to load the initial search page")
+                return
             
             # Take a screenshot of the initial page
-            self.driver.save_screenshot("naukri_initial_page.png")
+            self.save_screenshot("naukri_initial_page.png")
             
             # Apply date filter if specified and not 'all'
             if time_frame and time_frame.lower() != 'all':
@@ -526,45 +1326,329 @@ class NaukriScraper:
             # Scrape the specified number of pages
             while current_page <= pages:
                 logger.info(f"Scraping page {current_page} of {pages}")
+                self.set_command_page(current_page)
+                
+                # A page without job cards is dealt with before any screenshot or extraction:
+                # reloaded by URL (after a fresh session for a challenge) or the crawl ends
+                verdict = self.page_verdict
+                if verdict is not None and verdict.label != RESULTS:
+                    if not self.react_to_page(verdict):
+                        break
+                    if not self.load_results_page(self.page_url(search_url, current_page, time_frame)):
+                        break
                 
                 # Take a screenshot of each page (for debugging)
                 screenshot_path = f"naukri_page_{current_page}.png"
-                self.driver.save_screenshot(screenshot_path)
+                self.save_screenshot(screenshot_path)
                 logger.info(f"Screenshot saved to {screenshot_path}")
                 
                 # Extract jobs from the current page
                 page_jobs = self.extract_job_listings(max_jobs_per_page)
+                url = self.driver.current_url
+                self.store_page(search_url, time_frame, current_page, url=url)
                 
-                # Add to our total job listings
-                self.job_listings.extend(page_jobs)
                 total_jobs_scraped += len(page_jobs)
                 logger.info(f"Extracted {len(page_jobs)} jobs from page {current_page}")
-                
-                # Save incremental results every 2 pages to prevent data loss
-                if current_page % 2 == 0:
-                    self.save_incremental_data(job_title, location, time_frame, current_page)
+                yield PageBatch(current_page, url, page_jobs)
                 
                 # Random delay to avoid detection
                 self.random_sleep(3, 7)
                 
-                # Navigate to the next page if we're not at the last requested page
+                # Navigate to the next page if we're not at the last requested page. A worn-out
+                # session is replaced first and the crawl resumes from the next page's URL
+                # (unless the date filter was applied in the page and isn't in the URL)
                 if current_page < pages:
-                    next_page_available = self.navigate_to_next_page()
-                    if not next_page_available:
-                        logger.info("No more pages available")
-                        break
+                    if url_restorable and self.recycle_driver_if_due():
+                        if not self.load_results_page(self.page_url(search_url, current_page + 1, time_frame)):
+                            break
+                    else:
+                        next_page_available = self.navigate_to_next_page()
+                        if not next_page_available:
+                            logger.info("No more pages available")
+                            break
                 
                 current_page += 1
             
             logger.info(f"Total jobs scraped: {total_jobs_scraped} from {current_page-1} pages")
-            return self.job_listings
             
         except Exception as e:
             logger.error(f"Error during scraping: {e}")
-            return self.job_listings
         
         finally:
-            self.close_driver()
+            self.release_driver()
+            self.flush_state()
+    
+    def _iter_pages_http(self, search_url, time_frame, pages, max_jobs_per_page):
+        """Result pages over HTTP, using Chrome only for pages that need JavaScript"""
+        from httpfetcher import AsyncPageFetcher
+        
+        if time_frame and time_frame not in JOB_AGE_DAYS and time_frame != "all":
+            logger.warning(f"The '{time_frame}' filter can't be expressed in the URL, use --post_filter_days to narrow results")
+        
+        urls = {page: self.page_url(search_url, page, time_frame) for page in range(1, pages + 1)}
+        fetcher = AsyncPageFetcher(concurrency=self.http_concurrency, headers={"User-Agent": USER_AGENT},
+                                   retry_policy=self.retry_policy)
+        total_jobs_scraped = 0
+        browser_pages = 0
+        stopped = False
+        
+        try:
+            # Pages are fetched one window of concurrent requests at a time, so only
+            # that many sources are held while the consumer works through them
+            window = max(1, self.http_concurrency)
+            for first_page in range(1, pages + 1, window):
+                window_pages = range(first_page, min(first_page + window, pages + 1))
+                
+                # Fresh cached pages don't need to be fetched again
+                sources = {}
+                rejected = {}
+                if self.page_cache:
+                    for page in window_pages:
+                        cached = self.page_cache.get(search_url, time_frame=time_frame, page=page)
+                        if cached is not None:
+                            sources[page] = (cached, urls[page])
+                    self.metrics.incr("page_cache_hits", len(sources))
+                
+                to_fetch = [page for page in window_pages if page not in sources]
+                if to_fetch:
+                    with self.metrics.timer("http_fetch"):
+                        results = fetcher.fetch_many([urls[page] for page in to_fetch])
+                    for page, result in zip(to_fetch, results):
+                        self.metrics.observe("http_page_bytes", result.size)
+                        self.metrics.observe("http_page_seconds", result.elapsed)
+                        if result.ok:
+                            sources[page] = (result.text, result.url)
+                        else:
+                            rejected[page] = result
+                
+                for page in window_pages:
+                    update_log_context(page=page)
+                    source, url = sources.pop(page, (None, urls[page]))
+                    page_jobs = self.parse_page_source(source, url, max_jobs_per_page) if source else []
+                    if not page_jobs:
+                        # Empty searches end the crawl and challenge pages get a pause and
+                        # fresh connections before Chrome is tried
+                        failed = rejected.pop(page, None)
+                        verdict = classify_page(failed.text, status=failed.status) if failed else classify_page(source)
+                        self.page_verdict = verdict
+                        if verdict.label == CHALLENGE:
+                            self.retry_policy.breaker.record_failure()
+                            fetcher.pool.close()
+                        if verdict.label in (EMPTY, CHALLENGE) and not self.react_to_page(verdict):
+                            stopped = True
+                            break
+                    if page_jobs:
+                        if page in to_fetch:
+                            self.store_page(search_url, time_frame, page, source, url)
+                        self.metrics.incr("pages")
+                        self.metrics.incr("http_pages")
+                        self.metrics.incr("jobs", len(page_jobs))
+                        logger.info(f"Extracted {len(page_jobs)} jobs from page {page} over HTTP")
+                    else:
+                        # Pages whose cards are rendered client-side go through Chrome
+                        logger.info(f"Page {page} needs JavaScript, loading it in Chrome")
+                        url = urls[page]
+                        browser_pages += 1
+                        self.set_command_page(page)
+                        self.recycle_driver_if_due()
+                        if not self.load_results_page(url):
+                            if self.page_verdict is not None and self.page_verdict.label in (EMPTY, CHALLENGE):
+                                stopped = True
+                                break
+                            continue
+                        page_jobs = self.extract_job_listings(max_jobs_per_page)
+                        self.store_page(search_url, time_frame, page, url=url)
+                        self.metrics.incr("browser_fallback_pages")
+                        logger.info(f"Extracted {len(page_jobs)} jobs from page {page}")
+                    
+                    total_jobs_scraped += len(page_jobs)
+                    yield PageBatch(page, url, page_jobs)
+                if stopped:
+                    break
+            
+            logger.info(f"Total jobs scraped: {total_jobs_scraped} ({pages - browser_pages} pages over HTTP or from cache, {browser_pages} in Chrome)")
+        
+        except Exception as e:
+            logger.error(f"Error during scraping: {e}")
+        
+        finally:
+            fetcher.close()
+            self.release_driver()
+            self.flush_state()
+    
+    def _iter_pages_tabs(self, search_url, time_frame, pages, max_jobs_per_page):
+        """Result pages loaded by URL in several tabs of one browser, the loads overlapping extraction"""
+        from collections import deque
+        from selenium.common.exceptions import TimeoutException
+        from processmemory import browser_rss
+        from tabpool import TabPool
+        
+        if time_frame and time_frame not in JOB_AGE_DAYS and time_frame != "all":
+            logger.warning(f"The '{time_frame}' filter can't be expressed in the URL, use --post_filter_days to narrow results")
+        
+        breaker = self.retry_policy.breaker
+        pending = deque(range(1, pages + 1))
+        in_flight = deque()
+        attempts = {}
+        pool = None
+        total_jobs_scraped = 0
+        peak_rss = 0
+        
+        # Page loading as the circuit breaker's half-open probe; only this thread can resolve it
+        probe = {"page": None}
+        
+        def fill():
+            # Every idle tab starts loading the next page, but while a probe is out the
+            # other tabs wait: before_call would block on an outcome only this thread delivers
+            busy = {handle for handle, _ in in_flight}
+            for handle in pool.handles:
+                if not pending or handle in busy:
+                    continue
+                if probe["page"] is not None:
+                    return
+                breaker.before_call()
+                page = pending.popleft()
+                attempts[page] = attempts.get(page, 0) + 1
+                pool.load(handle, self.page_url(search_url, page, time_frame))
+                in_flight.append((handle, page))
+                if breaker.state == HALF_OPEN:
+                    probe["page"] = page
+                    return
+        
+        def resolve(page, success):
+            if success:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            if probe["page"] == page:
+                probe["page"] = None
+        
+        def requeue(pages_back):
+            # Pages going back in the queue are no longer loading; a probe among them has
+            # no outcome coming, so it counts as failed rather than holding every tab back
+            pending.extendleft(reversed(pages_back))
+            in_flight.clear()
+            if probe["page"] in pages_back:
+                resolve(probe["page"], False)
+        
+        try:
+            while pending or in_flight:
+                if pool is None:
+                    self.start_driver()
+                    pool = TabPool(self.driver, self.tabs, on_new_tab=self.setup_tab)
+                fill()
+                if not in_flight:
+                    # fill() started nothing; only an abandoned probe can cause that
+                    if probe["page"] is not None:
+                        resolve(probe["page"], False)
+                    continue
+                
+                handle, page = in_flight.popleft()
+                url = self.page_url(search_url, page, time_frame)
+                self.set_command_page(page)
+                with self.metrics.timer("load_page"), self.command_scope("load_page"):
+                    try:
+                        pool.wait_navigated(handle, self.wait_time)
+                        card_count = self.wait_for_job_cards()
+                    except TimeoutException:
+                        card_count = 0
+                    verdict = self.classify_current_page(card_count)
+                
+                if not card_count:
+                    if verdict.label == EMPTY:
+                        # Later pages of the search are empty too; the site itself answered fine
+                        resolve(page, True)
+                        self.react_to_page(verdict)
+                        pending.clear()
+                        continue
+                    resolve(page, False)
+                    if verdict.label == CHALLENGE:
+                        # The whole session is blocked: every open page goes back in the queue for a fresh one
+                        requeue([page] + [other for _, other in in_flight])
+                        pool = None
+                        if not self.react_to_page(verdict):
+                            break
+                    elif attempts[page] < self.retry_policy.max_attempts and self.retry_policy.budget.try_spend():
+                        self.metrics.record_retry("load_page")
+                        pending.appendleft(page)
+                    else:
+                        logger.error(f"Skipping page {page}: {verdict.label} page ({verdict.reason})")
+                    continue
+                
+                resolve(page, True)
+                self.challenges = 0
+                self.record_page_load_stats()
+                page_jobs = self.extract_job_listings(max_jobs_per_page)
+                self.store_page(search_url, time_frame, page, url=url)
+                
+                # Memory per concurrent page: the browser's RSS shared by its tabs
+                heap = pool.js_heap()
+                if heap:
+                    self.metrics.observe("tab_js_heap_bytes", heap)
+                rss = browser_rss(self.driver)
+                if rss:
+                    peak_rss = max(peak_rss, rss)
+                    self.metrics.observe("browser_rss_bytes", rss)
+                    self.metrics.observe("rss_per_tab_bytes", rss / len(pool.handles))
+                
+                # This tab starts on its next page before the batch goes to the consumer,
+                # unless the session is due for replacement: then the open pages are requeued
+                if self.recycle_driver_if_due():
+                    requeue([other for _, other in in_flight])
+                    pool = None
+                else:
+                    fill()
+                total_jobs_scraped += len(page_jobs)
+                logger.info(f"Extracted {len(page_jobs)} jobs from page {page}")
+                yield PageBatch(page, url, page_jobs)
+            
+            logger.info(f"Total jobs scraped: {total_jobs_scraped} using {self.tabs} tabs")
+        
+        except Exception as e:
+            logger.error(f"Error during scraping: {e}")
+        
+        finally:
+            if probe["page"] is not None:
+                # An abandoned probe must not leave the circuit half-open for every later caller
+                breaker.record_failure()
+            if peak_rss:
+                self.metrics.extra["tabs"] = {
+                    "tabs": self.tabs,
+                    "peak_browser_rss_mb": round(peak_rss / 1048576, 1),
+                    "peak_rss_per_tab_mb": round(peak_rss / self.tabs / 1048576, 1)
+                }
+            if pool is not None and self.driver is not None:
+                pool.close()
+            self.release_driver()
+            self.flush_state()
+    
+    def _iter_pages_replay(self, search_url, time_frame, pages, max_jobs_per_page):
+        """Re-run a crawl entirely from the page cache, without a browser or network"""
+        
+        try:
+            for page in range(1, pages + 1):
+                update_log_context(page=page)
+                source = self.page_cache.get(search_url, allow_stale=True, time_frame=time_frame, page=page)
+                if source is None:
+                    logger.info(f"Page {page} is not in the cache, replay stops here")
+                    break
+                
+                url = self.page_url(search_url, page, time_frame)
+                page_jobs = self.parse_page_source(source, url, max_jobs_per_page)
+                self.metrics.incr("pages")
+                self.metrics.incr("replayed_pages")
+                self.metrics.incr("jobs", len(page_jobs))
+                logger.info(f"Replayed {len(page_jobs)} jobs from cached page {page}")
+                yield PageBatch(page, url, page_jobs)
+        finally:
+            self.flush_state()
+    
+    def flush_state(self):
+        """Persist page cache access times and the learned selector order"""
+        if self.page_cache:
+            self.page_cache.flush()
+        if self.selector_stats is not None:
+            self.selector_stats.save()
     
     def save_incremental_data(self, job_title, location, time_frame, current_page):
         """Save the data incrementally to prevent data loss"""
@@ -583,14 +1667,28 @@ class NaukriScraper:
             # Save to JSON
             json_path = f"data/incremental_{job_title_str}_{location_str}_{time_frame}_page{current_page}_{timestamp}.json"
             with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(self.job_listings, f, indent=2, ensure_ascii=False)
+                json.dump(self.job_listings.to_records(), f, indent=2, ensure_ascii=False)
             
             logger.info(f"Saved incremental data to {json_path}")
         except Exception as e:
             logger.error(f"Error saving incremental data: {e}")
     
-    def save_data(self, job_title=None, location=None, time_frame=None, formats=None):
-        """Save the scraped data in multiple formats"""
+    def save_data(self, job_title=None, location=None, time_frame=None, formats=None, json_gzip=False, json_indent=False,
+                  track_changes=True):
+        """Save the scraped data in multiple formats
+        
+        Every format is written concurrently, streaming the records in chunks.
+        JSON is compact unless json_indent is set, and gzip-compressed with json_gzip.
+        With track_changes, the new, changed and closed postings since the search's
+        last save are appended to the change log (see changelog.py); the records
+        should be the crawl's listing, before detail enrichment or extra filters.
+        """
+        with self.metrics.timer("save_data"):
+            return self._save_data(job_title, location, time_frame, formats, json_gzip, json_indent, track_changes)
+    
+    def _save_data(self, job_title, location, time_frame, formats, json_gzip, json_indent, track_changes):
+        from exporter import export_records
+        
         if formats is None:
             formats = ["json", "csv", "excel"]
         
@@ -598,42 +1696,55 @@ class NaukriScraper:
             logger.warning("No job listings to save")
             return None
             
-        # Create a filename based on the search parameters
-        job_title_str = job_title.replace(' ', '_') if job_title else "all"
-        location_str = location.replace(' ', '_') if location else "all"
-        time_frame_str = time_frame if time_frame else "all_time"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        base_filename = f"{job_title_str}_{location_str}_{time_frame_str}_{timestamp}"
+        base_filename = output_basename(job_title, location, time_frame)
         
         # Create data directory if it doesn't exist
         os.makedirs("data", exist_ok=True)
         
-        if "json" in formats:
-            json_path = f"data/{base_filename}.json"
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(self.job_listings, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved JSON data to {json_path}")
+        results = export_records(self.job_listings.iter_rows(EXPORT_CHUNK_SIZE), self.job_listings.fields,
+                                 f"data/{base_filename}", formats, json_gzip=json_gzip, json_indent=json_indent)
+        for fmt, stats in results.items():
+            self.metrics.observe(f"export_{fmt}_rows_per_sec", stats["rows_per_sec"])
+        self.metrics.extra["export"] = results
         
-        if ("csv" in formats or "excel" in formats):
-            # Convert to pandas DataFrame
-            df = pd.DataFrame(self.job_listings)
-            
-            if "csv" in formats:
-                csv_path = f"data/{base_filename}.csv"
-                df.to_csv(csv_path, index=False, encoding="utf-8")
-                logger.info(f"Saved CSV data to {csv_path}")
-            
-            if "excel" in formats:
-                excel_path = f"data/{base_filename}.xlsx"
-                df.to_excel(excel_path, index=False)
-                logger.info(f"Saved Excel data to {excel_path}")
+        if track_changes and not self.replay:
+            self.log_changes(job_title, location, time_frame)
         
         # Print summary statistics
         self.print_data_summary()
         
         return base_filename
     
+    def log_changes(self, job_title=None, location=None, time_frame=None, records=None, experience=None):
+        """Log the postings of a search that are new, changed or closed since its last save"""
+        from changelog import ChangeTracker, scope_key
+        
+        # Only a crawl that reached the end of every search's results saw every open posting;
+        # one stopped by --pages, a block or an error, or a plan that couldn't reach every
+        # result, says nothing about the postings it didn't list
+        searches = self.metrics.extra.get("queries")
+        complete = all(search.get("exhausted") for search in searches) if searches else self.results_exhausted
+        plan = self.metrics.extra.get("query_plan")
+        if plan:
+            complete = complete and not any(search.get("unreachable_results") for search in plan["searches"])
+        if not complete:
+            logger.info("The crawl did not reach the end of the results, so no postings are marked closed")
+        
+        scope = scope_key(job_title, location, time_frame, experience)
+        try:
+            with self.metrics.timer("change_log"):
+                tracker = ChangeTracker(placeholders=RECORD_PLACEHOLDERS)
+                try:
+                    counts = tracker.apply(self.job_listings if records is None else records, scope, self.run_id,
+                                           detect_closed=complete)
+                finally:
+                    tracker.close()
+        except Exception as e:
+            logger.error(f"Error tracking changes: {e}")
+            return None
+        self.metrics.extra.setdefault("changes", []).append(dict(scope=scope, **counts))
+        return counts
+    
     def print_data_summary(self):
         """Print a summary of the data collected"""
         if not self.job_listings:
@@ -642,7 +1753,7 @@ class NaukriScraper:
             
         try:
             # Convert to DataFrame for easier analysis
-            df = pd.DataFrame(self.job_listings)
+            df = self.job_listings.to_pandas()
             
             # Number of jobs
             total_jobs = len(df)
@@ -669,10 +1780,11 @@ class NaukriScraper:
             
             # Date posted summary
             if 'parsed_date' in df.columns:
-                valid_dates = df[df['parsed_date'] != 'Unknown']
+                # parsed_date is an unordered categorical; ISO strings compare in date order
+                valid_dates = df.loc[df['parsed_date'] != 'Unknown', 'parsed_date'].astype(str)
                 if not valid_dates.empty:
-                    min_date = valid_dates['parsed_date'].min()
-                    max_date = valid_dates['parsed_date'].max()
+                    min_date = valid_dates.min()
+                    max_date = valid_dates.max()
                     logger.info(f"Date range: {min_date} to {max_date}")
             
             logger.info("Data summary complete")
@@ -714,59 +1826,238 @@ class NaukriScraper:
             
         logger.info(f"Filtered {len(self.job_listings)} jobs down to {len(filtered_jobs)} within {max_days} days")
         return filtered_jobs
+    
+    def begin_run(self):
+        """Start a new run in the same browser session: fresh metrics, retry budget, records and page state
+
+        The daemon calls this before every crawl, so each run report covers one
+        crawl and a long-lived scraper doesn't use up its retry budget for good.
+        The circuit breaker carries over: the site's health doesn't reset between crawls.
+        """
+        self.metrics = RunMetrics()
+        self.retry_policy.metrics = self.metrics
+        self.retry_policy.budget = RetryBudget(self.retry_policy.budget.total)
+        self.retry_policy.budget_exhausted = 0
+        self.job_listings = []
+        self.page_verdict = None
+        self.challenges = 0
+        self.results_exhausted = False
+        if self.command_recorder:
+            self.command_recorder.reset()
+        self.run_id = uuid.uuid4().hex[:12]
+        update_log_context(run_id=self.run_id)
+    
+    def write_run_report(self, report_path=None, prometheus_path=None):
+        """Write the JSON run report and, optionally, a Prometheus textfile"""
+        try:
+            if self.command_recorder:
+                self.metrics.extra["webdriver_commands"] = self.command_recorder.summary()
+            if self.page_cache:
+                self.metrics.extra["page_cache"] = self.page_cache.stats()
+            self.metrics.extra["run_id"] = self.run_id
+            self.metrics.extra["retry_policy"] = self.retry_policy.stats()
+            self.metrics.extra["driver_lifecycle"] = self.lifecycle.stats()
+            self.metrics.extra["record_store"] = {"records": len(self.job_listings), "bytes": self.job_listings.nbytes()}
+            
+            if report_path is None:
+                timestamp = datetime.fromtimestamp(self.metrics.started_at).strftime("%Y%m%d_%H%M%S")
+                report_path = f"data/run_report_{timestamp}_{self.run_id}.json"
+            self.metrics.write_json(report_path)
+            logger.info(f"Saved run report to {report_path}")
+            
+            if prometheus_path:
+                self.metrics.write_prometheus(prometheus_path)
+                logger.info(f"Saved Prometheus metrics to {prometheus_path}")
+        except Exception as e:
+            logger.error(f"Error writing run report: {e}")
         
-def main():
+# Subcommands and the modules whose main() implements them
+SUBCOMMANDS = {
+    "reprocess": "bulkextract",
+    "daemon": "crawldaemon"
+}
+
+def main(argv=None):
     """Main function to run the scraper from command line"""
-    parser = argparse.ArgumentParser(description="Advanced Naukri.com Job Scraper")
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return importlib.import_module(SUBCOMMANDS[argv[0]]).main(argv[1:])
+    
+    parser = argparse.ArgumentParser(
+        description="Advanced Naukri.com Job Scraper",
+        epilog=f"Subcommands: {', '.join(SUBCOMMANDS)} (run '<subcommand> --help' for details)"
+    )
     parser.add_argument("--job_title", type=str, help="Job title to search for (optional)")
     parser.add_argument("--location", type=str, help="Location to search in (optional)")
     parser.add_argument("--time_frame", type=str, default="month", 
                         choices=["day", "week", "month", "3months", "6months", "year", "all"],
                         help="Time frame filter for job postings (default: month)")
+    parser.add_argument("--queries", type=str,
+                        help="CSV or JSONL file of searches (job_title, location, time_frame, optional pages and priority) to run in one process")
+    parser.add_argument("--plan", action="store_true",
+                        help="Read each search's result count first and split searches with more results than --pages pages reach (by location, experience, then date)")
     parser.add_argument("--pages", type=int, default=10, help="Number of pages to scrape (default: 10)")
     parser.add_argument("--jobs_per_page", type=int, default=20, help="Maximum jobs to extract per page (default: 20)")
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
     parser.add_argument("--formats", type=str, default="json,csv,excel", help="Output formats (comma-separated)")
+    parser.add_argument("--json_gzip", action="store_true", help="Write the JSON output gzip-compressed (.json.gz)")
+    parser.add_argument("--json_indent", action="store_true", help="Indent the JSON output instead of one compact record per line")
     parser.add_argument("--post_filter_days", type=int, help="Additional filter to only include jobs posted within X days")
+    parser.add_argument("--report", type=str, help="Path of the JSON run report (default: data/run_report_<timestamp>_<run id>.json)")
+    parser.add_argument("--record_commands", action="store_true", help="Record every WebDriver command and add a per-page/per-field breakdown to the run report")
+    parser.add_argument("--block_resources", action="store_true", help="Block images, fonts, media, ads and trackers while loading pages")
+    parser.add_argument("--blocked_domains", type=str, help="Comma-separated domains to block (default: built-in ad/tracker list)")
+    parser.add_argument("--blocked_resource_types", type=str, help=f"Comma-separated resource types to block, from {', '.join(RESOURCE_TYPE_PATTERNS)} (default: {','.join(DEFAULT_BLOCKED_RESOURCE_TYPES)})")
+    parser.add_argument("--page_load_strategy", type=str, default="eager", choices=["normal", "eager", "none"],
+                        help="Chrome page load strategy (default: eager)")
+    parser.add_argument("--stability_window", type=float, default=0.5,
+                        help="Seconds the job card count must stay unchanged before extraction starts (default: 0.5)")
+    parser.add_argument("--chromedriver", type=str, help="Path to chromedriver (default: pinned path, or resolved once with webdriver_manager)")
+    parser.add_argument("--offline", action="store_true", help="Never contact the network to resolve chromedriver")
+    parser.add_argument("--backend", type=str, default="selenium", choices=["selenium", "http"],
+                        help="Fetch pages with Chrome, or over HTTP with Chrome only as a fallback (default: selenium)")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help="Result pages loaded concurrently in tabs of one Chrome, paginating by URL (default: 1)")
+    parser.add_argument("--recycle_pages", type=int, default=200, help="Start a fresh browser session after this many pages (0 = never, default: 200)")
+    parser.add_argument("--recycle_rss_mb", type=int, default=1500,
+                        help="Start a fresh browser session once Chrome uses this much memory (0 = never, default: 1500)")
+    parser.add_argument("--http_concurrency", type=int, default=4, help="Concurrent HTTP requests for the http backend (default: 4)")
+    parser.add_argument("--capture_api", action="store_true",
+                        help="Read jobs from the site's search API responses (CDP network capture), with the rendered cards as fallback")
+    parser.add_argument("--cache_dir", type=str, help="Cache page sources in this directory (e.g. cache/pages)")
+    parser.add_argument("--cache_ttl", type=float, default=24, help="Hours a cached page stays fresh (default: 24)")
+    parser.add_argument("--cache_max_mb", type=int, default=500, help="Size limit of the page cache in MB (default: 500)")
+    parser.add_argument("--replay", action="store_true", help="Serve every page from the page cache, without a browser or network")
+    parser.add_argument("--archive_dir", type=str, help="Append every crawled page to a compressed, indexed archive in this directory")
+    parser.add_argument("--profile", type=str, help="Site profile with the card, field, pagination and filter selectors (default: naukri_profile.json)")
+    parser.add_argument("--fixed_selector_order", action="store_true", help="Try selectors in the profile's order instead of the order learned from previous runs")
+    parser.add_argument("--log_level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Log level; naukri_scraper.log gets one JSON record per line (default: INFO)")
+    parser.add_argument("--retry_budget", type=int, default=30, help="Retries allowed over the whole run, across all pages (default: 30)")
+    parser.add_argument("--breaker_threshold", type=int, default=5,
+                        help="Consecutive failures that pause all requests until a probe succeeds (default: 5)")
+    parser.add_argument("--breaker_cooldown", type=float, default=30, help="Seconds to pause before the first probe (default: 30)")
+    parser.add_argument("--enrich_details", action="store_true",
+                        help="Fetch each new job's detail page for the full description, skills, role category and employment type")
+    parser.add_argument("--details_cache", type=str, default=os.path.join("cache", "job_details.sqlite3"),
+                        help="SQLite cache of job details, so each detail page is fetched only once (default: cache/job_details.sqlite3)")
+    parser.add_argument("--no_change_log", action="store_true",
+                        help="Don't append new, changed and closed postings to data/changes.jsonl")
+    parser.add_argument("--prometheus_file", type=str, help="Write run metrics in Prometheus text format to this file (e.g. the node exporter textfile directory)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    configure_logging(level=getattr(logging, args.log_level))
     
     # Create a scraper instance
-    scraper = NaukriScraper(headless=args.headless)
-    
-    # Run the scraper
-    job_title_str = args.job_title if args.job_title else "all jobs"
-    location_str = args.location if args.location else "any location"
-    logger.info(f"Starting job search for {job_title_str} in {location_str} from the past {args.time_frame}")
-    
-    # Scrape the jobs
-    jobs = scraper.scrape_jobs(
-        job_title=args.job_title,
-        location=args.location,
-        time_frame=args.time_frame,
-        pages=args.pages,
-        max_jobs_per_page=args.jobs_per_page
-    )
-    
-    # Apply additional date filtering if specified
-    if args.post_filter_days and jobs:
-        logger.info(f"Applying additional date filtering: Jobs within {args.post_filter_days} days")
-        filtered_jobs = scraper.filter_by_date(max_days=args.post_filter_days)
-        if filtered_jobs:
-            scraper.job_listings = filtered_jobs
-            logger.info(f"Filtered to {len(filtered_jobs)} jobs within {args.post_filter_days} days")
-    
-    # Save the data
-    formats = args.formats.split(",")
-    scraper.save_data(
-        job_title=args.job_title, 
-        location=args.location, 
-        time_frame=args.time_frame, 
-        formats=formats
+    scraper = NaukriScraper(
+        headless=args.headless,
+        record_commands=args.record_commands,
+        block_resources=args.block_resources,
+        blocked_domains=args.blocked_domains.split(",") if args.blocked_domains else None,
+        blocked_resource_types=args.blocked_resource_types.split(",") if args.blocked_resource_types else None,
+        page_load_strategy=args.page_load_strategy,
+        stability_window=args.stability_window,
+        driver_path=args.chromedriver,
+        offline=args.offline,
+        backend=args.backend,
+        http_concurrency=args.http_concurrency,
+        capture_api=args.capture_api,
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl * 3600,
+        cache_max_mb=args.cache_max_mb,
+        replay=args.replay,
+        archive_dir=args.archive_dir,
+        profile=args.profile,
+        learn_selector_order=not args.fixed_selector_order,
+        retry_budget=args.retry_budget,
+        breaker_threshold=args.breaker_threshold,
+        breaker_cooldown=args.breaker_cooldown,
+        tabs=args.tabs,
+        recycle_pages=args.recycle_pages,
+        recycle_rss_mb=args.recycle_rss_mb
     )
     
-    logger.info(f"Scraping complete! Collected {len(jobs)} job listings.")
-    logger.info("Check the 'data' directory for the output files.")
+    try:
+        if args.queries or args.plan:
+            # Every search in this process, with one browser and global dedup; with --plan,
+            # searches too big for --pages pages are split into partitions first
+            from queryscheduler import QueryScheduler, SearchQuery, load_queries
+            
+            if args.queries:
+                queries = load_queries(args.queries, default_time_frame=args.time_frame, default_pages=args.pages)
+                job_title = os.path.splitext(os.path.basename(args.queries))[0]
+                location = time_frame = None
+            else:
+                queries = [SearchQuery(args.job_title, args.location, args.time_frame, args.pages, 0, 0)]
+                job_title, location, time_frame = args.job_title, args.location, args.time_frame
+            if args.plan:
+                from queryplanner import QueryPlanner
+                
+                planner = QueryPlanner(scraper, max_pages=args.pages, jobs_per_page=args.jobs_per_page)
+                queries = planner.plan(queries)
+            
+            scheduler = QueryScheduler(scraper, max_jobs_per_page=args.jobs_per_page)
+            for query in queries:
+                scheduler.add(query)
+            scheduler.run()
+            jobs = scraper.job_listings
+        else:
+            # Run the scraper
+            job_title_str = args.job_title if args.job_title else "all jobs"
+            location_str = args.location if args.location else "any location"
+            logger.info(f"Starting job search for {job_title_str} in {location_str} from the past {args.time_frame}")
+            
+            # Scrape the jobs
+            jobs = scraper.scrape_jobs(
+                job_title=args.job_title,
+                location=args.location,
+                time_frame=args.time_frame,
+                pages=args.pages,
+                max_jobs_per_page=args.jobs_per_page
+            )
+            job_title, location, time_frame = args.job_title, args.location, args.time_frame
+        
+        # Changes are computed on the crawl's listing as it is, before detail pages
+        # replace its snippets and before --post_filter_days drops postings
+        if not args.no_change_log and not scraper.replay:
+            scraper.log_changes(job_title, location, time_frame)
+        
+        if args.enrich_details and len(jobs):
+            # Detail pages of jobs seen in earlier runs come from the cache
+            from jobdetails import DetailCache, DetailEnricher
+            
+            cache = DetailCache(args.details_cache)
+            try:
+                scraper.job_listings = DetailEnricher(scraper, cache, concurrency=args.http_concurrency).enrich(jobs)
+            finally:
+                cache.close()
+            jobs = scraper.job_listings
+        
+        # Apply additional date filtering if specified
+        if args.post_filter_days and jobs:
+            logger.info(f"Applying additional date filtering: Jobs within {args.post_filter_days} days")
+            filtered_jobs = scraper.filter_by_date(max_days=args.post_filter_days)
+            if filtered_jobs:
+                scraper.job_listings = filtered_jobs
+                logger.info(f"Filtered to {len(filtered_jobs)} jobs within {args.post_filter_days} days")
+        
+        # Save the data
+        formats = args.formats.split(",")
+        scraper.save_data(
+            job_title=job_title, 
+            location=location, 
+            time_frame=time_frame, 
+            formats=formats,
+            json_gzip=args.json_gzip,
+            json_indent=args.json_indent,
+            track_changes=False
+        )
+        
+        logger.info(f"Scraping complete! Collected {len(jobs)} job listings.")
+        logger.info("Check the 'data' directory for the output files.")
+    finally:
+        # Always leave a run report behind, even if the run failed part-way
+        scraper.write_run_report(args.report, args.prometheus_file)
 
 
 if __name__ == "__main__":
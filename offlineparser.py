@@ -0,0 +1,363 @@
+"""Parse saved or fetched page sources without a browser
+
+The scraper's selectors are written as XPath for Selenium. This module builds a
+small DOM with the standard library HTML parser and evaluates the subset of
+XPath 1.0 those selectors use (child/descendant steps, following-sibling::,
+parent::, unions, positional predicates and contains(@attr|text(), '...')
+joined with and/or), so the same selector cascades work on page sources.
+"""
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr"
+}
+
+# Elements whose text is never rendered
+SKIP_TEXT_ELEMENTS = {"script", "style", "noscript", "template"}
+
+
+class Node:
+    """An element in the parsed document"""
+
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = []
+        self.parent = parent
+
+    def get(self, name, default=None):
+        return self.attrs.get(name, default)
+
+    def element_children(self):
+        return [child for child in self.children if isinstance(child, Node)]
+
+    def iter_descendants(self):
+        """Yield descendant elements in document order"""
+        stack = list(reversed(self.element_children()))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.element_children()))
+
+    def first_text(self):
+        """The first direct text node, as XPath's text() in a string context"""
+        for child in self.children:
+            if isinstance(child, str):
+                return child
+        return ""
+
+    def text(self):
+        """Whitespace-normalized text content, roughly what Selenium's .text returns"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag not in SKIP_TEXT_ELEMENTS:
+                stack.extend(reversed(node.children))
+        return " ".join(" ".join(parts).split())
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: (value or "") for name, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {name: (value or "") for name, value in attrs}, self.current)
+        self.current.children.append(node)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element; stray end tags are ignored
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(source):
+    """Parse an HTML document into a tree of Nodes"""
+    builder = _TreeBuilder()
+    builder.feed(source)
+    builder.close()
+    return builder.root
+
+
+# --- XPath subset -----------------------------------------------------------
+
+_CONTAINS_RE = re.compile(r"contains\(\s*(@[\w-]+|text\(\))\s*,\s*(['\"])(.*?)\2\s*\)")
+
+
+def split_top_level(expression, separator):
+    """Split on a separator that is outside brackets, parentheses and quotes"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    i = 0
+    while i < len(expression):
+        char = expression[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif depth == 0 and expression.startswith(separator, i):
+            parts.append(expression[start:i])
+            i += len(separator)
+            start = i
+            continue
+        i += 1
+    parts.append(expression[start:])
+    return parts
+
+
+def _compile_predicate(text):
+    text = text.strip()
+    if text.isdigit():
+        return ("position", int(text))
+
+    clauses = []
+    for or_part in split_top_level(text, " or "):
+        conditions = []
+        for and_part in split_top_level(or_part, " and "):
+            match = _CONTAINS_RE.fullmatch(and_part.strip())
+            if not match:
+                raise ValueError(f"Unsupported XPath predicate: {and_part.strip()}")
+            conditions.append((match.group(1), match.group(3)))
+        clauses.append(conditions)
+    return ("test", clauses)
+
+
+def _compile_step(text):
+    text = text.strip()
+    bracket = text.find("[")
+    head = text if bracket == -1 else text[:bracket]
+    predicates = []
+    rest = "" if bracket == -1 else text[bracket:]
+    while rest:
+        depth = 0
+        quote = None
+        for i, char in enumerate(rest):
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in "'\"":
+                quote = char
+            elif char == "[":
+                depth += 1
+            elif char == "]":
+                depth -= 1
+                if depth == 0:
+                    predicates.append(_compile_predicate(rest[1:i]))
+                    rest = rest[i + 1:].strip()
+                    break
+        else:
+            raise ValueError(f"Unbalanced predicate in XPath step: {text}")
+
+    axis = "child"
+    if "::" in head:
+        axis, head = head.split("::", 1)
+    return (axis, head.strip() or "*", tuple(predicates))
+
+
+def _compile_path(path):
+    path = path.strip()
+    relative = path.startswith(".")
+    if relative:
+        path = path[1:]
+
+    segments = split_top_level(path, "/")
+    if path.startswith("/"):
+        # The leading '/' anchors the path at the context node
+        segments = segments[1:]
+
+    steps = []
+    for segment in segments:
+        if segment == "":
+            # An empty segment comes from '//': the next step searches all descendants
+            steps.append(None)
+            continue
+        axis, test, predicates = _compile_step(segment)
+        if steps and steps[-1] is None:
+            steps.pop()
+            if axis == "child":
+                axis = "descendant-child"
+        steps.append((axis, test, predicates))
+    return relative, tuple(step for step in steps if step is not None)
+
+
+@lru_cache(maxsize=512)
+def compile_xpath(expression):
+    """Compile an XPath expression (cached, so each selector is parsed once)"""
+    return tuple(_compile_path(part) for part in split_top_level(expression, "|"))
+
+
+def _matches_test(node, test):
+    return test == "*" or node.tag == test
+
+
+def _matches_conditions(node, clauses):
+    for conditions in clauses:
+        ok = True
+        for target, needle in conditions:
+            value = node.first_text() if target == "text()" else node.get(target[1:], "")
+            if needle not in value:
+                ok = False
+                break
+        if ok:
+            return True
+    return False
+
+
+def _apply_predicates(candidates, predicates):
+    for kind, value in predicates:
+        if kind == "position":
+            candidates = candidates[value - 1:value]
+        else:
+            candidates = [node for node in candidates if _matches_conditions(node, value)]
+    return candidates
+
+
+def _step(context_nodes, axis, test, predicates):
+    results = []
+    seen = set()
+
+    def add(nodes):
+        for node in _apply_predicates(nodes, predicates):
+            if id(node) not in seen:
+                seen.add(id(node))
+                results.append(node)
+
+    for context in context_nodes:
+        if axis == "child":
+            add([n for n in context.element_children() if _matches_test(n, test)])
+        elif axis == "descendant-child":
+            # descendant-or-self::node()/child::test, positions counted per parent
+            for parent in [context, *context.iter_descendants()]:
+                add([n for n in parent.element_children() if _matches_test(n, test)])
+        elif axis == "following-sibling":
+            if context.parent is not None:
+                siblings = context.parent.element_children()
+                index = next(i for i, n in enumerate(siblings) if n is context)
+                add([n for n in siblings[index + 1:] if _matches_test(n, test)])
+        elif axis == "parent":
+            if context.parent is not None and _matches_test(context.parent, test):
+                add([context.parent])
+        else:
+            raise ValueError(f"Unsupported XPath axis: {axis}")
+    return results
+
+
+def _document_root(node):
+    while node.parent is not None:
+        node = node.parent
+    return node
+
+
+def find_all(node, expression):
+    """Evaluate an XPath expression and return matches in document order"""
+    compiled = compile_xpath(expression)
+    matches = []
+    seen = set()
+    for relative, steps in compiled:
+        context = [node if relative else _document_root(node)]
+        for axis, test, predicates in steps:
+            context = _step(context, axis, test, predicates)
+            if not context:
+                break
+        for match in context:
+            if id(match) not in seen:
+                seen.add(id(match))
+                matches.append(match)
+
+    if len(compiled) > 1 and len(matches) > 1:
+        # Unions are returned in document order, like a browser does
+        scope = node if all(relative for relative, _ in compiled) else _document_root(node)
+        order = {id(n): i for i, n in enumerate(scope.iter_descendants())}
+        matches.sort(key=lambda n: order.get(id(n), -1))
+    return matches
+
+
+def find_first(node, expression):
+    """The first match of an XPath expression, or None"""
+    matches = find_all(node, expression)
+    return matches[0] if matches else None
+
+
+# --- Job cards ----------------------------------------------------------------
+
+def extract_text(card, xpath_list, field_name, record=None):
+    """Offline counterpart of NaukriScraper.extract_with_selectors
+
+    record is an optional callable (xpath, hit) called for every selector tried.
+    """
+    for xpath in xpath_list:
+        found = find_first(card, xpath)
+        text = found.text() if found is not None else None
+        if record:
+            record(xpath, bool(text))
+        if text:
+            return text
+    return f"{field_name} not found"
+
+
+def _card_link(card, link_xpath, base_url):
+    link = find_first(card, link_xpath)
+    href = link.get("href") if link is not None else None
+    if not href:
+        return None
+    return urljoin(base_url, href) if base_url else href
+
+
+def extract_job_cards(source, card_xpath, field_xpaths, link_xpath, base_url=None, max_jobs=None, known=None,
+                      record=None):
+    """Extract job records from a page source using the scraper's selectors
+
+    field_xpaths maps record keys to (field name, xpath list) in record order.
+    known is an optional callable (card index, card link) -> dict of fields already
+    known from structured data; selectors are only evaluated for the other fields.
+    record is an optional callable (record key, xpath, hit) for selector statistics.
+    Returns an empty list when the page has no rendered job cards.
+    """
+    root = source if isinstance(source, Node) else parse_html(source)
+    cards = find_all(root, card_xpath)
+    if max_jobs is not None:
+        cards = cards[:max_jobs]
+
+    records = []
+    for index, card in enumerate(cards):
+        link = _card_link(card, link_xpath, base_url)
+        known_fields = (known(index, link) if known else None) or {}
+
+        job_info = {}
+        for key, (field_name, xpaths) in field_xpaths.items():
+            field_record = (lambda xpath, hit, key=key: record(key, xpath, hit)) if record else None
+            job_info[key] = known_fields.get(key) or extract_text(card, xpaths, field_name, field_record)
+
+        job_info["link"] = known_fields.get("link") or link or "Link not found"
+        job_info["job_id"] = known_fields.get("job_id") or card.get("id") or "job-card-id"
+        records.append(job_info)
+    return records
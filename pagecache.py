@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url):
+    """Canonical form of a URL: lower-case scheme and host, sorted query, no fragment"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def cache_key(url, **params):
+    """Content address of a page: hash of the normalized URL and filter parameters"""
+    material = json.dumps({"url": normalize_url(url), "params": {k: params[k] for k in sorted(params)}},
+                          sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """Compressed on-disk cache of page sources with a TTL and size-based LRU eviction
+
+    Pages are stored gzip-compressed under their cache key; index.json keeps the
+    URL, parameters, size and access times used for expiry and eviction.
+    """
+
+    def __init__(self, directory="cache/pages", ttl=24 * 3600, max_bytes=500 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.html.gz")
+
+    def _remove(self, key):
+        entry = self.index.pop(key, None)
+        if entry:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, url, allow_stale=False, **params):
+        """The cached source for a page, or None if missing or expired"""
+        key = cache_key(url, **params)
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if not allow_stale and self.ttl and time.time() - entry["stored_at"] > self.ttl:
+                self._remove(key)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            try:
+                with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                    source = f.read()
+            except OSError:
+                self._remove(key)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            entry["last_access"] = time.time()
+            self.hits += 1
+            return source
+
+    def put(self, url, source, **params):
+        """Store a page source, evicting least recently used pages beyond the size limit"""
+        key = cache_key(url, **params)
+        path = self._path(key)
+        data = gzip.compress(source.encode("utf-8"), compresslevel=6)
+
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            now = time.time()
+            self.index[key] = {
+                "url": normalize_url(url),
+                "params": params,
+                "size": len(data),
+                "stored_at": now,
+                "last_access": now
+            }
+            self._evict()
+            self._save_index()
+        return key
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= self.index[key]["size"]
+            self._remove(key)
+            logger.debug("Evicted cached page %s", key)
+
+    def flush(self):
+        """Persist access times recorded by get()"""
+        with self._lock:
+            self._save_index()
+
+    def stats(self):
+        return {
+            "pages": len(self.index),
+            "bytes": sum(entry["size"] for entry in self.index.values()),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,124 @@
+"""Tell result pages from block pages, empty searches and errors right after a load
+
+classify_page only uses cheap signals: the HTTP status, the card count the
+caller already has, the <title> and a few substring and regex checks on the
+source. The Akamai bot-manager script (/akam/) is also served on ordinary
+result pages, so on its own it only marks a page as a challenge when nothing
+on the page looks like results.
+"""
+import re
+from collections import namedtuple
+
+RESULTS = "results"
+EMPTY = "empty"
+CHALLENGE = "challenge"
+ERROR = "error"
+
+PageVerdict = namedtuple("PageVerdict", ["label", "reason", "card_count"])
+
+# Markers of captcha and bot-challenge interstitials
+CHALLENGE_MARKERS = (
+    "g-recaptcha", "hcaptcha", "captcha-delivery", "/_sec/cp_challenge", "sec-if-cpt",
+    "bm-verify", "errors.edgesuite.net", "verify you are human", "pardon our interruption",
+    "are you a robot"
+)
+CHALLENGE_TITLES = ("access denied", "captcha", "just a moment", "attention required", "request blocked")
+
+# Served on normal pages too; only counts when the page shows no results at all
+WEAK_CHALLENGE_MARKERS = ("/akam/", "_abck", "captcha")
+
+NO_RESULTS_MARKERS = (
+    "no results found", "no jobs found", "could not find any jobs", "couldn't find any jobs",
+    "did not match any jobs", "0 jobs found"
+)
+# Matched as whole words: "0 jobs found" is also the end of "120 jobs found"
+NO_RESULTS = re.compile(r"\b(?:" + "|".join(re.escape(marker) for marker in NO_RESULTS_MARKERS) + r")\b")
+ERROR_TITLES = ("404", "page not found", "something went wrong", "service unavailable", "bad gateway",
+                "internal server error", "gateway timeout")
+
+# "1 - 20 of 23549" above the cards; matched from the literal "of", which is
+# far rarer than the digits a "\d+ - \d+ of" scan has to try at
+RESULT_COUNT = re.compile(r"\sof\s+(\d[\d,]*)")
+RESULT_RANGE = re.compile(r"\b\d+\s*-\s*(\d+)$")
+ITEM_COUNT = re.compile(r'"numberOfItems"\s*:\s*(\d+)')
+TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
+
+
+def result_range(source):
+    """(last result shown, total) from the page's "21 - 40 of 23549", or None"""
+    for match in RESULT_COUNT.finditer(source or ""):
+        shown = RESULT_RANGE.search(source, max(0, match.start() - 24), match.start())
+        if shown:
+            return int(shown.group(1)), int(match.group(1).replace(",", ""))
+    return None
+
+
+def result_count(source):
+    """Total number of results the page reports ("1 - 20 of 23549"), or None"""
+    shown = result_range(source)
+    return shown[1] if shown else None
+
+
+def page_title(source):
+    match = TITLE.search(source or "")
+    return match.group(1).strip() if match else ""
+
+
+def classify_page(source, card_count=0, status=None, title=None):
+    """Label a loaded page as RESULTS, EMPTY, CHALLENGE or ERROR
+
+    card_count is the number of job cards the caller found (0 for a page that
+    still needs rendering), status the HTTP status when known, and title the
+    document title when it is cheaper to get than from the source.
+    """
+    if card_count:
+        return PageVerdict(RESULTS, f"{card_count} job cards", card_count)
+    if status in (403, 429):
+        return PageVerdict(CHALLENGE, f"HTTP {status}", 0)
+    if status is not None and status >= 400:
+        return PageVerdict(ERROR, f"HTTP {status}", 0)
+    if not source:
+        return PageVerdict(ERROR, "empty page source", 0)
+
+    text = source.lower()
+    title = (title if title is not None else page_title(source)).lower()
+    for marker in CHALLENGE_MARKERS:
+        if marker in text:
+            return PageVerdict(CHALLENGE, f"'{marker}' in page", 0)
+    for marker in CHALLENGE_TITLES:
+        if marker in title:
+            return PageVerdict(CHALLENGE, f"title '{title}'", 0)
+
+    count = result_count(source)
+    if count == 0:
+        return PageVerdict(EMPTY, "0 results", 0)
+    if count:
+        # Results exist but the cards aren't in the markup (yet): rendered client-side
+        return PageVerdict(RESULTS, f"{count} results, no job cards", 0)
+    marker = NO_RESULTS.search(text)
+    if marker:
+        return PageVerdict(EMPTY, f"'{marker.group(0)}' in page", 0)
+    items = ITEM_COUNT.search(source)
+    if items and int(items.group(1)):
+        # The same from the ItemList markup
+        return PageVerdict(RESULTS, f"{items.group(1)} results, no job cards", 0)
+
+    for marker in ERROR_TITLES:
+        if marker in title:
+            return PageVerdict(ERROR, f"title '{title}'", 0)
+    for marker in WEAK_CHALLENGE_MARKERS:
+        if marker in text:
+            return PageVerdict(CHALLENGE, f"'{marker}' in a page without results", 0)
+    return PageVerdict(ERROR, "no job cards or result markers", 0)
+
+
+class UnusablePage(Exception):
+    """Raised by a page loader for a page that isn't worth extracting; worth retrying"""
+
+    def __init__(self, verdict):
+        super().__init__(f"{verdict.label} page ({verdict.reason})")
+        self.verdict = verdict
+
+
+class BlockedPage(UnusablePage):
+    """A challenge page: retrying straight away only prolongs the block"""
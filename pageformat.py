@@ -9,6 +9,11 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import os
 import json
+from crawlarchive import CrawlArchive
+from siteprofile import find_text, load_profile
+
+# Selectors shared with the scraper
+PROFILE = load_profile()
 
 def analyze_naukri_page(url):
     # Set up Chrome options
@@ -48,6 +53,10 @@ def analyze_naukri_page(url):
         
         print("HTML source saved to naukri_source.html")
         
+        # Keep every snapshot in the crawl archive, since naukri_source.html is overwritten each run
+        entry = CrawlArchive("archive").append(url, html_source, query={"tool": os.path.splitext(os.path.basename(__file__))[0]})
+        print(f"Snapshot archived in archive/{entry['file']} at offset {entry['offset']}")
+        
         # Print page title
         print(f"Page title: {driver.title}")
         
@@ -102,47 +111,21 @@ def extract_job_listings(driver):
     """Extract job listings data based on page structure identified"""
     job_listings = []
     
-    # Based on the identified page structure, try different selectors
-    # Starting with the most common patterns seen in job boards
-    
-    # Try pattern 1: Job cards in container
+    # Card and field selectors come from the scraper's site profile
     try:
-        # First attempt - look for job cards with nI-gNb prefix as seen in the output
-        job_cards = driver.find_elements(By.XPATH, "//div[contains(@class, 'job') or contains(@class, 'jobTuple')]")
-        
-        if not job_cards:
-            # Alternative selector if the first one doesn't work
-            job_cards = driver.find_elements(By.XPATH, "//article | //div[contains(@class, 'card')]")
+        job_cards = driver.find_elements(*PROFILE.cards.union.locator)
         
         print(f"Found {len(job_cards)} potential job listings")
         
         for i, card in enumerate(job_cards[:10]):  # Limit to first 10 for testing
             job_info = {}
             
-            # Extract title - try multiple possible selectors
-            try:
-                title_elem = card.find_element(By.XPATH, ".//a[contains(@class, 'title')] | .//h2 | .//h3 | .//div[contains(@class, 'title')]")
-                job_info["title"] = title_elem.text.strip()
-            except NoSuchElementException:
-                job_info["title"] = "Title not found"
-            
-            # Extract company name
-            try:
-                company_elem = card.find_element(By.XPATH, ".//a[contains(@class, 'company')] | .//span[contains(@class, 'company')] | .//div[contains(@class, 'company')]")
-                job_info["company"] = company_elem.text.strip()
-            except NoSuchElementException:
-                job_info["company"] = "Company not found"
-                
-            # Extract location
-            try:
-                location_elem = card.find_element(By.XPATH, ".//span[contains(@class, 'location')] | .//div[contains(@class, 'location')] | .//span[contains(text(), 'Location')]")
-                job_info["location"] = location_elem.text.strip()
-            except NoSuchElementException:
-                job_info["location"] = "Location not found"
+            for key in ["title", "company", "location"]:
+                job_info[key] = find_text(card, PROFILE.fields[key])
                 
             # Extract link
             try:
-                link_elem = card.find_element(By.XPATH, ".//a[1]")
+                link_elem = card.find_element(*PROFILE.link.union.locator)
                 job_info["link"] = link_elem.get_attribute("href")
             except NoSuchElementException:
                 job_info["link"] = "Link not found"
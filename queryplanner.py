@@ -0,0 +1,157 @@
+"""Split searches too big to crawl into partitions that can be crawled completely
+
+Result pages stop at some depth, so a broad search (e.g. /jobs) can't be
+crawled to the end. QueryPlanner reads the result count of a search from its
+first page. A search that fits in max_pages pages becomes one crawl of exactly
+the pages it needs; a bigger one is split by location (when it has none), then
+by experience (when it has none), and each part is counted and split again in
+turn. Counts of sibling partitions are probed concurrently.
+
+The city list can't cover every location, so the postings the cities don't
+account for become a remainder partition: the unsplit search, narrowed to the
+newest postings that fit. Naukri's experience filter matches every posting
+whose range (e.g. 3-5 Yrs) contains the given year, so one posting shows up
+under several filters. Experience partitions are therefore exclusive: each
+keeps only the postings whose minimum experience is its own year, and every
+posting belongs to exactly one of them.
+
+Freshness is the last resort. Naukri's date windows are nested ("last 7 days"
+includes the last day), so they narrow a search rather than split it: the
+widest window that fits is crawled, and the results older than that are
+reported as out of reach.
+"""
+import logging
+import math
+
+from joblistingscraper import JOB_AGE_DAYS
+from queryscheduler import describe
+
+logger = logging.getLogger(__name__)
+
+# Cities that together hold most postings; "remote" for location-independent jobs
+LOCATIONS = (
+    "bangalore", "mumbai", "delhi", "hyderabad", "chennai", "pune", "kolkata", "gurgaon", "noida",
+    "ahmedabad", "chandigarh", "jaipur", "kochi", "coimbatore", "indore", "lucknow", "remote"
+)
+
+# Years of experience, one exclusive partition each: a posting belongs to the year its range starts at
+EXPERIENCE_LEVELS = tuple(range(0, 31))
+
+# Days covered by each time frame, to find the windows narrower than a search's own
+TIME_FRAME_DAYS = {"all": math.inf, "year": 365, "6months": 180, "3months": 90, **JOB_AGE_DAYS}
+
+
+class QueryPlanner:
+    """Turn searches into crawlable partitions with the number of pages each needs"""
+
+    def __init__(self, scraper, max_pages=50, jobs_per_page=20, locations=LOCATIONS,
+                 experience_levels=EXPERIENCE_LEVELS):
+        self.scraper = scraper
+        self.max_pages = max_pages
+        self.jobs_per_page = jobs_per_page
+        self.locations = locations
+        self.experience_levels = experience_levels
+        self.probes = 0
+        self.stats = []
+
+    def count(self, queries):
+        """Result counts of several searches, fetched concurrently"""
+        self.probes += len(queries)
+        return self.scraper.count_results(
+            [(query.job_title, query.location, query.time_frame, query.experience) for query in queries])
+
+    def plan(self, queries):
+        """Partitions covering every search, as searches with pages set and the result count as priority"""
+        leaves = []
+        for query, count in zip(queries, self.count(queries)):
+            parts = []
+            unreachable = self._visit(query, count, self._dimensions(query), parts)
+            # Partitions are disjoint (or nearly: multi-city postings), so what is out of
+            # reach is counted once per partition rather than summed over overlapping counts
+            reachable = max(0, count - min(unreachable, count)) if count else 0
+            self.stats.append({
+                "query": describe(query),
+                "results": count,
+                "partitions": len(parts),
+                "pages": sum(part.pages for part in parts),
+                "reachable_results": reachable if count is not None else None,
+                "unreachable_results": min(unreachable, count) if count is not None else None
+            })
+            if count:
+                logger.info(f"Planned {describe(query)}: {count} results in {len(parts)} partitions, "
+                            f"{sum(part.pages for part in parts)} pages, about {reachable} results reachable")
+            leaves.extend(parts)
+
+        # Re-number so the scheduler's file-order tie break follows the plan
+        leaves = [leaf._replace(index=i) for i, leaf in enumerate(leaves)]
+        self.scraper.metrics.extra["query_plan"] = {"probes": self.probes, "searches": self.stats}
+        return leaves
+
+    def _dimensions(self, query):
+        dimensions = []
+        if not query.location:
+            dimensions.append("location")
+        if query.experience is None:
+            dimensions.append("experience")
+        return dimensions
+
+    def _pages(self, count):
+        return max(1, math.ceil(count / self.jobs_per_page))
+
+    def _visit(self, query, count, dimensions, leaves):
+        """Add the partitions of a search to leaves; returns how many of its results are out of reach"""
+        if count is None:
+            # Size unknown: crawl it as requested
+            logger.warning(f"Could not read the result count of {describe(query)}, crawling {query.pages} pages")
+            leaves.append(query._replace(priority=0))
+            return 0
+        if count == 0:
+            return 0
+        if self._pages(count) <= self.max_pages:
+            leaves.append(query._replace(pages=self._pages(count), priority=count))
+            return 0
+
+        if not dimensions:
+            return self._narrow(query, count, leaves)
+
+        dimension, rest = dimensions[0], dimensions[1:]
+        if dimension == "location":
+            children = [query._replace(location=location) for location in self.locations]
+        else:
+            children = [query._replace(experience=level, exclusive=True) for level in self.experience_levels]
+        logger.info(f"{describe(query)} has {count} results, splitting it by {dimension} into {len(children)}")
+        child_counts = self.count(children)
+        unreachable = 0
+        for child, child_count in zip(children, child_counts):
+            unreachable += self._visit(child, child_count, rest, leaves)
+
+        if dimension == "location":
+            # Postings outside the listed cities: the whole search, newest first, as far as it fits
+            remainder = count - sum(child_count or 0 for child_count in child_counts)
+            if remainder > 0:
+                logger.info(f"{remainder} results of {describe(query)} are outside the listed cities, "
+                            f"adding the newest postings of the unsplit search as a remainder partition")
+                missed = self._narrow(query, count, leaves)
+                # The narrowed slice reaches the same share of the remainder as of the whole search
+                unreachable += round(remainder * missed / count)
+        return unreachable
+
+    def _narrow(self, query, count, leaves):
+        """Crawl the widest date window of a search that fits; returns how many results it leaves out"""
+        days = TIME_FRAME_DAYS.get(query.time_frame, math.inf)
+        windows = sorted((frame for frame, frame_days in JOB_AGE_DAYS.items() if frame_days < days),
+                         key=JOB_AGE_DAYS.get, reverse=True)
+        narrowed = [query._replace(time_frame=frame) for frame in windows]
+        for candidate, candidate_count in zip(narrowed, self.count(narrowed) if narrowed else []):
+            if candidate_count is not None and self._pages(candidate_count) <= self.max_pages:
+                logger.warning(f"{describe(query)} has {count} results; only the newest ({candidate.time_frame}) "
+                               f"{candidate_count} fit in {self.max_pages} pages")
+                leaves.append(candidate._replace(pages=self._pages(candidate_count), priority=candidate_count))
+                return max(0, count - candidate_count)
+
+        # Nothing fits: crawl as deep as allowed
+        newest = narrowed[-1] if narrowed else query
+        logger.warning(f"{describe(query)} has {count} results, more than {self.max_pages} pages reach even when "
+                       f"narrowed; crawling the first {self.max_pages} pages of {newest.time_frame}")
+        leaves.append(newest._replace(pages=self.max_pages, priority=self.max_pages * self.jobs_per_page))
+        return max(0, count - self.max_pages * self.jobs_per_page)
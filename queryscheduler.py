@@ -0,0 +1,180 @@
+"""Run a whole matrix of searches in one process
+
+load_queries reads searches from a CSV file (with a header row) or a JSONL
+file: job_title (or title), location and time_frame, and optionally pages,
+priority and experience. QueryScheduler runs them highest priority first (file order among
+equals) through a single NaukriScraper, so the chromedriver is resolved once and
+the browser session is kept between searches. A job found by several searches
+is stored once, and every search gets a line of statistics in the log and the
+run report.
+"""
+import csv
+import heapq
+import json
+import logging
+import re
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# experience is Naukri's experience filter in years (None: any). An exclusive search
+# (a planner partition) only keeps the postings whose experience range starts at that year.
+SearchQuery = namedtuple("SearchQuery", ["job_title", "location", "time_frame", "pages", "priority", "index", "experience",
+                                         "exclusive"], defaults=(None, False))
+
+# The first number of an experience range such as "3-5 Yrs"
+_MIN_YEARS_RE = re.compile(r"(\d+)")
+
+# Values the scraper stores when a field wasn't found; they can't identify a job
+_MISSING_IDS = {"", "job-card-id", "Link not found"}
+
+
+def _query(row, index, default_time_frame, default_pages):
+    def value(*keys):
+        for key in keys:
+            text = row.get(key)
+            if text is not None and str(text).strip() != "":
+                return str(text).strip()
+        return None
+
+    return SearchQuery(
+        job_title=value("job_title", "title"),
+        location=value("location"),
+        time_frame=value("time_frame") or default_time_frame,
+        pages=int(value("pages") or default_pages),
+        priority=float(value("priority") or 0),
+        index=index,
+        experience=int(value("experience")) if value("experience") else None
+    )
+
+
+def load_queries(path, default_time_frame="month", default_pages=10):
+    """Searches from a .csv or .jsonl file, in file order"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson", ".json")):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    queries = [_query(row, i, default_time_frame, default_pages) for i, row in enumerate(rows)]
+    logger.info(f"Loaded {len(queries)} queries from {path}")
+    return queries
+
+
+def describe(query):
+    """A search as text for log lines"""
+    experience = f", {query.experience} yrs" if query.experience is not None else ""
+    return f"'{query.job_title or 'all jobs'}' in '{query.location or 'any location'}' ({query.time_frame}{experience})"
+
+
+def dedup_key(record):
+    """What identifies a job across searches: its ID, else its link, else title, company and location"""
+    job_id = record.get("job_id")
+    if job_id not in _MISSING_IDS and job_id is not None:
+        return ("id", job_id)
+    link = record.get("link")
+    if link not in _MISSING_IDS and link is not None:
+        return ("link", link.split("?")[0])
+    return ("card", record.get("title"), record.get("company"), record.get("location"))
+
+
+def min_experience(record):
+    """Years an experience range starts at (3 for "3-5 Yrs"), or None when it can't be read"""
+    match = _MIN_YEARS_RE.search(record.get("experience") or "")
+    return int(match.group(1)) if match else None
+
+
+class QueryScheduler:
+    """A priority queue of searches run one after another by one scraper"""
+
+    def __init__(self, scraper, max_jobs_per_page=20):
+        self.scraper = scraper
+        self.max_jobs_per_page = max_jobs_per_page
+        self.queue = []
+        self.seen = set()
+        self.stats = []
+
+    def add(self, query):
+        # heapq is a min-heap: highest priority first, then file order
+        heapq.heappush(self.queue, (-query.priority, query.index, query))
+
+    def run(self):
+        """Run every queued search; returns the per-query statistics"""
+        scraper = self.scraper
+        total = len(self.queue)
+        scraper.keep_driver = True
+        try:
+            while self.queue:
+                _, _, query = heapq.heappop(self.queue)
+                stats = self.run_query(query)
+                self.stats.append(stats)
+                logger.info(f"Query {len(self.stats)}/{total} {describe(query)}: {stats['jobs']} jobs "
+                            f"from {stats['pages']} pages, {stats['new_jobs']} new, in {stats['seconds']}s")
+                if scraper.challenges > scraper.max_challenges:
+                    # The site keeps blocking us; the remaining searches would only be blocked too
+                    logger.error(f"Stopping with {len(self.queue)} queries left: still blocked after fresh sessions")
+                    break
+        finally:
+            scraper.keep_driver = False
+            scraper.close_driver()
+
+        for _, _, query in sorted(self.queue):
+            self.stats.append(dict(self._describe(query), outcome="not_run"))
+        self.queue = []
+        scraper.metrics.extra["queries"] = self.stats
+        return self.stats
+
+    def run_query(self, query):
+        """Crawl one search, adding only jobs no earlier search returned"""
+        scraper = self.scraper
+        start = time.perf_counter()
+        pages = jobs = new_jobs = other_bands = 0
+        scraper.page_verdict = None
+        for batch in scraper.iter_jobs(query.job_title, query.location, query.time_frame, query.pages,
+                                       self.max_jobs_per_page, batches=True, experience=query.experience):
+            pages += 1
+            jobs += len(batch.jobs)
+            fresh = []
+            for record in batch.jobs:
+                if query.exclusive:
+                    # Postings of another experience partition; unreadable ranges are kept
+                    years = min_experience(record)
+                    if years is not None and years != query.experience:
+                        other_bands += 1
+                        continue
+                key = dedup_key(record)
+                if key not in self.seen:
+                    self.seen.add(key)
+                    fresh.append(record)
+            scraper.job_listings.extend(fresh)
+            new_jobs += len(fresh)
+
+        # Without jobs, the label of the last page says why (empty search, challenge, error)
+        verdict = scraper.page_verdict
+        if jobs:
+            outcome = "ok"
+        else:
+            outcome = verdict.label if verdict is not None and verdict.label != "results" else "failed"
+        return dict(
+            self._describe(query),
+            outcome=outcome,
+            exhausted=scraper.results_exhausted,
+            pages=pages,
+            jobs=jobs,
+            new_jobs=new_jobs,
+            duplicates=jobs - new_jobs - other_bands,
+            other_partitions=other_bands,
+            seconds=round(time.perf_counter() - start, 2)
+        )
+
+    @staticmethod
+    def _describe(query):
+        return {
+            "job_title": query.job_title,
+            "location": query.location,
+            "time_frame": query.time_frame,
+            "experience": query.experience,
+            "priority": query.priority,
+            "pages_requested": query.pages,
+            "exclusive": query.exclusive
+        }
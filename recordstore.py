@@ -0,0 +1,246 @@
+"""Compact columnar storage for job records
+
+Instead of one dict per job, each field is a column laid out like an Arrow array:
+a validity bitmap plus either int32 offsets and a UTF-8 byte buffer (text
+fields) or int32 codes into an interned dictionary (categorical fields such as
+company and location). Placeholder values like "Skills not found" are stored
+as missing and only materialized when records are read back, so they cost one
+bit per record instead of a string each.
+"""
+from array import array
+
+
+class _Column:
+    """One column: validity bitmap plus values (shared by text and categorical columns)"""
+
+    def __init__(self):
+        self.validity = bytearray()
+        self.length = 0
+
+    def _set_valid(self, valid):
+        if self.length % 8 == 0:
+            self.validity.append(0)
+        if valid:
+            self.validity[self.length // 8] |= 1 << (self.length % 8)
+        self.length += 1
+
+    def is_valid(self, index):
+        return bool(self.validity[index // 8] & (1 << (index % 8)))
+
+    def null_count(self):
+        return self.length - sum(bin(byte).count("1") for byte in self.validity)
+
+
+class TextColumn(_Column):
+    """Variable-length strings: int32 offsets into a UTF-8 buffer"""
+
+    def __init__(self):
+        super().__init__()
+        self.offsets = array("i", [0])
+        self.data = bytearray()
+
+    def append(self, value):
+        if value is not None:
+            self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+        self._set_valid(value is not None)
+
+    def get(self, index):
+        if not self.is_valid(index):
+            return None
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def nbytes(self):
+        return len(self.validity) + self.offsets.itemsize * len(self.offsets) + len(self.data)
+
+
+class CategoricalColumn(_Column):
+    """Interned values: int32 codes into a dictionary (-1 for missing)"""
+
+    def __init__(self):
+        super().__init__()
+        self.codes = array("i")
+        self.categories = []
+        self._lookup = {}
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+        else:
+            code = self._lookup.get(value)
+            if code is None:
+                code = self._lookup[value] = len(self.categories)
+                self.categories.append(value)
+            self.codes.append(code)
+        self._set_valid(value is not None)
+
+    def get(self, index):
+        code = self.codes[index]
+        return None if code < 0 else self.categories[code]
+
+    def nbytes(self):
+        return (len(self.validity) + self.codes.itemsize * len(self.codes)
+                + sum(len(c.encode("utf-8")) for c in self.categories))
+
+
+class RecordStore:
+    """A list-like store of job records kept as columns
+
+    Supports len(), iteration, indexing, append() and extend() like the list of
+    dicts it replaces. Missing values (None or the field's placeholder) are read
+    back as the placeholder, so records look the same as before.
+    """
+
+    def __init__(self, fields, categorical=(), placeholders=None):
+        self.fields = list(fields)
+        self.categorical = set(categorical)
+        self.placeholders = dict(placeholders or {})
+        self.columns = {field: self._new_column(field) for field in self.fields}
+        self._length = 0
+        self._version = 0
+        self._frame_cache = None
+
+    def _new_column(self, field):
+        return CategoricalColumn() if field in self.categorical else TextColumn()
+
+    def _add_field(self, field):
+        # Fields first seen part-way through are back-filled as missing
+        column = self._new_column(field)
+        for _ in range(self._length):
+            column.append(None)
+        self.fields.append(field)
+        self.columns[field] = column
+
+    @classmethod
+    def like(cls, other, records=()):
+        """An empty store with the same layout as another, optionally filled"""
+        store = cls(other.fields, other.categorical, other.placeholders)
+        store.extend(records)
+        return store
+
+    def append(self, record):
+        for key in record:
+            if key not in self.columns:
+                self._add_field(key)
+        for field in self.fields:
+            value = record.get(field)
+            if value is not None:
+                value = str(value)
+                if value == self.placeholders.get(field):
+                    value = None
+            self.columns[field].append(value)
+        self._length += 1
+        self._version += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        return self._length
+
+    def _record(self, index):
+        record = {}
+        for field in self.fields:
+            value = self.columns[field].get(index)
+            record[field] = self.placeholders.get(field) if value is None else value
+        return record
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        return self._record(index)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._record(index)
+
+    def __repr__(self):
+        return f"<RecordStore {self._length} records, {self.nbytes()} bytes>"
+
+    def to_records(self):
+        """All records as a list of dicts"""
+        return list(self)
+
+    def iter_rows(self, chunk_size=5000, placeholders=True):
+        """Yield the records as lists of value tuples in field order, chunk_size at a time"""
+        length = self._length
+        columns = [self.columns[field] for field in self.fields]
+        fills = [self.placeholders.get(field) if placeholders else None for field in self.fields]
+        for start in range(0, length, chunk_size):
+            indices = range(start, min(start + chunk_size, length))
+            values = [[fill if value is None else value for value in map(column.get, indices)]
+                      for column, fill in zip(columns, fills)]
+            yield list(zip(*values))
+
+    def column(self, field, placeholders=True):
+        """The values of one field as a list"""
+        column = self.columns[field]
+        placeholder = self.placeholders.get(field) if placeholders else None
+        return [placeholder if value is None else value for value in map(column.get, range(self._length))]
+
+    def nbytes(self):
+        """Approximate size of the column buffers"""
+        return sum(column.nbytes() for column in self.columns.values())
+
+    def to_arrow(self):
+        """A pyarrow Table built directly on the column buffers (no copy)
+
+        The table shares memory with the store, so the buffers can't grow while it
+        is alive: drop the table (or copy it) before appending more records.
+        """
+        import pyarrow as pa
+
+        arrays = []
+        for field in self.fields:
+            column = self.columns[field]
+            validity = pa.py_buffer(column.validity)
+            if isinstance(column, CategoricalColumn):
+                indices = pa.Array.from_buffers(pa.int32(), self._length, [validity, pa.py_buffer(column.codes)])
+                arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(column.categories, pa.string())))
+            else:
+                arrays.append(pa.Array.from_buffers(
+                    pa.string(), self._length,
+                    [validity, pa.py_buffer(column.offsets), pa.py_buffer(column.data)]
+                ))
+        return pa.Table.from_arrays(arrays, names=self.fields)
+
+    def to_pandas(self, placeholders=True):
+        """A DataFrame of the records, cached until the store changes
+
+        Categorical columns become pandas Categoricals over the stored codes.
+        With pyarrow installed the frame is built from the Arrow buffers.
+        """
+        cache_key = (self._version, placeholders)
+        if self._frame_cache is not None and self._frame_cache[0] == cache_key:
+            return self._frame_cache[1]
+
+        import pandas as pd
+
+        try:
+            frame = self.to_arrow().to_pandas()
+        except ImportError:
+            data = {}
+            for field in self.fields:
+                column = self.columns[field]
+                if isinstance(column, CategoricalColumn):
+                    data[field] = pd.Categorical.from_codes(list(column.codes), categories=column.categories)
+                else:
+                    data[field] = pd.Series(self.column(field, placeholders=False), dtype=object)
+            frame = pd.DataFrame(data, columns=self.fields)
+
+        if placeholders:
+            for field, placeholder in self.placeholders.items():
+                if field not in frame.columns:
+                    continue
+                if isinstance(frame[field].dtype, pd.CategoricalDtype):
+                    if placeholder not in frame[field].cat.categories:
+                        frame[field] = frame[field].cat.add_categories([placeholder])
+                frame[field] = frame[field].fillna(placeholder)
+
+        self._frame_cache = (cache_key, frame)
+        return frame
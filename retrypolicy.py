@@ -0,0 +1,189 @@
+"""Retries shared across a whole crawl
+
+RetryPolicy wraps a page load, a navigation or an HTTP fetch. Failed attempts are
+retried after a jittered exponential backoff, but only while the run's retry
+budget lasts, so a failing site can't cost minutes on every page. All callers
+share one CircuitBreaker: after a run of consecutive failures it opens and
+every caller waits; once the cool-down has passed a single probe request goes
+through, and only if it succeeds does traffic resume.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import nullcontext
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a caller gives up waiting for an open circuit"""
+
+
+class RetryBudget:
+    """A fixed number of retries shared by every operation of a run"""
+
+    def __init__(self, total=30):
+        self.total = total
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self):
+        """Take one retry from the budget; False when it is used up"""
+        with self._lock:
+            if self.total is not None and self.used >= self.total:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self):
+        return None if self.total is None else max(0, self.total - self.used)
+
+
+class CircuitBreaker:
+    """Pause every caller after consecutive failures and probe before resuming
+
+    closed: calls go through. After failure_threshold consecutive failures the
+    circuit opens and calls block for the cool-down. Then it is half-open: one
+    caller goes through as the probe while the others keep waiting. A successful
+    probe closes the circuit; a failed one reopens it with the cool-down doubled
+    (up to max_cooldown).
+    """
+
+    def __init__(self, failure_threshold=5, cooldown=30.0, max_cooldown=300.0):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self.paused_seconds = 0.0
+        self._condition = threading.Condition()
+
+    def before_call(self, max_wait=None):
+        """Block while the circuit is open; returns once this caller may proceed"""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        waited_from = None
+        with self._condition:
+            try:
+                while True:
+                    if self.state == CLOSED:
+                        return
+                    now = time.monotonic()
+                    if self.state == OPEN and now >= self.opened_at + self.cooldown:
+                        # This caller is the probe; everyone else waits for its outcome
+                        self.state = HALF_OPEN
+                        logger.info("Circuit half-open, sending a probe request")
+                        return
+
+                    if waited_from is None:
+                        waited_from = now
+                        logger.info("Circuit open, pausing until %.0fs cool-down has passed", self.cooldown)
+                    wait = self.opened_at + self.cooldown - now if self.state == OPEN else None
+                    if deadline is not None:
+                        if now >= deadline:
+                            raise CircuitOpenError(f"Circuit still {self.state} after waiting {max_wait}s")
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    self._condition.wait(wait)
+            finally:
+                if waited_from is not None:
+                    self.paused_seconds += time.monotonic() - waited_from
+
+    def record_success(self):
+        with self._condition:
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info("Probe succeeded, circuit closed")
+                self.state = CLOSED
+                self.cooldown = self.base_cooldown
+                self._condition.notify_all()
+
+    def record_failure(self):
+        with self._condition:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open()
+            elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning("Circuit opened after %d consecutive failures, pausing all requests for %.0fs",
+                       self.consecutive_failures, self.cooldown)
+        self._condition.notify_all()
+
+
+class RetryPolicy:
+    """Jittered exponential backoff under a shared retry budget and circuit breaker"""
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=30.0, budget=None, breaker=None, metrics=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics
+        self.budget_exhausted = 0
+
+    def delay(self, retry):
+        """Backoff before the given retry (0-based): "full jitter" over an exponential ceiling"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    def call(self, operation, func, *args, max_attempts=None, retry_on=(Exception,), no_retry=(), **kwargs):
+        """Run func(*args, **kwargs), retrying failures; returns its result or raises the last error
+
+        Exceptions in no_retry count as failures for the circuit breaker but are
+        raised straight away (e.g. a block page, where retrying only makes it
+        worse). An exception may carry a retry_after attribute (seconds, e.g. from an HTTP
+        Retry-After header) to lengthen the backoff.
+        """
+        max_attempts = max_attempts or self.max_attempts
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = func(*args, **kwargs)
+            except retry_on as e:
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt >= max_attempts or isinstance(e, no_retry):
+                    raise
+                if not self.budget.try_spend():
+                    self.budget_exhausted += 1
+                    logger.warning("Retry budget of %s used up, not retrying %s", self.budget.total, operation)
+                    raise
+
+                delay = max(self.delay(attempt - 1), min(getattr(e, "retry_after", None) or 0, self.max_delay))
+                logger.warning("%s failed on attempt %d/%d (%s), retrying in %.1fs",
+                               operation, attempt, max_attempts, e, delay)
+                if self.metrics:
+                    self.metrics.record_retry(operation)
+                with self.metrics.timer("sleep") if self.metrics else nullcontext():
+                    time.sleep(delay)
+                continue
+            except BaseException:
+                # Not retryable, but it must not leave a probe outstanding
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def stats(self):
+        return {
+            "retries_used": self.budget.used,
+            "retry_budget": self.budget.total,
+            "budget_exhausted": self.budget_exhausted,
+            "circuit_state": self.breaker.state,
+            "circuit_opened": self.breaker.times_opened,
+            "circuit_paused_seconds": round(self.breaker.paused_seconds, 3)
+        }
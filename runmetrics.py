@@ -0,0 +1,206 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from structuredlogging import log_context
+
+
+class RunMetrics:
+    """Lightweight timers and counters for a single scraper run"""
+
+    def __init__(self, namespace="naukri_scraper"):
+        self.namespace = namespace
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+
+        # phase -> {"calls", "seconds", "max_seconds"}
+        self.phases = {}
+        # field -> {"calls", "seconds", "max_seconds"}
+        self.fields = {}
+        # name -> int
+        self.counters = {}
+        # operation -> number of retries
+        self.retries = {}
+        # field -> xpath -> {"attempts", "hits"}
+        self.xpath_stats = {}
+        # name -> {"count", "sum", "min", "max"}
+        self.observations = {}
+        # Free-form sections added by other components (e.g. command accounting)
+        self.extra = {}
+
+    @staticmethod
+    def _add_timing(table, key, seconds):
+        entry = table.setdefault(key, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        if seconds > entry["max_seconds"]:
+            entry["max_seconds"] = seconds
+
+    @contextmanager
+    def timer(self, phase):
+        """Time a block of code and attribute it (and what it logs) to a phase"""
+        start = time.perf_counter()
+        try:
+            with log_context(phase=phase):
+                yield
+        finally:
+            self._add_timing(self.phases, phase, time.perf_counter() - start)
+
+    @contextmanager
+    def field_timer(self, field):
+        """Time a single field extractor"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_timing(self.fields, field, time.perf_counter() - start)
+
+    def incr(self, name, amount=1):
+        """Increment a counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_retry(self, operation):
+        """Count a retry of the given operation"""
+        self.retries[operation] = self.retries.get(operation, 0) + 1
+
+    def record_xpath(self, field, xpath, hit):
+        """Record whether an XPath produced a value for a field"""
+        entry = self.xpath_stats.setdefault(field, {}).setdefault(xpath, {"attempts": 0, "hits": 0})
+        entry["attempts"] += 1
+        if hit:
+            entry["hits"] += 1
+
+    def observe(self, name, value):
+        """Record a sample of a measured value (bytes, seconds, ...)"""
+        entry = self.observations.get(name)
+        if entry is None:
+            self.observations[name] = {"count": 1, "sum": value, "min": value, "max": value}
+            return
+        entry["count"] += 1
+        entry["sum"] += value
+        entry["min"] = min(entry["min"], value)
+        entry["max"] = max(entry["max"], value)
+
+    def elapsed(self):
+        """Seconds since the run started"""
+        return time.perf_counter() - self._start
+
+    def summary(self):
+        """Build a JSON-serializable summary of the run"""
+        elapsed = self.elapsed()
+        pages = self.counters.get("pages", 0)
+        jobs = self.counters.get("jobs", 0)
+
+        xpath_hit_rates = {}
+        for field, xpaths in self.xpath_stats.items():
+            xpath_hit_rates[field] = {
+                xpath: {
+                    "attempts": stats["attempts"],
+                    "hits": stats["hits"],
+                    "hit_rate": round(stats["hits"] / stats["attempts"], 4) if stats["attempts"] else 0.0
+                }
+                for xpath, stats in xpaths.items()
+            }
+
+        observations = {}
+        for name, entry in self.observations.items():
+            observations[name] = dict(entry, mean=entry["sum"] / entry["count"])
+
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_seconds": round(elapsed, 3),
+            "pages": pages,
+            "jobs": jobs,
+            "pages_per_sec": round(pages / elapsed, 4) if elapsed > 0 else 0.0,
+            "jobs_per_sec": round(jobs / elapsed, 4) if elapsed > 0 else 0.0,
+            "phases": self.phases,
+            "fields": self.fields,
+            "counters": self.counters,
+            "retries": self.retries,
+            "xpath_hit_rates": xpath_hit_rates,
+            "observations": observations,
+            **self.extra
+        }
+
+    def write_json(self, path):
+        """Write the run report as JSON"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def prometheus_lines(self):
+        """Render the metrics in the Prometheus text exposition format"""
+        ns = self.namespace
+        summary = self.summary()
+        lines = []
+
+        def metric(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {ns}_{name} {help_text}")
+            lines.append(f"# TYPE {ns}_{name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{ns}_{name}{_format_labels(labels)} {_format_value(value)}")
+
+        metric("run_duration_seconds", "gauge", "Wall-clock duration of the last run.",
+               [({}, summary["duration_seconds"])])
+        metric("last_run_timestamp_seconds", "gauge", "Unix time at which the last run started.",
+               [({}, self.started_at)])
+        metric("pages_per_second", "gauge", "Pages scraped per second in the last run.",
+               [({}, summary["pages_per_sec"])])
+        metric("jobs_per_second", "gauge", "Jobs extracted per second in the last run.",
+               [({}, summary["jobs_per_sec"])])
+        metric("phase_seconds_total", "counter", "Time spent in each scraper phase.",
+               [({"phase": phase}, stats["seconds"]) for phase, stats in self.phases.items()])
+        metric("phase_calls_total", "counter", "Number of times each scraper phase ran.",
+               [({"phase": phase}, stats["calls"]) for phase, stats in self.phases.items()])
+        metric("field_seconds_total", "counter", "Time spent in each field extractor.",
+               [({"field": field}, stats["seconds"]) for field, stats in self.fields.items()])
+        metric("events_total", "counter", "Run counters (pages, jobs, screenshots, ...).",
+               [({"event": name}, value) for name, value in self.counters.items()])
+        metric("retries_total", "counter", "Retries per operation.",
+               [({"operation": op}, value) for op, value in self.retries.items()])
+        metric("xpath_attempts_total", "counter", "XPath lookups per field and selector.",
+               [({"field": field, "xpath": xpath}, stats["attempts"])
+                for field, xpaths in self.xpath_stats.items() for xpath, stats in xpaths.items()])
+        metric("xpath_hits_total", "counter", "XPath lookups that produced a value.",
+               [({"field": field, "xpath": xpath}, stats["hits"])
+                for field, xpaths in self.xpath_stats.items() for xpath, stats in xpaths.items()])
+        metric("observation_sum", "gauge", "Sum of observed values.",
+               [({"name": name}, entry["sum"]) for name, entry in self.observations.items()])
+        metric("observation_count", "gauge", "Number of observed values.",
+               [({"name": name}, entry["count"]) for name, entry in self.observations.items()])
+
+        return lines
+
+    def write_prometheus(self, path):
+        """Write the metrics to a .prom file for the node exporter textfile collector"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write to a temporary file and rename so the collector never reads a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.prometheus_lines()) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
@@ -9,6 +9,11 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import os
 import json
+from crawlarchive import CrawlArchive
+from siteprofile import find_text, load_profile
+
+# Selectors shared with the scraper
+PROFILE = load_profile()
 
 def analyze_naukri_page(url):
     # Set up Chrome options
@@ -48,6 +53,10 @@ def analyze_naukri_page(url):
         
         print("HTML source saved to naukri_source.html")
         
+        # Keep every snapshot in the crawl archive, since naukri_source.html is overwritten each run
+        entry = CrawlArchive("archive").append(url, html_source, query={"tool": os.path.splitext(os.path.basename(__file__))[0]})
+        print(f"Snapshot archived in archive/{entry['file']} at offset {entry['offset']}")
+        
         # Print page title
         print(f"Page title: {driver.title}")
         
@@ -100,17 +109,8 @@ def extract_naukri_job_listings(driver, max_jobs=20):
     job_listings = []
     
     try:
-        # Naukri.com typically uses job cards/tuples
-        # Based on the terminal output, we can see job-related divs were found
-        job_cards = driver.find_elements(By.XPATH, "//article[contains(@class, 'job')] | //div[contains(@class, 'job')]")
-        
-        if not job_cards:
-            # Try alternative selector specific to Naukri
-            job_cards = driver.find_elements(By.XPATH, "//div[contains(@class, 'jobTuple')]")
-            
-        if not job_cards:
-            # Another alternative based on Naukri's structure from the screenshot
-            job_cards = driver.find_elements(By.XPATH, "//div[contains(@class, 'nI-gNb-job')]")
+        # Card and field selectors come from the scraper's site profile
+        job_cards = driver.find_elements(*PROFILE.cards.union.locator)
         
         print(f"Found {len(job_cards)} potential job listings")
         
@@ -120,71 +120,17 @@ def extract_naukri_job_listings(driver, max_jobs=20):
         for card in job_cards:
             job_info = {}
             
-            # Extract title (based on Naukri's structure)
-            try:
-                title_elem = card.find_element(By.XPATH, ".//a[contains(@class, 'title')] | .//a[contains(@class, 'jobTitle')] | .//a[contains(@title, 'Job Details')] | .//a[contains(@href, '/job-listings')]")
-                job_info["title"] = title_elem.text.strip()
-            except NoSuchElementException:
-                try:
-                    # Another common pattern in Naukri
-                    title_elem = card.find_element(By.XPATH, ".//a")
-                    job_info["title"] = title_elem.text.strip()
-                except NoSuchElementException:
-                    job_info["title"] = "Title not found"
-            
-            # Extract company name (based on Naukri's structure)
-            try:
-                company_elem = card.find_element(By.XPATH, ".//a[contains(@class, 'company')] | .//a[contains(@class, 'companyName')] | .//span[contains(@class, 'company')] | .//span[contains(@class, 'org')]")
-                job_info["company"] = company_elem.text.strip()
-            except NoSuchElementException:
-                job_info["company"] = "Company not found"
-                
-            # Extract location (based on Naukri's structure)
-            try:
-                location_elem = card.find_element(By.XPATH, ".//span[contains(@class, 'location')] | .//span[contains(@class, 'loc')] | .//span[contains(@class, 'locWdth')] | .//div[contains(@class, 'location')]")
-                job_info["location"] = location_elem.text.strip()
-            except NoSuchElementException:
-                try:
-                    # Try another common pattern for location on Naukri
-                    location_elem = card.find_element(By.XPATH, ".//span[contains(text(), 'Location')]/following-sibling::span")
-                    job_info["location"] = location_elem.text.strip()
-                except NoSuchElementException:
-                    job_info["location"] = "Location not found"
-                
-            # Extract experience (Naukri specific)
-            try:
-                exp_elem = card.find_element(By.XPATH, ".//span[contains(@class, 'experience')] | .//span[contains(@class, 'exp')] | .//li[contains(text(), 'Yrs')]")
-                job_info["experience"] = exp_elem.text.strip()
-            except NoSuchElementException:
-                job_info["experience"] = "Experience not found"
-                
-            # Extract salary (Naukri specific)
-            try:
-                salary_elem = card.find_element(By.XPATH, ".//span[contains(@class, 'salary')] | .//span[contains(@class, 'sal')] | .//span[contains(text(), 'PA')]")
-                job_info["salary"] = salary_elem.text.strip()
-            except NoSuchElementException:
-                job_info["salary"] = "Salary not found"
-            
-            # Extract job description/snippet (Naukri specific)
-            try:
-                desc_elem = card.find_element(By.XPATH, ".//div[contains(@class, 'job-description')] | .//div[contains(@class, 'description')] | .//ul[contains(@class, 'description')]")
-                job_info["description"] = desc_elem.text.strip()
-            except NoSuchElementException:
-                job_info["description"] = "Description not found"
+            for key in ["title", "company", "location", "experience", "salary", "description"]:
+                job_info[key] = find_text(card, PROFILE.fields[key])
                 
             # Extract job link
             try:
-                link_elem = card.find_element(By.XPATH, ".//a[contains(@class, 'title')] | .//a[contains(@class, 'jobTitle')] | .//a[1]")
+                link_elem = card.find_element(*PROFILE.link.union.locator)
                 job_info["link"] = link_elem.get_attribute("href")
             except NoSuchElementException:
                 job_info["link"] = "Link not found"
                 
-            # Extract posted date (Naukri specific)
-            try:
-                date_elem = card.find_element(By.XPATH, ".//span[contains(@class, 'date')] | .//div[contains(@class, 'date')] | .//span[contains(text(), 'day')]")
-                job_info["posted_date"] = date_elem.text.strip()
-            except NoSuchElementException:
-                job_info["posted_date"] = "Date not found"
+            job_info["posted_date"] = find_text(card, PROFILE.fields["posted_date"])
             
             # Add to our results
             job_listings.append(job_info)
@@ -0,0 +1,125 @@
+"""Capture the search API responses the results page is rendered from
+
+The results list is filled client-side from JSON responses of Naukri's search
+API. With Chrome performance logging enabled, the responses are found in the
+log and their bodies read through CDP Network.getResponseBody, so job records
+can be built from the payload instead of from rendered cards.
+"""
+import base64
+import json
+import logging
+import re
+from datetime import datetime
+from urllib.parse import urljoin
+
+from structureddata import clean_text
+
+logger = logging.getLogger(__name__)
+
+SEARCH_API_PATTERN = re.compile(r"/jobapi/v\d+/search")
+
+BASE_URL = "https://www.naukri.com"
+
+
+def enable_performance_logging(chrome_options):
+    """Ask chromedriver to record DevTools network events"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+
+class SearchApiCapture:
+    """Collect search API payloads from a driver's performance log"""
+
+    def __init__(self, url_pattern=SEARCH_API_PATTERN):
+        self.url_pattern = url_pattern
+        self.last_payload = None
+        self.responses_seen = 0
+
+    def collect(self, driver):
+        """Read the performance log since the last call and return new payloads"""
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            logger.debug("Could not read performance log: %s", e)
+            return []
+
+        pending = {}
+        finished = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                if self.url_pattern.search(response.get("url", "")):
+                    pending[params.get("requestId")] = response.get("url")
+            elif method == "Network.loadingFinished" and params.get("requestId") in pending:
+                finished.append(params["requestId"])
+
+        payloads = []
+        for request_id in finished:
+            try:
+                body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                text = body.get("body", "")
+                if body.get("base64Encoded"):
+                    text = base64.b64decode(text).decode("utf-8", errors="replace")
+                payloads.append(json.loads(text))
+                self.responses_seen += 1
+            except Exception as e:
+                logger.debug("Could not read search API response %s: %s", pending[request_id], e)
+
+        if payloads:
+            self.last_payload = payloads[-1]
+        return payloads
+
+
+def _placeholder(job, kind):
+    for placeholder in job.get("placeholders", []):
+        if placeholder.get("type") == kind:
+            return clean_text(placeholder.get("label"))
+    return None
+
+
+def _posted_date(job):
+    label = job.get("footerPlaceholderLabel")
+    if label:
+        return label
+    created = job.get("createdDate")
+    if created:
+        try:
+            return datetime.fromtimestamp(int(created) / 1000).strftime("%Y-%m-%d")
+        except (TypeError, ValueError, OSError):
+            return None
+    return None
+
+
+def jobs_from_search_api(payload, base_url=BASE_URL):
+    """Map a search API payload onto the scraper's record keys (only fields that are present)"""
+    records = []
+    for job in payload.get("jobDetails", []) if isinstance(payload, dict) else []:
+        link = job.get("jdURL")
+        record = {
+            "title": clean_text(job.get("title")),
+            "company": clean_text(job.get("companyName")),
+            "location": _placeholder(job, "location"),
+            "experience": _placeholder(job, "experience"),
+            "salary": _placeholder(job, "salary"),
+            "description": clean_text(job.get("jobDescription")),
+            "skills": clean_text(job.get("tagsAndSkills")),
+            "link": urljoin(base_url, link) if link else None,
+            "posted_date": _posted_date(job),
+            "job_id": str(job["jobId"]) if job.get("jobId") else None
+        }
+        records.append({key: value for key, value in record.items() if value})
+    return records
+
+
+def result_count(payload):
+    """Total number of results the search reports, if known"""
+    try:
+        return int(payload.get("noOfJobs"))
+    except (AttributeError, TypeError, ValueError):
+        return None
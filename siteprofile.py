@@ -0,0 +1,247 @@
+"""Declarative site profiles: card, field, pagination and filter selectors
+
+A profile is a JSON file (YAML works too when PyYAML is installed) listing the
+selectors to try for each thing the scraper looks for, in priority order. See
+naukri_profile.json. A list of lists declares priority tiers: specific selectors
+first, then generic fallbacks (".//h2", text matches) that also match the wrong
+element on some cards. Selectors are compiled once when the profile is loaded:
+each gets a Selenium locator, which is a CSS selector whenever the XPath has a
+CSS equivalent (the browser matches those natively instead of evaluating an
+XPath expression on every call), and its offline-parser form.
+
+SelectorStats keeps per-selector hit counts and timings between runs so that
+each cascade starts with the selector expected to produce a value soonest.
+Learned ordering only moves selectors within their tier, since a fallback
+that always matches would otherwise overtake the selectors it backs up and
+change the values extracted.
+"""
+import json
+import logging
+import os
+import re
+import threading
+
+from offlineparser import split_top_level, compile_xpath
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "naukri_profile.json")
+
+# Learned selector statistics, one file per profile
+STATS_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "naukri_scraper")
+
+# Selenium's By.XPATH and By.CSS_SELECTOR, without importing selenium
+BY_XPATH = "xpath"
+BY_CSS = "css selector"
+
+# tag, or tag with a single class-substring test: the XPath steps CSS can express
+_CSS_STEP = re.compile(r"^([A-Za-z][\w-]*|\*)(?:\[contains\(@class,\s*'([\w-]+)'\)\])?$")
+
+
+def xpath_to_css(xpath, document_scope=False):
+    """The CSS equivalent of an XPath made of simple tag/class steps, or None
+
+    Relative paths (".//...") translate directly because CSS searches below the
+    element. Absolute paths ("//...") only mean the same thing when evaluated
+    against the whole document, so they are translated for document_scope only.
+    """
+    groups = []
+    for part in split_top_level(xpath, "|"):
+        part = part.strip()
+        if part.startswith(".//"):
+            rest = part[3:]
+        elif part.startswith("//") and document_scope:
+            rest = part[2:]
+        else:
+            return None
+
+        css = ""
+        combinator = ""
+        for segment in split_top_level(rest, "/"):
+            if segment == "":
+                # '//' between steps: the empty segment marks a descendant step
+                if not css or combinator == " ":
+                    return None
+                combinator = " "
+                continue
+            match = _CSS_STEP.match(segment.strip())
+            if not match:
+                return None
+            tag, class_name = match.groups()
+            css += combinator + tag + (f"[class*='{class_name}']" if class_name else "")
+            combinator = " > "
+        groups.append(css)
+    return ", ".join(groups)
+
+
+class Selector:
+    """One selector compiled for the browser and for the offline parser"""
+
+    __slots__ = ("xpath", "css", "offline", "tier")
+
+    def __init__(self, xpath, document_scope=False, tier=0):
+        self.xpath = xpath
+        self.tier = tier
+        self.css = xpath_to_css(xpath, document_scope)
+        try:
+            self.offline = compile_xpath(xpath)
+        except ValueError as e:
+            logger.warning(f"Selector {xpath} only works in the browser: {e}")
+            self.offline = None
+
+    @property
+    def locator(self):
+        """(by, value) for find_element/find_elements"""
+        return (BY_CSS, self.css) if self.css else (BY_XPATH, self.xpath)
+
+    def __repr__(self):
+        return f"Selector({self.xpath!r})"
+
+
+class SelectorChain:
+    """The selectors tried in turn for one field or page element"""
+
+    def __init__(self, key, name, xpaths, document_scope=False):
+        self.key = key
+        self.name = name
+        # A flat list is one tier; a list of lists is tiers in priority order
+        tiers = xpaths if xpaths and all(isinstance(tier, list) for tier in xpaths) else [xpaths]
+        self.selectors = [Selector(xpath, document_scope, tier) for tier, group in enumerate(tiers) for xpath in group]
+        xpaths = [selector.xpath for selector in self.selectors]
+        # All alternatives at once, in document order (used for cards and links)
+        self.union = Selector(" | ".join(xpaths), document_scope)
+
+    def ordered(self, stats=None):
+        """Selectors in the order to try them: learned from stats, else as declared"""
+        return stats.order(self) if stats is not None else self.selectors
+
+
+def find_text(element, chain):
+    """Text of the first of a chain's selectors that finds non-empty text in element (Selenium)"""
+    from selenium.common.exceptions import NoSuchElementException
+
+    for selector in chain.selectors:
+        try:
+            text = element.find_element(*selector.locator).text.strip()
+        except NoSuchElementException:
+            continue
+        if text:
+            return text
+    return f"{chain.name} not found"
+
+
+class SiteProfile:
+    """A loaded site profile with every selector compiled"""
+
+    def __init__(self, config, path=None):
+        self.path = path
+        self.name = config.get("name") or os.path.splitext(os.path.basename(path or "profile"))[0]
+        self.base_url = config.get("base_url")
+        self.cards = SelectorChain("cards", "Job cards", config["cards"], document_scope=True)
+        self.fields = {
+            key: SelectorChain(key, spec.get("name", key.replace("_", " ").capitalize()), spec["selectors"])
+            for key, spec in config["fields"].items()
+        }
+        self.link = SelectorChain("link", "Link", config["link"])
+        self.next_page = SelectorChain("next_page", "Next page",
+                                       config.get("pagination", {}).get("next", []), document_scope=True)
+
+        date_filter = config.get("filters", {}).get("date_posted", {})
+        self.date_filter = SelectorChain("date_filter", "Date filter", date_filter.get("dropdown", []), document_scope=True)
+        self.date_filter_options = SelectorChain("date_filter_options", "Date filter options",
+                                                 date_filter.get("options_list", []), document_scope=True)
+        self.date_filter_option = date_filter.get("option", "//label[contains(text(), '{label}')]")
+        self.date_filter_labels = date_filter.get("labels", {})
+
+    def field_xpaths(self, stats=None):
+        """record key -> (field name, XPaths in the order to try them)"""
+        return {key: (chain.name, [s.xpath for s in chain.ordered(stats)]) for key, chain in self.fields.items()}
+
+    def placeholders(self):
+        """record key -> the value stored when a field is not found"""
+        return {key: f"{chain.name} not found" for key, chain in self.fields.items()}
+
+
+def load_profile(path=None):
+    """Load and compile a site profile (default: the Naukri profile)"""
+    path = path or DEFAULT_PROFILE
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("YAML site profiles need the PyYAML package") from None
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+    return SiteProfile(config, path)
+
+
+class SelectorStats:
+    """Per-selector hit counts and timings, persisted between runs
+
+    A cascade stops at the first selector that produces a value, so the expected
+    cost of a lookup is lowest when selectors are tried in increasing order of
+    mean time / hit rate. Hit rates are smoothed so selectors without history
+    still get tried ahead of ones that are known to miss.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = self._load()
+
+    @classmethod
+    def for_profile(cls, profile, directory=STATS_DIRECTORY):
+        return cls(os.path.join(directory, f"selector_stats_{profile.name}.json"))
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def record(self, key, xpath, hit, seconds=None):
+        """Count one attempt of a selector; seconds is omitted for untimed (offline) attempts"""
+        with self._lock:
+            entry = self.stats.setdefault(key, {}).setdefault(xpath, {"attempts": 0, "hits": 0, "timed": 0, "seconds": 0.0})
+            entry["attempts"] += 1
+            if hit:
+                entry["hits"] += 1
+            if seconds is not None:
+                entry["timed"] += 1
+                entry["seconds"] += seconds
+
+    def order(self, chain):
+        """The chain's selectors, tier by tier, cheapest expected cost to a hit first within a tier
+
+        Ties keep the declared order.
+        """
+        entries = self.stats.get(chain.key, {})
+        history = [entries.get(selector.xpath) for selector in chain.selectors]
+        timed = [entry["seconds"] / entry["timed"] for entry in history if entry and entry["timed"]]
+        default_time = sum(timed) / len(timed) if timed else 1.0
+
+        def expected_cost(i):
+            entry = history[i]
+            if not entry:
+                return default_time / 0.5
+            hit_rate = (entry["hits"] + 1) / (entry["attempts"] + 2)
+            mean_time = entry["seconds"] / entry["timed"] if entry["timed"] else default_time
+            return mean_time / hit_rate
+
+        return [chain.selectors[i] for i in sorted(range(len(chain.selectors)),
+                                                   key=lambda i: (chain.selectors[i].tier, expected_cost(i)))]
+
+    def save(self):
+        """Write the statistics atomically"""
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.stats, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save selector statistics to {self.path}: {e}")
@@ -0,0 +1,222 @@
+"""Job records from schema.org JSON-LD blocks embedded in a page
+
+Search pages carry an ItemList (title and link per result, in card order) and
+detail pages a JobPosting. Records only contain the fields the structured data
+actually provides, so callers can fall back to DOM selectors for the rest.
+"""
+import html
+import json
+import re
+from urllib.parse import urljoin
+
+LD_JSON_RE = re.compile(
+    r"<script[^>]*type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Naukri job URLs end in the numeric job id
+JOB_ID_RE = re.compile(r"-(\d{6,})(?:[/?#]|$)")
+
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def extract_ld_json(source):
+    """Parse every JSON-LD block in a page source, flattening lists and @graph"""
+    blocks = []
+    for match in LD_JSON_RE.finditer(source or ""):
+        try:
+            data = json.loads(match.group(1).strip())
+        except ValueError:
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            item = pending.pop(0)
+            if not isinstance(item, dict):
+                continue
+            if "@graph" in item:
+                pending.extend(item["@graph"])
+            else:
+                blocks.append(item)
+    return blocks
+
+
+def _types(item):
+    value = item.get("@type", [])
+    return set(value if isinstance(value, list) else [value])
+
+
+def _first(value):
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def clean_text(value):
+    """Strip tags and entities and collapse whitespace; None for empty values"""
+    if not value:
+        return None
+    text = html.unescape(TAG_RE.sub(" ", str(value)))
+    return " ".join(text.split()) or None
+
+
+def job_id_from_url(url):
+    """The numeric job id at the end of a Naukri job URL, if any"""
+    match = JOB_ID_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def _location(value):
+    places = value if isinstance(value, list) else [value]
+    names = []
+    for place in places:
+        if isinstance(place, str):
+            names.append(place)
+            continue
+        if not isinstance(place, dict):
+            continue
+        address = place.get("address", place)
+        if isinstance(address, str):
+            names.append(address)
+        elif isinstance(address, dict):
+            name = address.get("addressLocality") or address.get("addressRegion") or address.get("name")
+            if name:
+                names.append(name)
+    return ", ".join(dict.fromkeys(names)) or None
+
+
+def _experience(value):
+    value = _first(value)
+    if isinstance(value, dict):
+        months = value.get("monthsOfExperience")
+        if months is not None:
+            try:
+                return f"{int(float(months)) // 12} Yrs"
+            except (TypeError, ValueError):
+                return None
+        return clean_text(value.get("description"))
+    return clean_text(value)
+
+
+def _salary(value):
+    if not isinstance(value, dict):
+        return clean_text(value)
+    amount = value.get("value", value)
+    currency = value.get("currency", "")
+    if isinstance(amount, dict):
+        low, high = amount.get("minValue"), amount.get("maxValue")
+        unit = amount.get("unitText", "")
+        if low is not None and high is not None:
+            return " ".join(part for part in [currency, f"{low}-{high}", unit] if part)
+        amount = amount.get("value", low if low is not None else high)
+    if amount is None:
+        return None
+    return " ".join(part for part in [currency, str(amount)] if part)
+
+
+def _skills(value):
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value if v) or None
+    return clean_text(value)
+
+
+def job_posting_record(posting, base_url=None):
+    """Map a JobPosting onto the scraper's record keys (only fields that are present)"""
+    organization = posting.get("hiringOrganization")
+    identifier = posting.get("identifier")
+    if isinstance(identifier, dict):
+        identifier = identifier.get("value")
+
+    link = posting.get("url")
+    if link and base_url:
+        link = urljoin(base_url, link)
+
+    record = {
+        "title": clean_text(posting.get("title") or posting.get("name")),
+        "company": clean_text(organization.get("name") if isinstance(organization, dict) else organization),
+        "location": _location(posting.get("jobLocation")),
+        "experience": _experience(posting.get("experienceRequirements")),
+        "salary": _salary(posting.get("baseSalary")),
+        "description": clean_text(posting.get("description")),
+        "skills": _skills(posting.get("skills")),
+        "link": link,
+        "posted_date": posting.get("datePosted"),
+        "job_id": str(identifier) if identifier else job_id_from_url(link),
+        "role_category": clean_text(_first(posting.get("occupationalCategory")) or posting.get("industry")),
+        "employment_type": clean_text(_first(posting.get("employmentType")))
+    }
+    return {key: value for key, value in record.items() if value}
+
+
+def jobs_from_structured_data(source, base_url=None):
+    """Job records from the page's JSON-LD, in the order the page lists them"""
+    records = []
+    for block in extract_ld_json(source):
+        types = _types(block)
+        if "JobPosting" in types:
+            records.append(job_posting_record(block, base_url))
+        elif "ItemList" in types:
+            elements = sorted(block.get("itemListElement", []),
+                              key=lambda element: element.get("position", 0) if isinstance(element, dict) else 0)
+            for element in elements:
+                if not isinstance(element, dict):
+                    continue
+                item = element.get("item")
+                if isinstance(item, dict) and "JobPosting" in _types(item):
+                    records.append(job_posting_record(item, base_url))
+                    continue
+                link = element.get("url") or (item.get("@id") if isinstance(item, dict) else None)
+                record = {
+                    "title": clean_text(element.get("name")),
+                    "link": urljoin(base_url, link) if link and base_url else link,
+                    "job_id": job_id_from_url(link)
+                }
+                record = {key: value for key, value in record.items() if value}
+                # Breadcrumb-style lists without job links are not job results
+                if record.get("job_id"):
+                    records.append(record)
+    return records
+
+
+def field_coverage(records, fields):
+    """Fraction of records that have each field"""
+    if not records:
+        return {field: 0.0 for field in fields}
+    return {field: round(sum(1 for r in records if r.get(field)) / len(records), 4) for field in fields}
+
+
+def _same_link(a, b):
+    return a.split("#")[0].split("?")[0].rstrip("/") == b.split("#")[0].split("?")[0].rstrip("/")
+
+
+class StructuredIndex:
+    """Match structured records to job cards by the card's link
+
+    When the page lists as many structured results as there are cards, the
+    record at the card's position is tried first, but only taken when its job
+    id (or link) agrees with the card's: a promoted or reordered card must not
+    get another job's fields. Cards that match no record are extracted from the
+    DOM as usual.
+    """
+
+    def __init__(self, records, card_count):
+        self.records = records
+        self.by_position = records if records and len(records) == card_count else None
+        self.by_job_id = {r["job_id"]: r for r in records if r.get("job_id")}
+
+    @property
+    def needs_link(self):
+        """Whether a card's link has to be read before its record can be found"""
+        return bool(self.records)
+
+    def lookup(self, index, link=None):
+        if not link:
+            return None
+        job_id = job_id_from_url(link)
+        if self.by_position is not None:
+            record = self.by_position[index]
+            if job_id and record.get("job_id"):
+                if record["job_id"] == job_id:
+                    return record
+            elif record.get("link") and _same_link(record["link"], link):
+                return record
+        return self.by_job_id.get(job_id) if job_id else None
@@ -0,0 +1,200 @@
+"""Structured logging that stays off the scraping hot path
+
+configure_logging() puts a QueueHandler on the root logger, so logging a record
+only costs a queue put in the calling thread; a QueueListener thread formats it
+and does the file and console I/O. The log file gets one JSON object per line
+carrying the run ID, query, page and phase the record was logged under (see
+log_context); the console keeps the readable text format. Debug records are
+rate-limited per call site, so debug logging inside per-card loops stays cheap
+even when it is switched on.
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+CONTEXT_FIELDS = ("run_id", "query", "page", "phase")
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Arguments that can't change between the logging call and formatting in the listener
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None))
+
+_context = contextvars.ContextVar("log_context", default={})
+
+_listener = None
+
+
+def update_log_context(**fields):
+    """Set context fields for everything logged from now on in this thread or task"""
+    _context.set({**_context.get(), **fields})
+
+
+@contextmanager
+def log_context(**fields):
+    """Set context fields for the duration of a block"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        try:
+            _context.reset(token)
+        except ValueError:
+            # A generator closed from another context; the fields expire with it
+            pass
+
+
+class ContextFilter(logging.Filter):
+    """Stamp records with the log context of the thread that logged them"""
+
+    def filter(self, record):
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class DebugRateLimiter(logging.Filter):
+    """Let at most `rate` debug records per second through from each call site
+
+    Records over the limit are dropped before they are formatted or queued; how
+    many were dropped is attached to the next record let through from the same
+    call site (as "suppressed").
+    """
+
+    def __init__(self, rate=10.0, burst=None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or rate
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last, suppressed = self._sites.get(site, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._sites[site] = (tokens, now, suppressed + 1)
+                return False
+            self._sites[site] = (tokens - 1, now, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """A QueueHandler that leaves %-formatting to the listener thread when it is safe
+
+    The stock QueueHandler formats every message before queueing it. Records whose
+    arguments are plain strings and numbers are queued as they are instead.
+    """
+
+    def prepare(self, record):
+        if isinstance(record.args, tuple) and all(isinstance(arg, _IMMUTABLE_ARGS) for arg in record.args):
+            return copy.copy(record)
+        return super().prepare(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, context and exception"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for field in CONTEXT_FIELDS + ("suppressed",):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(log_file="naukri_scraper.log", level=logging.INFO, console=True, debug_rate=10.0):
+    """Send all logging through a background listener: JSON lines to log_file, text to the console
+
+    debug_rate is the number of debug records per second let through from each
+    call site. Calling it again replaces the previous configuration.
+    """
+    global _listener
+    stop_logging()
+
+    handlers = []
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(DebugRateLimiter(debug_rate))
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Write out queued records and remove the queue handler"""
+    global _listener
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            root.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def _after_fork_in_child():
+    # The listener thread doesn't exist in a forked child (e.g. a process pool
+    # worker), so the child writes through the listener's handlers directly
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            root.removeHandler(handler)
+            for target in _listener.handlers:
+                for log_filter in handler.filters:
+                    target.addFilter(log_filter)
+                root.addHandler(target)
+    _listener = None
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
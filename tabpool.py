@@ -0,0 +1,73 @@
+"""Several result pages in flight in one browser session, one tab each
+
+A tab's navigation is started with a script (location.assign), which returns
+at once instead of blocking like driver.get, so while the crawl extracts the
+page in one tab the others keep loading. Chromedriver still waits for
+DOMContentLoaded of a pending navigation before the next command with the
+"eager" page load strategy; "none" gives the most overlap.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The flag lives on the old document, so it is gone once the new one has replaced it
+NAVIGATE_SCRIPT = "window.__pendingNavigation = true; window.location.assign(arguments[0]);"
+NAVIGATED_SCRIPT = "return window.__pendingNavigation === undefined && document.readyState !== 'loading';"
+JS_HEAP_SCRIPT = "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+
+class TabPool:
+    """K window handles of one driver, each loading its own page"""
+
+    def __init__(self, driver, tabs, on_new_tab=None):
+        self.driver = driver
+        self.handles = [driver.current_window_handle]
+        self.current = self.handles[0]
+        # Tab set-up (e.g. DevTools resource blocking) is per target, so it is repeated for each tab
+        for _ in range(tabs - 1):
+            driver.switch_to.new_window("tab")
+            self.current = driver.current_window_handle
+            self.handles.append(self.current)
+            if on_new_tab:
+                on_new_tab()
+        logger.info(f"Driving {len(self.handles)} tabs in one browser session")
+
+    def switch(self, handle):
+        if handle != self.current:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+
+    def load(self, handle, url):
+        """Start loading url in a tab without waiting for it"""
+        self.switch(handle)
+        self.driver.execute_script(NAVIGATE_SCRIPT, url)
+
+    def wait_navigated(self, handle, timeout):
+        """Switch to a tab and wait until its new document has replaced the old one"""
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.switch(handle)
+        WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+            lambda driver: driver.execute_script(NAVIGATED_SCRIPT))
+
+    def js_heap(self):
+        """Used JS heap of the current tab in bytes, or None outside Chrome"""
+        try:
+            return self.driver.execute_script(JS_HEAP_SCRIPT)
+        except Exception:
+            return None
+
+    def close(self):
+        """Close every tab but the first"""
+        for handle in self.handles[1:]:
+            try:
+                self.switch(handle)
+                self.driver.close()
+            except Exception as e:
+                logger.debug("Could not close tab: %s", e)
+        self.current = None
+        try:
+            self.switch(self.handles[0])
+        except Exception:
+            pass
+        self.handles = self.handles[:1]